@@ -0,0 +1,138 @@
+import pygame
+import settings as s
+from collections import OrderedDict
+
+
+def asset_bytes(asset):
+    """Memory taken by the pixels or samples of an asset.
+
+    Args:
+        asset: a surface or a sound, or a list, tuple or dict of them.
+
+    Returns:
+        size (int): bytes of pixel or sample data.
+    """
+
+    if isinstance(asset, pygame.Surface):
+        return asset.get_pitch() * asset.get_height()
+    if isinstance(asset, pygame.mixer.Sound):
+        frequency, size, channels = pygame.mixer.get_init()
+        return int(asset.get_length() * frequency) * channels * abs(size) // 8
+    if isinstance(asset, dict):
+        return sum(asset_bytes(value) for value in asset.values())
+    if isinstance(asset, (list, tuple)):
+        return sum(asset_bytes(value) for value in asset)
+
+    return 0
+
+
+class AssetRegistry:
+    """Every loaded image of the game, each loaded once and shared.
+
+    Entries are kept in least recently used order, with their size in
+    bytes. When the total goes over the budget, the coldest entries are
+    evicted and loaded again if asked for. Pinned entries, the ones in use
+    during play, are never evicted.
+    """
+
+    def __init__(self, budget=s.ASSET_BUDGET):
+        """Initializing an empty registry.
+
+        Args:
+            budget (int, optional): Bytes of assets kept loaded. Defaults to ASSET_BUDGET
+        """
+
+        self.budget = budget
+        self.entries = OrderedDict()  # key: (asset, bytes, pinned)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, load, pinned=False):
+        """Shared copy of an asset, loaded if it is not registered.
+
+        Args:
+            key (hashable): Name of the asset.
+            load (callable): Loads the asset, run on a miss.
+            pinned (bool, optional): Never evict the asset. Defaults to False
+
+        Returns:
+            asset: the registered asset.
+        """
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        return self.put(key, load(), pinned)
+
+    def put(self, key, asset, pinned=False):
+        """Registers a loaded asset, evicting cold ones if over budget.
+
+        Args:
+            key (hashable): Name of the asset.
+            asset: the loaded asset.
+            pinned (bool, optional): Never evict the asset. Defaults to False
+
+        Returns:
+            asset: the registered asset.
+        """
+
+        self.discard(key)
+
+        size = asset_bytes(asset)
+        self.entries[key] = (asset, size, pinned)
+        self.bytes += size
+        self.evict()
+
+        return asset
+
+    def discard(self, *keys):
+        """Forgets assets, pinned or not.
+
+        Args:
+            *keys (hashable): Names of the assets.
+        """
+
+        for key in keys:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.bytes -= entry[1]
+
+    def evict(self):
+        """Evicts the least recently used unpinned assets until within budget.
+        """
+
+        if self.bytes <= self.budget:
+            return
+
+        for key, (_, size, pinned) in list(self.entries.items()):
+            if self.bytes <= self.budget:
+                break
+            if not pinned:
+                del self.entries[key]
+                self.bytes -= size
+                self.evictions += 1
+
+    def info(self):
+        """Statistics of the registry.
+
+        Returns:
+            info (dict): entries, bytes, budget, hits, misses and evictions.
+        """
+
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,144 @@
+import os
+import json
+import pickle
+import xml.etree.ElementTree as ET
+
+
+def parse_json(filename):
+    """Parses a TexturePacker JSON (hash) atlas.
+
+    Args:
+        filename (str): Filename of the atlas.
+
+    Returns:
+        regions (dict): frame name mapped to (x, y, width, height).
+    """
+
+    with open(filename, 'r') as f:
+        frames = json.load(f)['frames']
+
+    regions = {}
+    for name, data in frames.items():
+        frame = data['frame']
+        regions[os.path.splitext(name)[0]] = (frame['x'], frame['y'], frame['w'], frame['h'])
+
+    return regions
+
+
+def parse_xml(filename):
+    """Parses a TextureAtlas XML atlas.
+
+    Args:
+        filename (str): Filename of the atlas.
+
+    Returns:
+        regions (dict): frame name mapped to (x, y, width, height).
+    """
+
+    regions = {}
+    for sub in ET.parse(filename).getroot().iter('SubTexture'):
+        regions[os.path.splitext(sub.get('name'))[0]] = (int(sub.get('x')), int(sub.get('y')),
+                                                         int(sub.get('width')), int(sub.get('height')))
+
+    return regions
+
+
+def parse_txt(filename):
+    """Parses a plain text atlas, one `name = x y width height` per line.
+
+    Args:
+        filename (str): Filename of the atlas.
+
+    Returns:
+        regions (dict): frame name mapped to (x, y, width, height).
+    """
+
+    regions = {}
+    with open(filename, 'r') as f:
+        for line in f:
+            if '=' not in line:
+                continue
+            name, values = line.split('=', 1)
+            regions[name.strip()] = tuple(int(v) for v in values.split())
+
+    return regions
+
+
+PARSERS = {
+    '.json': parse_json,
+    '.xml': parse_xml,
+    '.txt': parse_txt,
+}
+
+
+class AtlasIndex:
+    """Name to region index of every spritesheet with atlas metadata.
+
+    Built once at startup, either by parsing the metadata files or by
+    reloading a pickled copy of a previous parse.
+    """
+
+    def __init__(self, regions):
+        """Initializing the index.
+
+        Args:
+            regions (dict): spritesheet mapped to a dict of frame name
+                to (x, y, width, height).
+        """
+
+        self.regions = regions
+
+    @classmethod
+    def load(cls, img_dir, atlases, cache_file=None):
+        """Builds the index of a set of atlases.
+
+        The pickled cache is used only if every metadata file is unchanged
+        since it was written, otherwise the files are parsed and the cache
+        is rewritten.
+
+        Args:
+            img_dir (str): Directory the atlas paths are relative to.
+            atlases (dict): spritesheet mapped to its metadata file.
+            cache_file (str, optional): Filename of the pickled index.
+                Defaults to None
+
+        Returns:
+            index (AtlasIndex): the loaded index.
+        """
+
+        sources = {sheet: os.path.join(img_dir, path) for sheet, path in atlases.items()}
+        stamps = {sheet: os.path.getmtime(path) for sheet, path in sources.items()}
+
+        if cache_file is not None:
+            try:
+                with open(cache_file, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached['stamps'] == stamps:
+                    return cls(cached['regions'])
+            except Exception:  # missing, stale or corrupt cache
+                pass
+
+        regions = {}
+        for sheet, path in sources.items():
+            regions[sheet] = PARSERS[os.path.splitext(path)[1]](path)
+
+        if cache_file is not None:
+            try:
+                with open(cache_file, 'wb') as f:
+                    pickle.dump({'stamps': stamps, 'regions': regions}, f, pickle.HIGHEST_PROTOCOL)
+            except OSError:  # read only install, parse again next time
+                pass
+
+        return cls(regions)
+
+    def get(self, sheet):
+        """Regions of a single spritesheet.
+
+        Args:
+            sheet (str): Spritesheet, as given to load().
+
+        Returns:
+            regions (dict): frame name mapped to (x, y, width, height).
+        """
+
+        return self.regions.get(sheet, {})
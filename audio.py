@@ -0,0 +1,212 @@
+import os
+import pygame
+import settings as s
+from assets import AssetRegistry
+from prefetch import Prefetcher
+
+MUSIC_CHANNELS = 2  # a track fades in on one while the last fades out on the other
+
+
+class AudioManager:
+    """Sound effects and music of the game, never stalling the game loop.
+
+    Every pool of effects plays on its own reserved channels, so bullets
+    never cut off a hit. An effect plays once per frame at most, and not
+    again until SOUND_MIN_INTERVAL went by; when its pool is busy, the
+    channel played the longest ago is taken over.
+
+    Music tracks are decoded once on a worker thread and kept in memory.
+    Switching tracks crossfades between two channels without waiting, and
+    a track asked for before it is decoded starts as soon as it is.
+    """
+
+    def __init__(self, sound_dir, effects=s.SOUND_EFFECTS, channels=s.SOUND_CHANNELS):
+        """Loading the effects and reserving their channels.
+
+        Args:
+            sound_dir (str): Directory of the sounds.
+            effects (dict, optional): Name of each effect mapped to its file
+                and pool. Defaults to SOUND_EFFECTS
+            channels (dict, optional): Channels reserved per pool.
+                Defaults to SOUND_CHANNELS
+        """
+
+        self.sound_dir = sound_dir
+
+        # reserved channels are never picked by Sound.play()
+        reserved = MUSIC_CHANNELS + sum(channels.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved))
+        pygame.mixer.set_reserved(reserved)
+
+        self.music_channels = [pygame.mixer.Channel(i) for i in range(MUSIC_CHANNELS)]
+        self.pools = {}
+        first = MUSIC_CHANNELS
+        for pool, count in channels.items():
+            self.pools[pool] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+        self.started_at = {pool: [0] * len(channels) for pool, channels in self.pools.items()}
+
+        self.effects = {
+            name: (pygame.mixer.Sound(os.path.join(sound_dir, filename)), pool)
+            for name, (filename, pool) in effects.items()
+        }
+        self.played_at = {}  # name: ticks of its last play
+        self.frame_effects = set()  # played during the current frame
+
+        self.tracks = Prefetcher(AssetRegistry(s.MUSIC_BUDGET))
+        self.track = None  # playing, or waiting to be decoded
+        self.track_channel = 0
+        self.track_fade = s.MUSIC_FADE
+
+        self.played = 0
+        self.coalesced = 0
+        self.limited = 0
+        self.stolen = 0
+
+    def play(self, name):
+        """Plays an effect, unless it already played too recently.
+
+        Args:
+            name (str): Name of the effect, in SOUND_EFFECTS.
+        """
+
+        if name in self.frame_effects:
+            self.coalesced += 1
+            return
+
+        now = pygame.time.get_ticks()
+        last = self.played_at.get(name)
+        if last is not None and now - last < s.SOUND_MIN_INTERVAL:
+            self.limited += 1
+            return
+
+        sound, pool = self.effects[name]
+        channels = self.pools[pool]
+        started_at = self.started_at[pool]
+        for i, channel in enumerate(channels):
+            if not channel.get_busy():
+                break
+        else:
+            i = started_at.index(min(started_at))
+            self.stolen += 1
+
+        channels[i].play(sound)
+        started_at[i] = now
+        self.frame_effects.add(name)
+        self.played_at[name] = now
+        self.played += 1
+
+    def update(self):
+        """Starts a new frame, and the music asked for once decoded.
+
+        Called once per tick, and while waiting on static screens.
+        """
+
+        self.frame_effects.clear()
+
+        if self.music_pending() and self.tracks.ready(('music', self.track)):
+            self.start_track()
+
+    def track_asset(self, filename):
+        """Describes a music track for the decoding thread.
+
+        Args:
+            filename (str): Filename of the track, in the sounds directory.
+
+        Returns:
+            (key, load): arguments of Prefetcher.request().
+        """
+
+        path = os.path.join(self.sound_dir, filename)
+        return ('music', filename), lambda: pygame.mixer.Sound(path)
+
+    def load_music(self, *filenames):
+        """Starts decoding music tracks in the background.
+
+        Args:
+            *filenames (str): Filenames of the tracks, in the sounds directory.
+        """
+
+        for filename in filenames:
+            self.tracks.request(*self.track_asset(filename))
+
+    def play_music(self, filename, fade_ms=s.MUSIC_FADE):
+        """Crossfades from the music playing to a track, looping it.
+
+        Args:
+            filename (str): Filename of the track, in the sounds directory.
+            fade_ms (int, optional): Milliseconds of the crossfade. Defaults to MUSIC_FADE
+        """
+
+        if filename == self.track and self.music_channels[self.track_channel].get_busy():
+            return
+
+        self.fadeout_music(fade_ms)
+        self.track = filename
+        self.track_fade = fade_ms
+        self.track_channel = (self.track_channel + 1) % MUSIC_CHANNELS
+        self.load_music(filename)
+
+        if self.tracks.ready(('music', filename)):
+            self.start_track()
+
+    def start_track(self):
+        """Fades the decoded track in on its channel.
+        """
+
+        sound = self.tracks.get(*self.track_asset(self.track))
+        self.music_channels[self.track_channel].play(sound, loops=-1, fade_ms=self.track_fade)
+
+    def fadeout_music(self, fade_ms=s.MUSIC_FADE):
+        """Fades the music out, without waiting for it.
+
+        Args:
+            fade_ms (int, optional): Milliseconds of the fade. Defaults to MUSIC_FADE
+        """
+
+        self.music_channels[self.track_channel].fadeout(fade_ms)
+        self.track = None
+
+    def music_pending(self):
+        """Whether the track asked for has yet to start, e.g. still being decoded.
+
+        Returns:
+            pending (bool): update() has a track to start.
+        """
+
+        return self.track is not None and not self.music_channels[self.track_channel].get_busy()
+
+    def pause(self):
+        """Pauses the effects and music playing.
+        """
+
+        pygame.mixer.pause()
+
+    def resume(self):
+        """Resumes the effects and music paused.
+        """
+
+        pygame.mixer.unpause()
+
+    def info(self):
+        """Statistics of the audio.
+
+        Returns:
+            info (dict): effects played, coalesced within a frame, limited
+                by SOUND_MIN_INTERVAL, and played on a busy channel, and
+                the decoded music registry.
+        """
+
+        return {
+            'played': self.played,
+            'coalesced': self.coalesced,
+            'limited': self.limited,
+            'stolen': self.stolen,
+            'music': self.tracks.registry.info(),
+        }
+
+    def close(self):
+        """Stops decoding music.
+        """
+
+        self.tracks.close()
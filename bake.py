@@ -0,0 +1,165 @@
+import os
+import pickle
+import hashlib
+import pygame
+
+
+def file_stamp(filename):
+    """Modification time and size of a file, cheap to read.
+
+    Args:
+        filename (str): Filename of the file.
+
+    Returns:
+        stamp (tuple): (st_mtime_ns, st_size) of the file.
+    """
+
+    stat = os.stat(filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_hash(filename):
+    """Hash of the contents of a file.
+
+    Args:
+        filename (str): Filename of the file.
+
+    Returns:
+        digest (str): hex SHA-1 of the file.
+    """
+
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class BakedCache:
+    """Cache of decoded and scaled images, stored as raw pixel buffers.
+
+    An image is baked the first time it is loaded at a given size: the
+    scaled pixels are written to the cache directory with the hash,
+    modification time and size of the source file. Later loads rebuild the
+    surface straight from the buffer, skipping decoding and scaling. The
+    source is only read and hashed again when its modification time or
+    size changed, and baked again if its contents did.
+
+    Loading never converts to the display format, so it is safe to call
+    from a worker thread. convert() or convert_alpha() is left to the
+    caller, and is cheap on these buffers.
+    """
+
+    def __init__(self, cache_dir):
+        """Initializing the cache.
+
+        Args:
+            cache_dir (str): Directory the baked images are stored in.
+        """
+
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:  # read only install, everything is baked in memory only
+            pass
+
+    def entry_file(self, filename, size, scale, alpha):
+        """Filename of the baked copy of an image.
+
+        Args:
+            filename (str): Filename of the source image.
+            size (tuple): (width, height) scaled to, or None.
+            scale (float): scale factor, or None.
+            alpha (bool): per pixel alpha kept.
+
+        Returns:
+            filename (str): path in the cache directory.
+        """
+
+        key = f'{os.path.abspath(filename)}|{size}|{scale}|{alpha}'.encode()
+        name = os.path.splitext(os.path.basename(filename))[0]
+        return os.path.join(self.cache_dir, f'{name}-{hashlib.sha1(key).hexdigest()[:16]}.bake')
+
+    def load_image(self, filename, size=None, scale=None, alpha=False):
+        """Loads an image at a target size, baking it if needed.
+
+        Args:
+            filename (str): Filename of the source image.
+            size (tuple, optional): (width, height) to scale to. Defaults to None
+            scale (float, optional): scale factor, used if no size is given.
+                Defaults to None
+            alpha (bool, optional): keep per pixel alpha. Defaults to False
+
+        Returns:
+            image (pygame.Surface): the scaled image, not converted.
+        """
+
+        stamp = file_stamp(filename)
+        source = None
+        entry_file = self.entry_file(filename, size, scale, alpha)
+
+        try:
+            with open(entry_file, 'rb') as f:
+                entry = pickle.load(f)
+
+            # an untouched source is not read again
+            fresh = entry.get('stamp') == stamp
+            if not fresh:
+                source = file_hash(filename)
+                fresh = entry['source'] == source
+                if fresh:  # touched, e.g. checked out again, but the same
+                    entry['stamp'] = stamp
+                    self.store(entry_file, entry)
+
+            if fresh:
+                self.hits += 1
+                return pygame.image.frombuffer(entry['pixels'], entry['size'], entry['format'])
+        except Exception:  # missing, stale or corrupt entry
+            pass
+
+        self.misses += 1
+        if source is None:
+            source = file_hash(filename)
+        image = pygame.image.load(filename)
+        if size is None and scale is not None:
+            rect = image.get_rect()
+            size = (int(rect.width * scale), int(rect.height * scale))
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+
+        # 32 bit pixels, the same layout as the display in most cases
+        fmt = 'RGBA' if alpha else 'RGBX'
+        entry = {
+            'source': source,
+            'stamp': stamp,
+            'size': image.get_size(),
+            'format': fmt,
+            'pixels': pygame.image.tostring(image, fmt),
+        }
+        self.store(entry_file, entry)
+
+        return pygame.image.frombuffer(entry['pixels'], entry['size'], fmt)
+
+    def store(self, entry_file, entry):
+        """Writes a baked image to the cache directory.
+
+        Args:
+            entry_file (str): path in the cache directory, see entry_file().
+            entry (dict): hash, modification time and size of the source,
+                and size, format and pixels of the image.
+        """
+
+        try:
+            with open(entry_file, 'wb') as f:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+        except OSError:  # read only install, baked again next time
+            pass
+
+    def cache_info(self):
+        """Statistics of the cache.
+
+        Returns:
+            info (dict): hits and misses since startup.
+        """
+
+        return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,286 @@
+"""Batch runs of headless simulations, spread over every CPU core.
+
+Plays many seeded runs of a level under a scripted or random policy, each
+worker process reusing one headless game, and reports how the runs ended.
+Settings can be overridden without editing settings.py, e.g. LEVELS_DIR
+to balance the missions and spawn rates in a copy of the level files.
+Every run is streamed as a JSON line as soon as it finishes, and an
+aggregated report is written at the end.
+
+    python batch.py --runs 200 --policy random --set LEVELS_DIR="'levels_easy'" --out batch.json
+"""
+import os
+import ast
+import sys
+import json
+import time
+import random
+import argparse
+import multiprocessing
+from multiprocessing.util import Finalize
+import pygame
+import settings as s
+from simulation import ScriptedInput, FixedClock
+
+# game of the worker process, created once by init_worker()
+worker_game = None
+
+
+def idle(game, frame, rng):
+    """Nobody touches the keyboard.
+    """
+
+
+def runner(game, frame, rng):
+    """Runs right, jumping and shooting at a steady pace.
+    """
+
+    if frame == 0:
+        game.input.press(pygame.K_RIGHT)
+    if frame % 30 == 0:
+        game.input.tap(pygame.K_UP)
+    if frame % 40 == 0:
+        game.input.tap(pygame.K_SPACE)
+
+
+def random_keys(game, frame, rng):
+    """Holds random directions and jumps and shoots at random.
+    """
+
+    if frame % 20 == 0:
+        direction = rng.choice((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_RIGHT, pygame.K_RIGHT, None))
+        for key in (pygame.K_LEFT, pygame.K_RIGHT):
+            if key != direction and key in game.input.keys:
+                game.input.release(key)
+        if direction is not None and direction not in game.input.keys:
+            game.input.press(direction)
+
+    if rng.random() < 1 / 25:
+        game.input.tap(pygame.K_UP)
+    if rng.random() < 1 / 30:
+        game.input.tap(pygame.K_SPACE)
+
+
+POLICIES = {
+    'idle': idle,
+    'runner': runner,
+    'random': random_keys,
+}
+
+
+def parse_override(text):
+    """Parses a settings override.
+
+    Args:
+        text (str): NAME=VALUE, VALUE being a Python literal.
+
+    Returns:
+        (name, value): name of the setting and its new value.
+    """
+
+    name, sep, value = text.partition('=')
+    if not sep or not hasattr(s, name):
+        raise argparse.ArgumentTypeError(f'not a setting: {text}')
+
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f'not a Python literal: {value}')
+
+
+def init_worker(overrides, swarm):
+    """Applies the settings overrides and creates the game of a worker.
+
+    Args:
+        overrides (list): (name, value) pairs set in settings.
+        swarm (bool): run enemies, viruses and bullets on the numpy backend.
+    """
+
+    global worker_game
+
+    for name, value in overrides:
+        setattr(s, name, value)
+    s.SWARM_BACKEND = swarm
+
+    from game import CoronaBreakout
+    worker_game = CoronaBreakout(headless=True)
+    # stops its threads when the worker exits
+    Finalize(worker_game, worker_game.close, exitpriority=10)
+
+
+def run_one(job):
+    """Plays one run in the worker's game.
+
+    The game is reset to the same state whatever ran on it before, so a
+    run only depends on its seed.
+
+    Args:
+        job (tuple): (run index, seed, policy name, level, maximum ticks).
+
+    Returns:
+        result (dict): state of the game at the end of the run, with its
+            seed, policy and wall time.
+    """
+
+    index, seed, policy, level, frames = job
+    game = worker_game
+
+    start = time.perf_counter()
+    game.rng.seed(seed)
+    game.clock = FixedClock()
+    game.input = ScriptedInput()
+    game.score = 0
+    game.level = level
+    game.setup()
+
+    # the policy draws from its own generator, leaving the game's untouched
+    rng = random.Random(seed)
+    frame = 0
+    while game.playing and frame < frames:
+        POLICIES[policy](game, frame, rng)
+        game.step()
+        frame += 1
+
+    result = {'run': index, 'seed': seed, 'policy': policy}
+    result.update(game.summary(frame))
+    result['wall_time'] = time.perf_counter() - start
+    result['worker'] = os.getpid()
+
+    return result
+
+
+def distribution(values):
+    """Statistics of a list of numbers.
+
+    Args:
+        values (list): numbers.
+
+    Returns:
+        stats (dict): mean, minimum, p50, p90 and maximum.
+    """
+
+    values = sorted(values)
+    if not values:
+        return {}
+
+    return {
+        'mean': sum(values) / len(values),
+        'min': values[0],
+        'p50': values[len(values) // 2],
+        'p90': values[min(len(values) - 1, int(len(values) * 0.9))],
+        'max': values[-1],
+    }
+
+
+def aggregate(results):
+    """Aggregated statistics of a set of runs.
+
+    Args:
+        results (list): results of run_one().
+
+    Returns:
+        report (dict): outcome rates, causes of death, and distributions
+            of score, kills, vaccines, ticks and wall time.
+    """
+
+    runs = len(results)
+    causes = {}
+    for result in results:
+        if result['death_cause'] is not None:
+            causes[result['death_cause']] = causes.get(result['death_cause'], 0) + 1
+
+    return {
+        'runs': runs,
+        'completed': sum(result['completed'] for result in results) / runs,
+        'failed': sum(result['failed'] for result in results) / runs,
+        'death_causes': causes,
+        'score': distribution([result['score'] for result in results]),
+        'kills': distribution([result['kills'] for result in results]),
+        'vaccines': distribution([result['vaccines'] for result in results]),
+        'frames': distribution([result['frames'] for result in results]),
+        'wall_time': distribution([result['wall_time'] for result in results]),
+    }
+
+
+def parse_args():
+    """Parses command line arguments.
+
+    Returns:
+        args (argparse.Namespace): parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description='Batch runs of headless simulations.')
+    parser.add_argument('--runs', type=int, default=100, help='runs per policy')
+    parser.add_argument('--policy', action='append', choices=sorted(POLICIES),
+                        help='policy playing the runs, may be repeated. Defaults to random')
+    parser.add_argument('--level', type=int, default=1, help='level played')
+    parser.add_argument('--frames', type=int, default=None,
+                        help='ticks per run at most. Defaults to 2 minutes at FPS, as overridden')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first run, the others follow')
+    parser.add_argument('--set', dest='overrides', action='append', type=parse_override, default=[],
+                        metavar='NAME=VALUE', help='override a setting, may be repeated')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes')
+    parser.add_argument('--swarm', action='store_true',
+                        help='run enemies, viruses and bullets on the numpy backend')
+    parser.add_argument('--jsonl', default=None, help='file every run is streamed to, one JSON line each')
+    parser.add_argument('--out', default=None, help='JSON report to write, printed if not given')
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.frames is None:
+        args.frames = dict(args.overrides).get('FPS', s.FPS) * 120
+    policies = args.policy or ['random']
+    # every policy plays the same seeds, so they compare on the same courses
+    jobs = [(i, args.seed + i % args.runs, policy, args.level, args.frames)
+            for i, policy in enumerate(p for p in policies for _ in range(args.runs))]
+
+    results = []
+    stream = open(args.jsonl, 'w') if args.jsonl else None
+    start = time.perf_counter()
+
+    pool = multiprocessing.Pool(args.workers, init_worker, (args.overrides, args.swarm))
+    try:
+        for result in pool.imap_unordered(run_one, jobs):
+            results.append(result)
+            if stream is not None:
+                stream.write(json.dumps(result) + '\n')
+                stream.flush()
+            print(f"{len(results):>5}/{len(jobs)} {result['policy']:>8} seed={result['seed']:<6} "
+                  f"score={result['score']:<5} frames={result['frames']:<6} "
+                  f"{result['death_cause'] or ('completed' if result['completed'] else 'timeout')}",
+                  file=sys.stderr)
+        pool.close()
+    except BaseException:  # e.g. interrupted, the runs left are dropped
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+    wall_time = time.perf_counter() - start
+    if stream is not None:
+        stream.close()
+
+    results.sort(key=lambda result: result['run'])
+    report = {
+        'level': args.level,
+        'frames': args.frames,
+        'seed': args.seed,
+        'overrides': dict(args.overrides),
+        'swarm': args.swarm,
+        'workers': args.workers,
+        'wall_time': wall_time,
+        'runs_per_second': len(results) / wall_time,
+        'ticks_per_second': sum(result['frames'] for result in results) / wall_time,
+        'policies': {policy: aggregate([result for result in results if result['policy'] == policy])
+                     for policy in policies},
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
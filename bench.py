@@ -0,0 +1,338 @@
+"""Scenario benchmarks of the frame loop.
+
+Runs named scenarios headless under the SDL dummy video driver, timing
+events(), update() and draw() separately, and writes the results as JSON
+so runs can be compared across commits.
+
+    python bench.py --scenario level3_swarm --counts 0,20,40,80 --out bench.json
+"""
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import pygame
+import settings as s
+from game import CoronaBreakout
+from sprites import Slime, Bat, Virus
+
+PHASES = ('events', 'update', 'draw')
+
+
+def keep_alive(game):
+    """Keeps the player from dying, so a scenario runs its full length.
+
+    Args:
+        game (game_instance): Game instance.
+    """
+
+    game.player.lives = 10 ** 6
+    game.failed = False
+
+
+def spread_x(game, i, count):
+    """x coordinate of the i-th of count entities, spread over the screen.
+
+    Args:
+        game (game_instance): Game instance.
+        i (int): index of the entity.
+        count (int): number of entities.
+
+    Returns:
+        x (int): x coordinate in the world.
+    """
+
+    return game.camera.left + int(s.WIDTH * (i + game.rng.random()) / max(count, 1))
+
+
+def population(game, name):
+    """Entities of a kind, on either backend.
+
+    Args:
+        game (game_instance): Game instance.
+        name (str): 'enemies' or 'viruses'.
+
+    Returns:
+        entities (list): sprites, or indices in the swarm arrays.
+    """
+
+    if game.swarm is not None:
+        return list(range(len(getattr(game.swarm, name))))
+
+    return getattr(game, name).sprites()
+
+
+def place(game, entity, x, name='enemies'):
+    """Moves a freshly spawned entity, and keeps bats from dropping a virus.
+
+    Args:
+        game (game_instance): Game instance.
+        entity: sprite, or index in the swarm arrays.
+        x (int): x coordinate in the world.
+        name (str, optional): 'enemies' or 'viruses'. Defaults to 'enemies'
+    """
+
+    if game.swarm is not None:
+        arrays = getattr(game.swarm, name)
+        arrays['x'][entity] = x
+        arrays['px'][entity] = x
+        arrays['spreaded'][entity] = True
+    else:
+        entity.rect.left = x
+        entity.spreaded = True
+
+
+def level1_idle(game, frame, count):
+    """Level 1, nobody touches the keyboard.
+    """
+
+    keep_alive(game)
+
+
+def level3_swarm(game, frame, count):
+    """Level 3, topped up to count bacteria walking across the screen.
+    """
+
+    keep_alive(game)
+    missing = count - len(population(game, 'enemies'))
+    for i in range(missing):
+        slime = game.spawn(Slime, bacteria=True)
+        place(game, slime, spread_x(game, i, missing))
+
+
+def level4_bats(game, frame, count):
+    """Level 4, topped up to count boss bats and count boss viruses.
+    """
+
+    keep_alive(game)
+    missing = count - len(population(game, 'enemies'))
+    for i in range(missing):
+        bat = game.spawn(Bat, boss=True)
+        place(game, bat, spread_x(game, i, missing))
+
+    missing = count - len(population(game, 'viruses'))
+    bats = population(game, 'enemies')
+    for i in range(missing):
+        virus = game.spawn(Virus, bats[i % len(bats)], boss=True)
+        place(game, virus, spread_x(game, i, missing), 'viruses')
+
+
+def bullet_spam(game, frame, count):
+    """Level 1, a bullet fired every tick.
+    """
+
+    keep_alive(game)
+    game.n_bullets = 10 ** 6
+    game.input.tap(pygame.K_SPACE)
+
+
+def long_scroll(game, frame, count):
+    """Level 1, running right the whole time, scrolling the level.
+    """
+
+    keep_alive(game)
+    game.platforms_crossed = 0
+    if frame == 0:
+        game.input.press(pygame.K_RIGHT)
+
+
+def horde(game, frame, count):
+    """Level 3, topped up to count bacteria and bats, meant for thousands.
+    """
+
+    keep_alive(game)
+    missing = count - len(population(game, 'enemies'))
+    for i in range(missing):
+        enemy = game.spawn(Bat) if i % 2 else game.spawn(Slime, bacteria=True)
+        place(game, enemy, spread_x(game, i, missing))
+
+
+# name: (level, policy, entity count sweepable)
+SCENARIOS = {
+    'level1_idle': (1, level1_idle, False),
+    'level3_swarm': (3, level3_swarm, True),
+    'level4_bats': (4, level4_bats, True),
+    'bullet_spam': (1, bullet_spam, False),
+    'long_scroll': (1, long_scroll, False),
+    'horde': (3, horde, True),
+}
+
+
+def percentile(values, q):
+    """q-th percentile of a sorted list, nearest rank.
+
+    Args:
+        values (list): sorted values.
+        q (float): percentile between 0 and 100.
+
+    Returns:
+        value (float): the percentile.
+    """
+
+    if not values:
+        return 0.0
+
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def summarize(times, blocks):
+    """Statistics of one phase.
+
+    Args:
+        times (list): durations in seconds, one per frame.
+        blocks (list): net allocated blocks, one per frame.
+
+    Returns:
+        stats (dict): mean, p50 and p99 in milliseconds, mean net blocks.
+    """
+
+    ms = sorted(t * 1000 for t in times)
+    return {
+        'mean': sum(ms) / len(ms),
+        'p50': percentile(ms, 50),
+        'p99': percentile(ms, 99),
+        'alloc_blocks': sum(blocks) / len(blocks),
+    }
+
+
+def run_scenario(game, name, frames, count=0, warmup=30, seed=0):
+    """Runs a scenario and times each phase of every frame.
+
+    Args:
+        game (game_instance): Headless game instance, reused across runs.
+        name (str): Name of the scenario.
+        frames (int): Number of measured frames.
+        count (int, optional): Entity count for sweepable scenarios.
+        warmup (int, optional): Frames run before measuring.
+        seed (int, optional): Seed of the game's random numbers.
+
+    Returns:
+        result (dict): per phase and total frame statistics.
+    """
+
+    level, policy, _ = SCENARIOS[name]
+    game.rng.seed(seed)
+    game.input.get_events()
+    game.input.keys.clear()
+    game.level = level
+    game.setup()
+    for pool in game.pools.values():  # stats of this run only
+        pool.clear()
+
+    times = {phase: [] for phase in PHASES + ('total',)}
+    blocks = {phase: [] for phase in PHASES + ('total',)}
+    collections = sum(stat['collections'] for stat in gc.get_stats())
+
+    for frame in range(warmup + frames):
+        policy(game, frame, count)
+
+        game.clock.tick(s.FPS)
+        b0 = sys.getallocatedblocks()
+        t0 = time.perf_counter()
+        game.events()
+        t1 = time.perf_counter()
+        b1 = sys.getallocatedblocks()
+        game.update()
+        t2 = time.perf_counter()
+        b2 = sys.getallocatedblocks()
+        game.draw()
+        t3 = time.perf_counter()
+        b3 = sys.getallocatedblocks()
+
+        if frame < warmup:
+            continue
+
+        for phase, t, b in (('events', t1 - t0, b1 - b0), ('update', t2 - t1, b2 - b1),
+                            ('draw', t3 - t2, b3 - b2), ('total', t3 - t0, b3 - b0)):
+            times[phase].append(t)
+            blocks[phase].append(b)
+
+    return {
+        'count': count,
+        'frames': frames,
+        'sprites': len(game.all_sprites),
+        'gc_collections': sum(stat['collections'] for stat in gc.get_stats()) - collections,
+        'pools': game.pool_info(),
+        'assets': game.assets.info(),
+        'phases': {phase: summarize(times[phase], blocks[phase]) for phase in times},
+    }
+
+
+def git_commit():
+    """Commit the benchmark ran on, if known.
+
+    Returns:
+        commit (str or None): hash of HEAD.
+    """
+
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def parse_args():
+    """Parses command line arguments.
+
+    Returns:
+        args (argparse.Namespace): parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description='Scenario benchmarks of the frame loop.')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='scenario to run, may be repeated. Defaults to all')
+    parser.add_argument('--frames', type=int, default=600, help='measured frames per run')
+    parser.add_argument('--counts', default='10,20,40,80',
+                        help='comma separated entity counts swept by sweepable scenarios')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random numbers')
+    parser.add_argument('--swarm', action='store_true',
+                        help='run enemies, viruses and bullets on the numpy backend')
+    parser.add_argument('--out', default=None, help='JSON file to write, printed if not given')
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    counts = [int(c) for c in args.counts.split(',') if c]
+    s.SWARM_BACKEND = args.swarm
+
+    game = CoronaBreakout(headless=True, seed=args.seed)
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'frames': args.frames,
+        'seed': args.seed,
+        'swarm': args.swarm,
+        'scenarios': {},
+    }
+
+    for name in args.scenario or sorted(SCENARIOS):
+        sweepable = SCENARIOS[name][2]
+        runs = [run_scenario(game, name, args.frames, count, seed=args.seed) for count in (counts if sweepable else [0])]
+        report['scenarios'][name] = {
+            'runs': runs,
+            # scaling curve: entity count against mean frame time
+            'scaling': [[run['count'], run['phases']['total']['mean']] for run in runs],
+        }
+
+        for run in runs:
+            total = run['phases']['total']
+            print(f"{name:>14} count={run['count']:<4} mean={total['mean']:.3f}ms "
+                  f"p50={total['p50']:.3f}ms p99={total['p99']:.3f}ms", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    game.close()
+    pygame.quit()
@@ -0,0 +1,150 @@
+import pygame
+import settings as s
+
+
+class Camera:
+    """Horizontal camera over the world.
+
+    Sprites keep their rects in world coordinates, so scrolling only moves
+    the camera, and collisions need no transform. The camera offset is
+    applied when drawing. A sprite with a `parallax` attribute scrolls at
+    that fraction of the camera speed, 0 staying fixed on screen.
+
+    Drawing happens between two ticks: positions of the camera and of the
+    sprites are interpolated between the previous tick and the current
+    one, alpha of the way. The previous position of a sprite is kept on
+    the sprite, as its `prev` attribute.
+    """
+
+    def __init__(self):
+        """Initializing the camera at the start of the level.
+        """
+
+        self.x = 0.0
+        self.dx = 0.0
+        self.screen_rect = pygame.Rect(0, 0, s.WIDTH, s.HEIGHT)
+
+        # interpolation between the previous tick and the current one
+        self.prev_x = 0.0
+        self.alpha = 1.0
+
+    @property
+    def left(self):
+        """World x coordinate of the left edge of the screen.
+        """
+
+        return int(self.x)
+
+    @property
+    def right(self):
+        """World x coordinate of the right edge of the screen.
+        """
+
+        return int(self.x) + s.WIDTH
+
+    @property
+    def view_x(self):
+        """World x coordinate of the left edge of the screen, as drawn.
+        """
+
+        return self.prev_x + (self.x - self.prev_x) * self.alpha
+
+    def snapshot(self, sprites):
+        """Remembers where everything is, before a tick.
+
+        Args:
+            sprites (iterable): sprites to be interpolated.
+        """
+
+        self.prev_x = self.x
+        # set on the sprites, no mapping of every sprite is built per tick
+        for sprite in sprites:
+            sprite.prev = sprite.rect.topleft
+
+    def forget(self, sprite):
+        """Draws a sprite where it is, e.g. after it respawned.
+
+        Args:
+            sprite (pygame.sprite.Sprite): sprite in the world.
+        """
+
+        sprite.prev = None
+
+    def position(self, sprite):
+        """Position of a sprite in the world, as drawn.
+
+        Args:
+            sprite (pygame.sprite.Sprite): sprite in the world.
+
+        Returns:
+            pos (tuple): interpolated (x, y) of the top left corner.
+        """
+
+        x, y = sprite.rect.topleft
+        # sprites spawned since the last tick have no previous position
+        prev = getattr(sprite, 'prev', None) if self.alpha < 1 else None
+        if prev is None:
+            return x, y
+
+        # teleported, e.g. a wrapping background
+        if abs(x - prev[0]) > s.WIDTH / 4 or abs(y - prev[1]) > s.HEIGHT / 4:
+            return x, y
+
+        return (int(prev[0] + (x - prev[0]) * self.alpha),
+                int(prev[1] + (y - prev[1]) * self.alpha))
+
+    def scroll(self, dx):
+        """Moves the camera towards the right, once per tick.
+
+        Args:
+            dx (float): distance in pixels, 0 if not scrolling.
+        """
+
+        self.dx = dx
+        self.x += dx
+
+    def offset(self, sprite):
+        """Horizontal offset between a sprite's rect and the screen.
+
+        Args:
+            sprite (pygame.sprite.Sprite): sprite in the world.
+
+        Returns:
+            offset (int): pixels to subtract from the rect.
+        """
+
+        return int(self.x * getattr(sprite, 'parallax', 1))
+
+    def apply(self, sprite):
+        """Screen rect of a sprite, as drawn.
+
+        Args:
+            sprite (pygame.sprite.Sprite): sprite in the world.
+
+        Returns:
+            rect (pygame.Rect): rect of the sprite on screen.
+        """
+
+        x, y = self.position(sprite)
+        rect = sprite.rect.copy()
+        rect.topleft = (x - int(self.view_x * getattr(sprite, 'parallax', 1)), y)
+        return rect
+
+    def draw(self, sprites, surface):
+        """Draws the sprites on screen, skipping those out of view.
+
+        Args:
+            sprites (iterable): sprites, in drawing order.
+            surface (pygame.Surface): Surface to draw on.
+        """
+
+        view_x = self.view_x
+        blits = []
+        for sprite in sprites:
+            image = sprite.image
+            x, y = self.position(sprite)
+            left = x - int(view_x * getattr(sprite, 'parallax', 1))
+            if left < s.WIDTH and left + image.get_width() > 0:
+                blits.append((image, (left, y)))
+
+        surface.blits(blits, doreturn=False)
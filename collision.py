@@ -0,0 +1,129 @@
+import settings as s
+
+
+class SpatialHash:
+    """Uniform grid over the sprites of a group, for broad-phase collisions.
+
+    Built once per tick. A query only looks at the sprites sharing a cell
+    with the rect asked for, instead of scanning the whole group, and the
+    narrow-phase check (e.g. collide_mask) only runs on those candidates.
+    """
+
+    def __init__(self, group, cell_size=s.COLLISION_CELL):
+        """Hashes every sprite of a group.
+
+        Args:
+            group (pygame.sprite.Group or list): Sprites to be hashed.
+            cell_size (int, optional): Width and height of a cell in pixels.
+                Defaults to COLLISION_CELL
+        """
+
+        self.group = group
+        self.cell_size = cell_size
+        self.cells = {}
+
+        for sprite in group:
+            self.insert(sprite)
+
+    def cells_of(self, rect):
+        """Cells a rect overlaps.
+
+        Args:
+            rect (pygame.Rect): area on screen.
+
+        Returns:
+            cells (iterator): (column, row) keys.
+        """
+
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+
+    def insert(self, sprite):
+        """Adds a sprite to every cell its rect overlaps.
+
+        Args:
+            sprite (pygame.sprite.Sprite): sprite to be hashed.
+        """
+
+        for cell in self.cells_of(sprite.rect):
+            bucket = self.cells.get(cell)
+            if bucket is None:
+                self.cells[cell] = [sprite]
+            else:
+                bucket.append(sprite)
+
+    def query(self, rect):
+        """Sprites sharing a cell with a rect.
+
+        Args:
+            rect (pygame.Rect): area on screen.
+
+        Returns:
+            candidates (list): sprites that may overlap the rect, each once.
+        """
+
+        candidates = {}
+        for cell in self.cells_of(rect):
+            for sprite in self.cells.get(cell, ()):
+                candidates[sprite] = None
+
+        return list(candidates)
+
+    def collide(self, sprite, dokill=False, collided=None):
+        """Sprites of the group colliding with a sprite.
+
+        Same as pygame.sprite.spritecollide(), on the hashed group. Sprites
+        killed since the hash was built are skipped.
+
+        Args:
+            sprite (pygame.sprite.Sprite): sprite to test.
+            dokill (bool, optional): kill the sprites hit. Defaults to False
+            collided (callable, optional): narrow-phase test, run after the
+                rects overlap. Defaults to None
+
+        Returns:
+            hits (list): sprites of the group colliding with the sprite.
+        """
+
+        rect = sprite.rect
+        hits = []
+        for other in self.query(rect):
+            if other not in self.group or not rect.colliderect(other.rect):
+                continue
+            if collided is None or collided(sprite, other):
+                hits.append(other)
+
+        if dokill:
+            for other in hits:
+                other.kill()
+
+        return hits
+
+
+def groupcollide(groupa, hashb, dokilla, dokillb, collided=None):
+    """Sprites of a group colliding with the sprites of a hashed group.
+
+    Same as pygame.sprite.groupcollide(), with group b behind a spatial hash.
+
+    Args:
+        groupa (pygame.sprite.Group): first group.
+        hashb (SpatialHash): second group, hashed.
+        dokilla (bool): kill the sprites of group a that hit.
+        dokillb (bool): kill the sprites of group b that were hit.
+        collided (callable, optional): narrow-phase test. Defaults to None
+
+    Returns:
+        crashed (dict): sprites of group a mapped to the sprites of b they hit.
+    """
+
+    crashed = {}
+    for sprite in groupa.sprites():
+        hits = hashb.collide(sprite, dokillb, collided)
+        if hits:
+            crashed[sprite] = hits
+            if dokilla:
+                sprite.kill()
+
+    return crashed
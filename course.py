@@ -0,0 +1,281 @@
+import queue
+import random
+import threading
+from collections import deque
+import settings as s
+from sprites import Platform
+
+
+def jump_arc():
+    """Path of the highest, longest jump of the player.
+
+    Follows the same steps as Player.update(), jumping while running at
+    full speed and holding the jump key.
+
+    Returns:
+        arc (list): (distance, rise) of the player's feet, per tick, until
+            a screen below the height it jumped from.
+    """
+
+    vel_x = 0.0
+    for _ in range(s.FPS * 5):  # full speed, where friction cancels acceleration
+        vel_x += s.PLAYER_ACC - vel_x * s.PLAYER_FRICTION
+
+    x = rise = 0.0
+    vel_y = -s.PLAYER_JUMP_VEL
+    arc = []
+    while rise > -s.HEIGHT:
+        acc_x = s.PLAYER_ACC - vel_x * s.PLAYER_FRICTION
+        vel_x += acc_x
+        vel_y += s.PLAYER_GRAV
+        x += vel_x + 0.5 * acc_x
+        rise -= vel_y + 0.5 * s.PLAYER_GRAV
+        arc.append((x, rise))
+
+    return arc
+
+
+ARC = jump_arc()
+HIGHEST = max(rise for _, rise in ARC)  # rise of the highest jump
+
+
+class Chunk:
+    """A stretch of the course, COURSE_CHUNK wide.
+    """
+
+    def __init__(self, left, platforms, resume):
+        """Initializing a generated chunk.
+
+        Args:
+            left (int): World x coordinate where the chunk starts.
+            platforms (list): (x, y, tile, powerup) of every platform
+                starting in the chunk.
+            resume (tuple): State of the generator after the chunk.
+        """
+
+        self.left = left
+        self.platforms = platforms
+        self.resume = resume
+
+
+class CourseGenerator:
+    """Lays out the platforms of a level, one chunk after the other.
+
+    Every platform can be reached from the previous one or from the
+    ground, following the player's jump. Only depends on its seed, so
+    the same course is generated whatever thread runs it.
+    """
+
+    def __init__(self, tiles, sizes, seed, start):
+        """Initializing a generator after the starting platforms.
+
+        Args:
+            tiles (str): Kind of platform tiles of the level.
+            sizes (dict): Name of every platform tile mapped to its size.
+            seed (int): Seed of the course.
+            start (tuple): x of the right edge and y of the top of the last
+                starting platform.
+        """
+
+        self.tiles = tiles
+        self.sizes = sizes
+        self.rng = random.Random(seed)
+        self.right, self.top = start
+        self.next = self.place()
+
+    def getstate(self):
+        """State to resume the generator from, see setstate().
+
+        Returns:
+            state (tuple): state of the random numbers, the last platform
+                and the next one.
+        """
+
+        return self.rng.getstate(), self.right, self.top, self.next
+
+    def setstate(self, state):
+        """Resumes the generator where getstate() was called.
+
+        Args:
+            state (tuple): a state returned by getstate().
+        """
+
+        rng, self.right, self.top, self.next = state
+        self.rng.setstate(rng)
+
+    def reachable(self, x, y, tile):
+        """Whether a platform can be landed on, from the ground or the last platform.
+
+        The player lands on a platform once its feet are above the
+        platform's middle. With the default jump and placement ranges,
+        every platform is within a jump from the ground, about 230 pixels
+        against 225 at most, so the jump from the last platform is only
+        checked once PLAYER_JUMP_VEL, PLAYER_GRAV or the ranges of place()
+        are tuned.
+
+        Args:
+            x (int): x coordinate of the left edge of the platform.
+            y (int): y coordinate of the top of the platform.
+            tile (str): Tile of the platform.
+
+        Returns:
+            reachable (bool): some jump lands on the platform.
+        """
+
+        middle = y + self.sizes[tile][1] / 2
+        ground = s.HEIGHT - s.BASE_HEIGHT + 5  # where the feet rest on a base
+
+        # the ground runs under every platform, any run-up will do
+        if HIGHEST > ground - middle:
+            return True
+
+        gap = x - self.right
+        rise = self.top + 5 - middle
+        return any(distance >= gap and height > rise for distance, height in ARC)
+
+    def place(self):
+        """Places the platform after the last one.
+
+        Returns:
+            platform (tuple): x, y, tile and powerup of the platform.
+        """
+
+        for _ in range(s.COURSE_ATTEMPTS):
+            x = self.right + self.rng.randrange(200, 400)
+            y = s.HEIGHT - 150 - s.BASE_HEIGHT - self.rng.randrange(0, 100, 20)
+            tile, powerup = Platform.roll(self.rng, self.tiles)
+            if self.reachable(x, y, tile):
+                break
+        else:  # as low as platforms go
+            y = s.HEIGHT - 150 - s.BASE_HEIGHT
+
+        self.right = x + self.sizes[tile][0]
+        self.top = y
+        return x, y, tile, powerup
+
+    def chunk(self):
+        """Generates the next chunk of the course.
+
+        Returns:
+            chunk (Chunk): the platforms starting in the chunk.
+        """
+
+        left = self.next[0] // s.COURSE_CHUNK * s.COURSE_CHUNK
+        platforms = []
+        while self.next[0] < left + s.COURSE_CHUNK:
+            platforms.append(self.next)
+            self.next = self.place()
+
+        return Chunk(left, platforms, self.getstate())
+
+
+class Course:
+    """Platforms of a level, generated ahead of the camera.
+
+    Chunks of the course are generated on a background thread into a
+    bounded queue, and turned into platforms once they get within
+    COURSE_AHEAD of the screen. Platforms are retired in the order they
+    were placed, as the camera leaves them behind, so a level of any
+    length holds a few screens of platforms at most.
+    """
+
+    def __init__(self, tiles, sizes, seed, start):
+        """Starts generating the course.
+
+        Args:
+            tiles (str): Kind of platform tiles of the level.
+            sizes (dict): Name of every platform tile mapped to its size.
+            seed (int): Seed of the course.
+            start (tuple): x of the right edge and y of the top of the last
+                starting platform.
+        """
+
+        self.generator = CourseGenerator(tiles, sizes, seed, start)
+        self.platforms = deque()  # placed and not left behind yet, left to right
+        self.start()
+        self.chunk = self.chunks.get()  # next to be placed
+
+    def start(self):
+        """Starts the generator thread.
+        """
+
+        self.chunks = queue.Queue(s.COURSE_QUEUE)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.generate, name='course', daemon=True)
+        self.thread.start()
+
+    def generate(self):
+        """Generates chunks until stopped, run by the generator thread.
+        """
+
+        while not self.stopped.is_set():
+            # waits while the queue is full
+            self.chunks.put(self.generator.chunk())
+
+    def ahead(self, right):
+        """Platforms of the chunks starting before a point.
+
+        Args:
+            right (float): World x coordinate the course must be placed up to.
+
+        Returns:
+            platforms (list): (x, y, tile, powerup) of the platforms to
+                place, none most of the time.
+        """
+
+        platforms = []
+        while self.chunk.left < right:
+            platforms.extend(self.chunk.platforms)
+            self.chunk = self.chunks.get()  # generated well ahead, rarely waits
+
+        return platforms
+
+    def add(self, plat):
+        """Tracks a placed platform, to retire it once left behind.
+
+        Args:
+            plat (Platform): Platform sprite, placed right of the others.
+        """
+
+        self.platforms.append(plat)
+
+    def retire(self, left):
+        """Kills the platforms left behind.
+
+        Args:
+            left (float): World x coordinate of the left edge of the screen.
+
+        Returns:
+            retired (int): platforms killed.
+        """
+
+        retired = 0
+        while self.platforms and self.platforms[0].rect.right <= left:
+            self.platforms.popleft().kill()
+            retired += 1
+
+        return retired
+
+    def close(self):
+        """Stops the generator thread.
+        """
+
+        self.stopped.set()
+        # frees the queue, in case the thread is waiting on it
+        while self.thread.is_alive():
+            try:
+                self.chunks.get_nowait()
+            except queue.Empty:
+                self.thread.join(0.01)
+
+    def __getstate__(self):
+        # saved in replays: the course resumes after the next chunk to be placed
+        return {'platforms': self.platforms, 'chunk': self.chunk, 'sizes': self.generator.sizes,
+                'tiles': self.generator.tiles}
+
+    def __setstate__(self, state):
+        self.platforms = state['platforms']
+        self.chunk = state['chunk']
+        self.generator = CourseGenerator(state['tiles'], state['sizes'], 0, (0, 0))
+        self.generator.setstate(self.chunk.resume)
+        self.start()
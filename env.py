@@ -0,0 +1,293 @@
+"""The game as a reinforcement learning environment.
+
+CoronaEnv plays a level headless behind a Gym-style reset()/step() API,
+with the drawn screen as observation and the score gained as reward.
+VectorEnv runs several of them in worker processes, blitting their frames
+straight into shared memory, so stepping them never copies or pickles a
+frame through a pipe.
+
+Drawing the screen is most of the time of a step. An agent that learns
+from the state of the game rather than its pixels gets several times the
+steps per second with pixels=False.
+
+Needs NumPy (python -m pip install numpy).
+
+    envs = VectorEnv(8, level=3)
+    frames = envs.reset(seed=0)
+    frames, rewards, dones, infos = envs.step([random.randrange(len(ACTIONS)) for _ in range(8)])
+"""
+import multiprocessing
+import numpy as np
+import pygame
+import settings as s
+from game import CoronaBreakout
+from simulation import ScriptedInput, FixedClock
+
+# keys held by each action: nothing, left or right, each with or without
+# jumping and shooting. holding a key does not repeat it, a jump or a shot
+# needs an action without it in between
+ACTIONS = tuple(
+    frozenset(key for key in (move, jump, shoot) if key is not None)
+    for shoot in (None, pygame.K_SPACE)
+    for jump in (None, pygame.K_UP)
+    for move in (None, pygame.K_LEFT, pygame.K_RIGHT)
+)
+
+OBSERVATION_SHAPE = (s.HEIGHT, s.WIDTH, 3)
+
+
+class CoronaEnv:
+    """A level of the game, played one action at a time.
+
+    Observations are the screen as a (HEIGHT, WIDTH, 3) array of RGB
+    bytes. The same array is overwritten by every step, copy it to keep
+    it. Without pixels, the game is not drawn and observations are None,
+    observe() still draws one on demand. An episode ends when the level is
+    failed or completed, or after max_frames ticks.
+    """
+
+    def __init__(self, level=1, max_frames=None, frame_skip=1, frame=None, pixels=True):
+        """Initializing the environment, reset() starts the first episode.
+
+        Args:
+            level (int, optional): Level played. Defaults to 1
+            max_frames (int, optional): Ticks per episode at most. Defaults to 2 minutes at FPS
+            frame_skip (int, optional): Ticks per step, the action being held.
+                Defaults to 1
+            frame (np.ndarray, optional): Array the observations are written to.
+                Defaults to a new one
+            pixels (bool, optional): Draw the observation of every step.
+                Defaults to True
+        """
+
+        self.game = CoronaBreakout(headless=True)
+        self.level = level
+        # read when created, settings may be overridden after this module is imported
+        self.max_frames = s.FPS * 120 if max_frames is None else max_frames
+        self.frame_skip = frame_skip
+        self.pixels = pixels
+        self.frame = np.empty(OBSERVATION_SHAPE, np.uint8) if frame is None else frame
+        # 24 bit surface over the array, the screen is converted to RGB straight into it
+        self.surface = pygame.image.frombuffer(self.frame, (s.WIDTH, s.HEIGHT), 'RGB')
+
+        self.frames = 0
+        self.score = 0
+
+    def reset(self, seed=None):
+        """Starts a new episode.
+
+        Args:
+            seed (int, optional): Seed of the level. Defaults to a random one
+
+        Returns:
+            observation (np.ndarray): the first frame, None without pixels.
+        """
+
+        game = self.game
+        game.rng.seed(seed)
+        game.clock = FixedClock()
+        game.input = ScriptedInput()
+        game.score = 0
+        game.level = self.level
+        game.setup()
+
+        self.frames = 0
+        self.score = 0
+
+        return self.observe() if self.pixels else None
+
+    def step(self, action):
+        """Holds the keys of an action for frame_skip ticks.
+
+        Args:
+            action (int): index in ACTIONS.
+
+        Returns:
+            observation (np.ndarray): the frame after the step, None without pixels.
+            reward (int): score gained during the step.
+            done (bool): the episode is over.
+            info (dict): state of the game, as reported by simulations.
+        """
+
+        game = self.game
+        keys = ACTIONS[action]
+        for key in game.input.keys - keys:
+            game.input.release(key)
+        for key in keys - game.input.keys:
+            game.input.press(key)
+
+        for _ in range(self.frame_skip):
+            game.step()
+            self.frames += 1
+            if not game.playing or self.frames >= self.max_frames:
+                break
+
+        reward = game.score - self.score
+        self.score = game.score
+        done = not game.playing or self.frames >= self.max_frames
+
+        observation = self.observe() if self.pixels else None
+        return observation, reward, done, game.summary(self.frames)
+
+    def observe(self):
+        """Draws the game and converts the screen into the observation.
+
+        Returns:
+            observation (np.ndarray): the frame.
+        """
+
+        self.game.draw()
+        self.surface.blit(self.game.screen, (0, 0))
+
+        return self.frame
+
+    def close(self):
+        """Shuts the game down.
+        """
+
+        self.game.close()
+        pygame.quit()
+
+
+def run_worker(index, count, pipe, memory, level, max_frames, frame_skip, pixels):
+    """Steps one environment of a VectorEnv, in its own process.
+
+    Args:
+        index (int): Index of the environment.
+        count (int): Number of environments.
+        pipe (multiprocessing.Connection): Commands from the VectorEnv.
+        memory (multiprocessing.RawArray): Frames of every environment.
+        level (int): Level played.
+        max_frames (int): Ticks per episode at most.
+        frame_skip (int): Ticks per step.
+        pixels (bool): Draw the frame of every step.
+    """
+
+    frames = np.frombuffer(memory, np.uint8).reshape((count,) + OBSERVATION_SHAPE)
+    env = CoronaEnv(level, max_frames, frame_skip, frame=frames[index], pixels=pixels)
+    seed = None
+    episodes = 0
+
+    while True:
+        command, arg = pipe.recv()
+
+        if command == 'reset':
+            seed = arg
+            episodes = 0
+            env.reset(seed)
+            pipe.send(None)
+
+        elif command == 'step':
+            _, reward, done, info = env.step(arg)
+            if done:
+                # the next episode starts right away, on the next seed of this environment
+                episodes += 1
+                env.reset(None if seed is None else seed + episodes * count)
+            pipe.send((reward, done, info))
+
+        elif command == 'close':
+            break
+
+    env.close()
+    pipe.close()
+
+
+class VectorEnv:
+    """Several CoronaEnv stepped at once, each in a worker process.
+
+    Frames are written by the workers into shared memory and read as one
+    (count, HEIGHT, WIDTH, 3) array, without being copied or pickled. The
+    array is overwritten by every step, and is None without pixels. An
+    episode that ends is reset in the same step: the frame is then the
+    first of the next episode, and the info the last state of the one that
+    ended.
+
+    The shared memory is a RawArray handed to the workers when they start,
+    so it works on every Python the game runs on, with fork or spawn.
+    """
+
+    def __init__(self, count, level=1, max_frames=None, frame_skip=1, pixels=True):
+        """Starts the workers.
+
+        Args:
+            count (int): Number of environments.
+            level (int, optional): Level played. Defaults to 1
+            max_frames (int, optional): Ticks per episode at most. Defaults to 2 minutes at FPS
+            frame_skip (int, optional): Ticks per step. Defaults to 1
+            pixels (bool, optional): Draw the frame of every step. Defaults to True
+        """
+
+        self.count = count
+        self.pixels = pixels
+        # resolved here, spawned workers only see the settings of settings.py
+        if max_frames is None:
+            max_frames = s.FPS * 120
+        self.memory = multiprocessing.RawArray('B', count * int(np.prod(OBSERVATION_SHAPE)))
+        self.frames = np.frombuffer(self.memory, np.uint8).reshape((count,) + OBSERVATION_SHAPE)
+
+        self.pipes = []
+        self.workers = []
+        for i in range(count):
+            pipe, worker_pipe = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=run_worker, daemon=True,
+                args=(i, count, worker_pipe, self.memory, level, max_frames, frame_skip, pixels))
+            worker.start()
+            worker_pipe.close()
+            self.pipes.append(pipe)
+            self.workers.append(worker)
+
+    def reset(self, seed=None):
+        """Starts a new episode in every environment.
+
+        Args:
+            seed (int, optional): Seed of the first environment, the others
+                follow. Defaults to random seeds
+
+        Returns:
+            frames (np.ndarray): the first frame of every environment, None without pixels.
+        """
+
+        for i, pipe in enumerate(self.pipes):
+            pipe.send(('reset', None if seed is None else seed + i))
+        for pipe in self.pipes:
+            pipe.recv()
+
+        return self.frames if self.pixels else None
+
+    def step(self, actions):
+        """Steps every environment with its action, in parallel.
+
+        Args:
+            actions (sequence): index in ACTIONS, per environment.
+
+        Returns:
+            frames (np.ndarray): the frame of every environment, None without pixels.
+            rewards (np.ndarray): score gained, per environment.
+            dones (np.ndarray): True where an episode ended.
+            infos (list): state of the game, per environment.
+        """
+
+        for pipe, action in zip(self.pipes, actions):
+            pipe.send(('step', int(action)))
+        results = [pipe.recv() for pipe in self.pipes]
+
+        rewards = np.array([result[0] for result in results], np.float32)
+        dones = np.array([result[1] for result in results], bool)
+        infos = [result[2] for result in results]
+
+        return (self.frames if self.pixels else None), rewards, dones, infos
+
+    def close(self):
+        """Stops the workers and lets go of the shared memory.
+
+        Views of the frames must not be used afterwards.
+        """
+
+        for pipe in self.pipes:
+            pipe.send(('close', None))
+        for worker in self.workers:
+            worker.join()
+
+        self.frames = None
+        self.memory = None
@@ -1,28 +1,89 @@
 import os
 import sys
 import pygame
+import time
 import random
 import settings as s
-from sprites import SpriteSheet, Platform, Player, Base, Cloud, Slime, BackGround, Bullet, Bat
+from assets import AssetRegistry
+from audio import AudioManager
+from atlas import AtlasIndex
+from bake import BakedCache
+from camera import Camera
+from collision import SpatialHash, groupcollide
+from course import Course
+from hud import Hud, TextRenderer, align
+from leaderboard import Leaderboard
+from levels import load_levels
+from render import DirtyRenderer
+from pool import Pool
+from prefetch import Prefetcher
+from profiler import FrameProfiler
+from swarm import Swarm, np
+from video import FrameCapture
+from simulation import KeyboardInput, ScriptedInput, RealClock, FixedClock
+from sprites import SpriteSheet, Platform, Player, Base, Cloud, Slime, BackGround, Bullet, Bat, Virus, PowerUp
+
+# wakes static screens up to start music that was still being decoded
+IDLE_WAKE = pygame.USEREVENT
 
 
 class CoronaBreakout:
 
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, input_source=None, clock=None, profile=None):
         """Initializing attributes for a new game.
+
+        Args:
+            headless (bool): Run without a window, sound or blocking screens,
+                as fast as possible. Defaults to False.
+            seed (int, optional): Seed of the game's random numbers.
+            input_source (optional): Source of key events and key states.
+                Defaults to the keyboard, or scripted input if headless.
+            clock (optional): Source of game time, advanced once per tick.
+                Defaults to a fixed step clock.
+            profile (str, optional): Name the scores are recorded under.
+                Defaults to PROFILE.
         """
 
+        self.headless = headless
+        if self.headless:  # a display is still needed to convert images
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+            # Ctrl-C and terminating worker processes still work
+            os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', '1')
+
         pygame.init()
         pygame.mixer.init()
 
-        self.screen = pygame.display.set_mode((s.WIDTH, s.HEIGHT))
+        self.screen = pygame.display.set_mode((s.WIDTH, s.HEIGHT), 0, 32 if headless else 0)
         pygame.display.set_caption(s.TITLE)
 
-        self.clock = pygame.time.Clock()
+        if input_source is None:
+            input_source = ScriptedInput() if self.headless else KeyboardInput()
+        if clock is None:
+            clock = FixedClock()
+
+        self.input = input_source
+        self.clock = clock
+        self.frame_clock = RealClock()  # paces drawing, not the game
+        self.seed = seed
+        self.profile = profile or s.PROFILE
+        self.rng = random.Random(seed)
+        self.recorder = None  # replay.Recorder of the game, if recorded
+        self.capture = None  # FrameCapture of the screen, if recording
+        self.course = None  # platforms of the level being played
         self.font_name = pygame.font.match_font(s.FONT_NAME)
+        self.text = TextRenderer(self.font_name)
         self.paused = False
         self.running = True
+        self.visible = True  # window not minimized
+        self.focused = True  # window has the keyboard focus
+        self.renderer = None
+        self.profiler = FrameProfiler()
+        self.assets = AssetRegistry()
+        self.prefetcher = Prefetcher(self.assets)
+        self.pools = {cls: Pool(cls, s.POOL_CAPACITY[cls.__name__]) for cls in (Bullet, Slime, Bat, Virus, PowerUp)}
         self.score = 0
+        self.games_played = 0  # game overs so far
         self.load_data()
 
     def load_data(self):
@@ -36,19 +97,32 @@ class CoronaBreakout:
         self.sound_dir = os.path.join(self.dir, 'sounds')
         self.comic_dir = os.path.join(self.dir, 'Comic Strips')
 
-        # load high score
-        try:  # if file exists, load data
-            with open(os.path.join(self.dir, s.HS_FILE), 'r') as f:
-                self.highscore = int(f.read())
-        except Exception:   # else create new file and set highscore to 0
-            with open(os.path.join(self.dir, s.HS_FILE), 'w') as f:
-                self.highscore = 0
+        # levels, played in order
+        self.levels = load_levels(os.path.join(self.dir, s.LEVELS_DIR))
+
+        # load high score, simulations keep no scores
+        self.leaderboard = None
+        self.highscore = 0
+        if not self.headless:
+            self.leaderboard = Leaderboard(os.path.join(self.dir, s.SCORES_FILE),
+                                           legacy=os.path.join(self.dir, s.HS_FILE))
+            self.highscore = self.leaderboard.best()
+
+        # decoded and scaled images of previous launches
+        self.baked = BakedCache(os.path.join(self.dir, s.BAKED_CACHE))
+
+        # load atlas metadata of the spritesheets
+        self.atlas = AtlasIndex.load(self.img_dir, s.ATLASES, os.path.join(self.dir, s.ATLAS_CACHE))
 
         # load spritesheets
-        self.enemy_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.ENEMY_SPRITESHEET))
-        self.hud_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.HUD_SPRITESHEET))
-        self.expl_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.EXPL_SPRITESHEET))
-        self.plat_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.PLAT_SPRITESHEET))
+        self.enemy_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.ENEMY_SPRITESHEET),
+                                             self.atlas.get(s.ENEMY_SPRITESHEET))
+        self.hud_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.HUD_SPRITESHEET),
+                                           self.atlas.get(s.HUD_SPRITESHEET))
+        self.expl_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.EXPL_SPRITESHEET),
+                                            self.atlas.get(s.EXPL_SPRITESHEET))
+        self.plat_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.PLAT_SPRITESHEET),
+                                            self.atlas.get(s.PLAT_SPRITESHEET))
         self.bac_spritesheet = SpriteSheet(os.path.join(self.img_dir, s.BAC_SPRITESHEET))
 
         # load base image
@@ -59,22 +133,8 @@ class CoronaBreakout:
         rect = virus_image.get_rect()
         self.virus_image = pygame.transform.scale(virus_image, (rect.width * 2, rect.height * 2))
         self.virus_image.set_colorkey(s.BLACK)
-
-        # load pause screen image
-        image = pygame.image.load(os.path.join(self.img_dir, 'pausescreen.jpg')).convert()
-        self.pause_image = pygame.transform.scale(image, (s.WIDTH, s.HEIGHT))
-
-        # load mission screen image
-        image = pygame.image.load(os.path.join(self.img_dir, 'mis_screen.jpg')).convert()
-        self.mis_image = pygame.transform.scale(image, (s.WIDTH, s.HEIGHT))
-
-        # load mission failed image
-        image = pygame.image.load(os.path.join(self.img_dir, 'mis_failed.jpg')).convert()
-        self.mis_failed_image = pygame.transform.scale(image, (s.WIDTH, s.HEIGHT))
-
-        # load mission completed image
-        image = pygame.image.load(os.path.join(self.img_dir, 'mis_success.jpg')).convert()
-        self.mis_completed_img = pygame.transform.scale(image, (s.WIDTH, s.HEIGHT))
+        rect = self.virus_image.get_rect()
+        self.boss_virus_image = pygame.transform.scale(self.virus_image, (rect.width * 2, rect.height * 2))
 
         # load cloud images
         self.cloud_images = []
@@ -82,29 +142,61 @@ class CoronaBreakout:
         for i in range(1, 4):
             self.cloud_images.append(pygame.image.load(os.path.join(cloud_dir, f'cloud{i}.png')).convert())
 
-        # load comic strips
-        self.comic_strips = []
-        for i in range(1, 17):
-            image = pygame.image.load(os.path.join(self.comic_dir, f'scene_{i}.png')).convert()
-            image = pygame.transform.scale(image, (s.WIDTH, s.HEIGHT))
-            self.comic_strips.append(image)
+        # comic strips are loaded in the background, just ahead of their scene
+        if not self.headless:
+            for i in s.INTRO_COMICS:
+                self.prefetcher.request(*self.comic_asset(i))
+
+        # load sounds, music is decoded in the background
+        self.audio = AudioManager(self.sound_dir)
+        if not self.headless:
+            self.audio.load_music('start_screen.ogg', 'background.ogg')
+
+    def load_screen(self, filename):
+        """Full screen image of a menu, loaded only if not registered.
 
-        # load sounds
-        self.jump_sound = pygame.mixer.Sound(os.path.join(self.sound_dir, 'jump.wav'))
-        self.powerup_sound = pygame.mixer.Sound(os.path.join(self.sound_dir, 'powerup.wav'))
-        self.dead_sound = pygame.mixer.Sound(os.path.join(self.sound_dir, 'dead.wav'))
-        self.bullet_sound = pygame.mixer.Sound(os.path.join(self.sound_dir, 'bullet.wav'))
+        Menu screens are evicted from the registry when cold.
+
+        Args:
+            filename (str): Filename of the image, in the images directory.
+
+        Returns:
+            image (pygame.Surface): the image, scaled to the screen.
+        """
+
+        def load():
+            return self.baked.load_image(os.path.join(self.img_dir, filename), (s.WIDTH, s.HEIGHT)).convert()
+
+        return self.assets.get(('screen', filename), load)
 
     def new(self):
         """Start a new game.
         """
 
+        self.setup()
+
+        # load what comes after this level while it is being played
+        self.prefetch_level(self.level + 1)
+
+        # decoded while the level is played
+        self.audio.load_music('game_over.ogg')
+
+        self.run()
+
+    def setup(self):
+        """Sets up the current level, ready for its first tick.
+        """
+
+        # definition of the level, from its level file
+        self.definition = self.levels[self.level]
+
         # keeping track of missions
         self.vaccines_collected = 0
         self.enemies_killed = 0
         self.n_bullets = 20  # initial number of bullets for the player
 
         self.failed = False
+        self.death_cause = None  # 'enemy', 'virus' or 'missions' once failed
 
         # used for checking if player completed game
         self.platforms_crossed = 0
@@ -118,19 +210,47 @@ class CoronaBreakout:
         self.bullets = pygame.sprite.Group()
         self.clouds = pygame.sprite.Group()
 
+        # scrolling moves the camera, not the sprites
+        self.camera = Camera()
+
         # load bg image
         self.bg_image = BackGround(self)
+        self.backgrounds = [self.bg_image]
 
-        if self.level > 1:  # needed for scrolling background
+        if self.definition.scrolling:  # needed for scrolling background
             self.bg_image_2 = BackGround(self)
             self.bg_image_2.rect.left = self.bg_image.rect.right
+            self.backgrounds.append(self.bg_image_2)
+
+        # cut every spritesheet frame of this level before the first frame
+        self.warm_frame_cache()
 
         # create new instance of player
         self.player = Player(self)
 
-        # timer for spawning enemies
-        self.slime_timer = 0
-        self.bat_timer = 0
+        # game info, rendered again only when a value changes
+        self.hud = Hud(self.text)
+        self.hud.add('progress', 'Level Progress', 15, s.BLACK, 5, s.HEIGHT - s.BASE_HEIGHT, pos='top-left')
+        self.hud.add('level', 'Level: {}', 22, s.WHITE, s.WIDTH / 2, 20, value=self.level)
+        self.hud.add('lives', 'Player lives remaining: {}', 22, s.RED, 5, 15, pos='top-left')
+        self.hud.add('score', 'Score: {}', 22, s.GREEN, 10, 20, pos='top-right')
+        self.hud.add('bullets', 'Bullets: {}', 22, s.GREEN, 10, 40, pos='top-right')
+        self.hud.add('vaccines', 'Total Vaccines collected: {} / ' + str(self.definition.vaccines), 22, s.RED,
+                     5, 45, pos='top-left')
+        self.hud.add('kills', 'Total enemies killed: {} / ' + str(self.definition.kills), 22, s.RED,
+                     5, 75, pos='top-left')
+
+        # when every enemy spawns, compiled from the level file
+        self.timeline = self.definition.timeline(self.rng.getrandbits(32), self.clock.get_ticks())
+
+        # redraw only what changed, if enabled
+        if s.DIRTY_RENDERING:
+            self.renderer = DirtyRenderer(self)
+
+        # enemies, viruses and bullets as arrays, if enabled
+        self.swarm = None
+        if s.SWARM_BACKEND and np is not None:
+            self.swarm = Swarm(self)
 
         # creating base
         self.bases = []
@@ -141,48 +261,368 @@ class CoronaBreakout:
             self.bases.append(base)
 
         # creating starting platforms
-        for plat in s.PLATFORM_START_LIST:
-            Platform(self, *plat)
+        tiles = self.definition.tiles
+        start = [Platform(self, x, y, *Platform.roll(self.rng, tiles)) for x, y in s.PLATFORM_START_LIST]
+
+        # the rest of the course is generated in the background, after them
+        if self.course is not None:
+            self.course.close()
+        sizes = {tile: self.plat_spritesheet.get_named(tile, colorkey=s.BLACK).get_size()
+                 for tile in Platform.image_names(tiles)}
+        last = max(start, key=lambda plat: plat.rect.right)
+        self.course = Course(tiles, sizes, self.rng.getrandbits(32), (last.rect.right, last.rect.top))
+        for plat in sorted(start, key=lambda plat: plat.rect.right):
+            self.course.add(plat)
 
         # create clouds/other images
-        if self.level == 1:
+        if self.definition.clouds:
             for i in range(5):
                 c = Cloud(self)
-                c.rect.x -= random.randrange(200, 400, 50)
+                c.rect.x -= self.rng.randrange(200, 400, 50)
+
+        self.playing = True
 
-        # load music
-        pygame.mixer.music.load(os.path.join(self.sound_dir, "background.ogg"))
+    def warm_frame_cache(self):
+        """Cuts the spritesheet frames spawned at the current level.
 
-        self.run()
+        Keeps the first spawn of each sprite from stalling a frame.
+        """
+
+        self.prefetcher.get(*self.platform_frames_asset(self.level), pinned=True)
+        self.expl_spritesheet.warm_up([self.definition.bullet], scale=Bullet.SCALE)
+        PowerUp.syringe(self)
+
+        for cls, flag in self.definition.enemies:
+            if cls is Bat:
+                scale = Bat.BOSS_SCALE if flag else Bat.SCALE
+                self.enemy_spritesheet.get_sequence(Bat.SEQUENCE, scale=scale, colorkey=s.BLACK)
+            elif flag:  # bacteria
+                self.bac_spritesheet.warm_up(Slime.BACTERIA_REGIONS, scale=Slime.SCALE, colorkey=s.BLACK)
+            else:
+                self.enemy_spritesheet.get_sequence(Slime.SLIME_SEQUENCE, scale=Slime.SCALE, colorkey=s.BLACK)
+
+    def prefetch_level(self, level):
+        """Starts loading the assets of a level in the background.
+
+        Its comic strips, intro image, background and platform frames,
+        or the ending comic strips after the last level.
+
+        Args:
+            level (int): Level of the game to be played next.
+        """
+
+        # static screens are skipped, and a level is set up right away
+        if self.headless:
+            return
+
+        if level not in self.levels:
+            for i in s.ENDING_COMICS:
+                self.prefetcher.request(*self.comic_asset(i))
+            return
+
+        for i in self.levels[level].comics:
+            self.prefetcher.request(*self.comic_asset(i))
+        self.prefetcher.request(*self.level_intro_asset(level))
+        self.prefetcher.request(*self.background_asset(level))
+        self.prefetcher.request(*self.platform_frames_asset(level))
+
+    def comic_asset(self, i):
+        """Describes a comic strip for the prefetcher.
+
+        Args:
+            i (int): Index of the comic strip.
+
+        Returns:
+            asset (tuple): key, load and finish functions.
+        """
+
+        filename = os.path.join(self.comic_dir, f'scene_{i + 1}.png')
+        return ('comic', i), lambda: self.baked.load_image(filename, (s.WIDTH, s.HEIGHT)), pygame.Surface.convert
+
+    def level_intro_asset(self, level):
+        """Describes the info image of a level for the prefetcher.
+
+        Args:
+            level (int): Level of the game.
+
+        Returns:
+            asset (tuple): key, load and finish functions.
+        """
+
+        filename = os.path.join(self.img_dir, self.levels[level].intro)
+        return ('level_intro', level), lambda: self.baked.load_image(filename, (s.WIDTH, s.HEIGHT)), \
+            pygame.Surface.convert
+
+    def background_asset(self, level):
+        """Describes the background image of a level for the prefetcher.
+
+        Args:
+            level (int): Level of the game.
+
+        Returns:
+            asset (tuple): key, load and finish functions.
+        """
+
+        filename = os.path.join(self.img_dir, 'background', self.levels[level].background)
+
+        # png backgrounds are see-through where black
+        alpha = filename.endswith('.png')
+        if not alpha:
+            finish = pygame.Surface.convert
+        else:
+            def finish(image):
+                image = image.convert_alpha()
+                image.set_colorkey(s.BLACK)
+                return image
+
+        def load():
+            return self.baked.load_image(filename, (s.WIDTH, s.HEIGHT), alpha=alpha)
+
+        return ('background', filename), load, finish
+
+    def platform_frames_asset(self, level):
+        """Describes the platform frames of a level for the prefetcher.
+
+        Frames are cut on the worker, and cached by the main thread.
+
+        Args:
+            level (int): Level of the game.
+
+        Returns:
+            asset (tuple): key, load and finish functions.
+        """
+
+        sheet = self.plat_spritesheet
+        regions = [sheet.atlas[name] for name in Platform.image_names(self.levels[level].tiles)]
+
+        def load():
+            return [(region, sheet.cut(*region)) for region in regions]
+
+        def finish(frames):
+            for region, image in frames:
+                sheet.store(*region, 0.5, s.BLACK, image)
+            return frames
+
+        return ('platform_frames', level), load, finish
+
+    def background_image(self):
+        """Background image of the current level.
+
+        Returns:
+            image (pygame.Surface): the background, scaled to the screen.
+        """
+
+        return self.prefetcher.get(*self.background_asset(self.level), pinned=True)
+
+    def comic(self, i):
+        """Comic strip, loaded now unless it was prefetched.
+
+        Args:
+            i (int): Index of the comic strip.
+
+        Returns:
+            image (pygame.Surface): the comic strip, scaled to the screen.
+        """
+
+        return self.prefetcher.get(*self.comic_asset(i))
+
+    def show_comics(self, indices):
+        """Renders comic strips one after the other.
+
+        Args:
+            indices (range): Indices of the comic strips.
+        """
+
+        for i in indices:
+
+            self.screen.blit(self.comic(i), (0, 0))
+
+            pygame.display.update()
+            self.wait_for_key(pygame.K_RETURN)
+
+        # shown once, dropped rather than kept up to ASSET_BUDGET
+        self.prefetcher.discard(*(('comic', i) for i in indices))
+
+    def spawn(self, cls, *args, **kwargs):
+        """Spawns a sprite, reusing a killed one of the same class.
+
+        Args:
+            cls (type): Pooled sprite class, e.g. Bullet.
+            *args: Arguments of the sprite, after the game instance.
+            **kwargs: Keyword arguments of the sprite.
+
+        Returns:
+            sprite (pygame.sprite.Sprite): the spawned sprite, or its index
+                in the swarm arrays.
+        """
+
+        if self.swarm is not None and cls in self.swarm.spawners:
+            return self.swarm.spawners[cls](*args, **kwargs)
+
+        sprite = self.pools[cls].acquire(self, *args, **kwargs)
+        self.camera.forget(sprite)  # a reused sprite is not moving from where it died
+        return sprite
+
+    def pool_info(self):
+        """Statistics of every sprite pool.
+
+        Returns:
+            info (dict): class name mapped to the stats of its pool.
+        """
+
+        return {cls.__name__: pool.stats() for cls, pool in self.pools.items()}
 
     def run(self):
         """Main Game Loop.
 
         Event loop begins. Checks for events, updates attributes,
         and finally draws updated objects to the screen.
+
+        The game ticks FPS times per second of real time, however often
+        frames are drawn. A frame runs as many ticks as the time since the
+        last one needs, up to MAX_STEPS, and is drawn in between the last
+        two ticks.
         """
 
-        # play loaded background music
-        pygame.mixer.music.play(loops=-1)
+        self.audio.play_music('background.ogg')
 
-        self.playing = True
+        tick = 1000 / s.FPS
+        lag = 0.0
+        self.frame_clock.tick()
         while self.playing:
-            self.clock.tick(s.FPS)
-            self.events()
-            self.update()
+            # minimized, or unfocused if so set, nothing is simulated or drawn
+            if self.suspended():
+                self.suspend()
+
+            lag += self.frame_clock.tick(s.RENDER_FPS if self.focused else s.UNFOCUSED_FPS)
+            self.profiler.begin_frame()
+
+            steps = 0
+            while lag >= tick and steps < s.MAX_STEPS and self.playing:
+                self.camera.snapshot(self.all_sprites)
+                if self.swarm is not None:
+                    self.swarm.snapshot()
+                self.step()
+                lag -= tick
+                steps += 1
+
+            # too far behind to catch up, slow down instead
+            if steps == s.MAX_STEPS:
+                lag = min(lag, tick)
+
+            self.camera.alpha = min(lag / tick, 1.0)
             self.draw()
+            self.profiler.end_frame()
 
         # fadeout music
-        pygame.mixer.music.fadeout(500)
+        self.audio.fadeout_music()
+
+    def step(self):
+        """Advances the game by one tick, without drawing.
+        """
+
+        if self.recorder is not None:
+            self.recorder.begin_tick()
+
+        self.audio.update()
+
+        self.clock.tick(s.FPS)
+
+        self.profiler.begin('events')
+        self.events()
+        self.profiler.end()
+
+        self.profiler.begin('update')
+        self.update()
+        self.profiler.end()
+
+    def simulate(self, level, frames):
+        """Plays a level headless for a number of ticks.
+
+        Stops early if the level is completed or failed.
+
+        Args:
+            level (int): Level of the game to be played.
+            frames (int): Maximum number of ticks.
+
+        Returns:
+            result (dict): state of the game when the simulation stopped.
+        """
+
+        self.level = level
+        self.setup()
+
+        frame = 0
+        while self.playing and frame < frames:
+            self.profiler.begin_frame()
+            self.step()
+            self.profiler.end_frame()
+            frame += 1
+
+        return self.summary(frame)
+
+    def summary(self, frames):
+        """State of the game, as reported by simulations and replays.
+
+        Args:
+            frames (int): Ticks played.
+
+        Returns:
+            result (dict): level, score, missions and outcome.
+        """
+
+        return {
+            'level': self.level,
+            'frames': frames,
+            'score': self.score,
+            'lives': self.player.lives,
+            'vaccines': self.vaccines_collected,
+            'kills': self.enemies_killed,
+            'platforms': self.platforms_crossed,
+            'failed': self.failed,
+            'death_cause': self.death_cause,
+            'completed': not self.playing and not self.failed,
+        }
+
+    def close(self):
+        """Stops the game's background threads, saving the replay and frames being recorded.
+
+        Does not exit, so simulations can shut a game down and carry on.
+        """
+
+        self.prefetcher.close()
+        self.audio.close()
+        if self.course is not None:
+            self.course.close()
+            self.course = None
+        if self.leaderboard is not None:
+            self.leaderboard.close()
+            self.leaderboard = None
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.capture is not None:
+            self.capture.close()
+            self.capture = None
+
+    def quit(self):
+        """Closes the game and exits, saving the replay and frames being recorded.
+        """
+
+        self.close()
+        pygame.quit()
+        sys.exit(0)
 
     def events(self):
         """Handling events.
         """
 
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit(0)
+                self.quit()
+
+            if event.type == pygame.ACTIVEEVENT:
+                self.window_event(event)
 
             # escape key to pause
             if event.type == pygame.KEYDOWN:
@@ -191,11 +631,23 @@ class CoronaBreakout:
                     if not self.player.jumping:
                         self.player.jump()
 
+                # toggle the frame profiler and its graph
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+
+                # dump the recorded frames as a chrome trace
+                if event.key == pygame.K_F4:
+                    self.profiler.dump_trace(os.path.join(self.dir, s.TRACE_FILE))
+
+                # start or stop capturing the frames
+                if event.key == pygame.K_F5:
+                    self.toggle_capture()
+
                 # purely for debugging purposes
                 if event.key == pygame.K_F1:
                     self.vaccines_collected += 20
                     self.enemies_killed += 20
-                    self.platforms_crossed = s.PLAT_CROSS - 1
+                    self.platforms_crossed = self.definition.platforms - 1
 
                 # player shooting
                 if event.key == pygame.K_SPACE:
@@ -204,8 +656,8 @@ class CoronaBreakout:
                     if not self.player.shooting and self.n_bullets > 0:
                         self.player.shooting = True
                         self.player.idle = False
-                        self.bullet_sound.play()
-                        Bullet(self)
+                        self.audio.play('bullet')
+                        self.spawn(Bullet)
                         self.n_bullets -= 1
 
             if event.type == pygame.KEYUP:
@@ -223,6 +675,52 @@ class CoronaBreakout:
                         self.paused = True
                         self.show_pause_screen()
 
+    def window_event(self, event):
+        """Tracks whether the window is shown and has the keyboard focus.
+
+        Args:
+            event (pygame.event.Event): ACTIVEEVENT of the window.
+        """
+
+        if event.state & pygame.APPACTIVE:
+            self.visible = bool(event.gain)
+
+        if event.state & pygame.APPINPUTFOCUS:
+            self.focused = bool(event.gain)
+
+    def suspended(self):
+        """Whether the game should stop running, for now.
+
+        Returns:
+            suspended (bool): the window is minimized, or unfocused and
+                UNFOCUSED_POLICY is 'suspend'.
+        """
+
+        return not self.visible or (not self.focused and s.UNFOCUSED_POLICY == 'suspend')
+
+    def suspend(self):
+        """Sleeps until the game should run again.
+
+        Nothing is simulated, drawn or heard meanwhile, and the time spent
+        suspended is not caught up afterwards.
+        """
+
+        self.audio.pause()
+        while self.suspended():
+            event = pygame.event.wait()
+
+            if event.type == pygame.QUIT:
+                self.quit()
+
+            # no key events reach a window without focus
+            if event.type == pygame.ACTIVEEVENT:
+                self.window_event(event)
+
+        self.audio.resume()
+        self.frame_clock.tick()
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
     def update(self):
         """Updates attributes of objects.
 
@@ -230,89 +728,112 @@ class CoronaBreakout:
         """
 
         # update all sprites
+        self.profiler.begin('update.sprites')
         self.all_sprites.update()
+        if self.swarm is not None:
+            self.swarm.update()
+        self.profiler.end()
 
-        now = pygame.time.get_ticks()
+        now = self.clock.get_ticks()
 
         # prevent the player from going towards the left
-        if self.player.rect.left <= 0:
-            self.player.rect.right = self.player.rect.width + 10
-
-        # spawn Slime at level 1, 2, and 3 every 5 secs.
-        if now - self.slime_timer > 5000 + random.choice([-1000, -500, 0, 500, 1000]):
-            if not self.paused:
-                self.slime_timer = now
-                Slime(self, self.level >= 3)
-
-        # spawn bat at level 2 and above every 30 secs.
-        if self.level == 2:
-            bat_freq = 30000
-        elif self.level >= 3:
-            bat_freq = 10000
-
-        # spawn bats only after level 1
-        if self.level > 1:
-            if now - self.bat_timer > bat_freq + random.choice([-1000, -500, 0, 500, 1000]):
-                if not self.paused:
-                    self.bat_timer = now
-                    Bat(self, self.level == 4)
-
-        # create new bases as player moves
-        last_base = self.bases[-1]
-        if last_base.rect.right <= s.WIDTH:
-            new_base = Base(self, last_base.rect.right, s.HEIGHT - s.BASE_HEIGHT)
-            self.bases.append(new_base)
-            self.bases.pop(0)
+        if self.player.rect.left <= self.camera.left:
+            self.player.rect.right = self.camera.left + self.player.rect.width + 10
+
+        self.profiler.begin('update.spawning')
+
+        # spawn the enemies due, slimes or bacteria and bats as the level file says
+        if now >= self.timeline.next and not self.paused:
+            for cls, flag in self.timeline.due(now):
+                self.spawn(cls, flag)
+
+        # create new bases as player moves, remove those left behind
+        while self.bases[-1].rect.right <= self.camera.right:
+            self.bases.append(Base(self, self.bases[-1].rect.right))
+        while self.bases[0].rect.right <= self.camera.left:
+            self.bases.pop(0).kill()
+
+        self.profiler.end()
+
+        # broad-phase, every collision pass below only checks sprites in nearby cells
+        self.profiler.begin('update.broadphase')
+        enemies = SpatialHash(self.enemies)
+        viruses = SpatialHash(self.viruses)
+        bullets = SpatialHash(self.bullets)
+        platforms = SpatialHash(self.platforms)
+        powerups = SpatialHash(self.powerups)
+        bases = SpatialHash(self.bases)
+        self.profiler.end()
 
         # player - enemy collision check
-        temp_enemy_hits = pygame.sprite.spritecollide(self.player, self.enemies, False)
-        if temp_enemy_hits:
-            enemy_hits = pygame.sprite.spritecollide(self.player, self.enemies, True, pygame.sprite.collide_mask)
-
-        try:
-            if enemy_hits:
-                self.dead_sound.play()
-                # reduce player lives
-                self.player.lives -= 1
-                # is player dead?
-                if self.player.lives == 0:
-                    self.failed = True
-                    self.show_failed_screen()
-        except Exception:
-            pass
+        self.profiler.begin('update.collide.player_enemies')
+        if self.swarm is None:
+            enemy_hits = enemies.collide(self.player, True, pygame.sprite.collide_mask)
+        else:
+            enemy_hits = self.swarm.collide_player(self.swarm.enemies)
+        if enemy_hits:
+            self.audio.play('dead')
+            # reduce player lives
+            self.player.lives -= 1
+            # is player dead?
+            if self.player.lives == 0:
+                self.failed = True
+                self.death_cause = 'enemy'
+                self.show_failed_screen()
+
+        self.profiler.end()
 
         # player - virus collision check
-        temp_virus_hits = pygame.sprite.spritecollide(self.player, self.viruses, False)
-        if temp_virus_hits:
-            virus_hits = pygame.sprite.spritecollide(self.player, self.viruses, True, pygame.sprite.collide_mask)
+        self.profiler.begin('update.collide.player_viruses')
+        if self.swarm is None:
+            virus_hits = viruses.collide(self.player, True, pygame.sprite.collide_mask)
+        else:
+            virus_hits = self.swarm.collide_player(self.swarm.viruses)
+        if virus_hits:
+            self.audio.play('dead')
+            self.failed = True
+            self.death_cause = 'virus'
+            self.show_failed_screen()
 
-        try:
-            if virus_hits:
-                self.dead_sound.play()
-                self.failed = True
-                self.show_failed_screen()
-        except Exception:
-            pass
+        self.profiler.end()
 
         # bullet - virus collision check
-        if self.level == 4:
-            bv_hits = pygame.sprite.groupcollide(self.bullets, self.viruses, True, True)
+        self.profiler.begin('update.collide.bullets_viruses')
+        if self.definition.shoot_viruses:
+            if self.swarm is None:
+                bv_hits = groupcollide(self.bullets, viruses, True, True)
+            else:
+                bv_hits = self.swarm.collide_bullets(self.swarm.viruses, bullets_first=True)
             if bv_hits:
-                self.dead_sound.play()
+                self.audio.play('dead')
                 self.score += 20
 
+        self.profiler.end()
+
         # bullet - enemy collision check
-        be_hits = pygame.sprite.groupcollide(self.enemies, self.bullets, True, True)
+        self.profiler.begin('update.collide.bullets_enemies')
+        if self.swarm is None:
+            be_hits = groupcollide(self.enemies, bullets, True, True)
+        else:
+            be_hits = self.swarm.collide_bullets(self.swarm.enemies)
         if be_hits:
-            self.dead_sound.play()
+            self.audio.play('dead')
             self.score += 20
             self.enemies_killed += 1
 
+        self.profiler.end()
+
         # bullet - platform collision check, if so, bullet sprite will be killed
-        pygame.sprite.groupcollide(self.bullets, self.platforms, True, False)
+        self.profiler.begin('update.collide.bullets_platforms')
+        if self.swarm is None:
+            groupcollide(self.bullets, platforms, True, False)
+        else:
+            self.swarm.collide_platforms(self.platforms)
+        self.profiler.end()
 
         # player - base collision check
-        base_hits = pygame.sprite.spritecollide(self.player, self.bases, False)
+        self.profiler.begin('update.collide.player_bases')
+        base_hits = bases.collide(self.player)
         if base_hits:
             lowest = base_hits[0]
             # if player below base, make him rest on base
@@ -321,10 +842,13 @@ class CoronaBreakout:
                 self.player.vel.y = 0
                 self.player.jumping = False
 
+        self.profiler.end()
+
         # player - powerup collision check
-        pow_hits = pygame.sprite.spritecollide(self.player, self.powerups, True)
+        self.profiler.begin('update.collide.player_powerups')
+        pow_hits = powerups.collide(self.player, True)
         for powerUp in pow_hits:
-            self.powerup_sound.play()
+            self.audio.play('powerup')
             # add points to score
             self.score += 10
             if powerUp.type == 'vaccine':
@@ -334,129 +858,184 @@ class CoronaBreakout:
             elif powerUp.type == 'ammo':
                 self.n_bullets += 1
 
+        self.profiler.end()
+
         # player - platform collision check
-        temp_plat_hits = pygame.sprite.spritecollide(self.player, self.platforms, False)  # BB check
-        if temp_plat_hits:  # mask check
-            plat_hits = pygame.sprite.spritecollide(self.player, self.platforms, False, pygame.sprite.collide_mask)
-
-        try:
-            if plat_hits:
-                plat = plat_hits[0]
-                for hit in plat_hits:
-                    if hit.rect.left > plat.rect.left:
-                        plat = hit
-
-                # if player is within the platforms's width
-                if self.player.pos.x - self.player.rect.width / 2 < plat.rect.right and \
-                        self.player.pos.x + self.player.rect.width / 2 > plat.rect.left:
-                    # if player is above platform, make him rest on platform
-                    if self.player.pos.y < plat.rect.centery:
-                        self.player.pos.y = plat.rect.top + 5  # to compensate for extra space below in image
-                        self.player.vel.y = 0
-                        self.player.jumping = False
-                    # if player is below the platform, and was going/jumping up, restrict his jump
-                    if self.player.pos.y > plat.rect.bottom and self.player.vel.y < 0:
-                        self.player.pos.y = plat.rect.bottom + self.player.rect.height
-                        self.player.vel.y = 0
-                        self.player.jumping = False
-        except Exception:
-            pass
+        self.profiler.begin('update.collide.player_platforms')
+        plat_hits = platforms.collide(self.player, False, pygame.sprite.collide_mask)  # BB check, then mask
+        if plat_hits:
+            plat = plat_hits[0]
+            for hit in plat_hits:
+                if hit.rect.left > plat.rect.left:
+                    plat = hit
+
+            # if player is within the platforms's width
+            if self.player.pos.x - self.player.rect.width / 2 < plat.rect.right and \
+                    self.player.pos.x + self.player.rect.width / 2 > plat.rect.left:
+                # if player is above platform, make him rest on platform
+                if self.player.pos.y < plat.rect.centery:
+                    self.player.pos.y = plat.rect.top + 5  # to compensate for extra space below in image
+                    self.player.vel.y = 0
+                    self.player.jumping = False
+                # if player is below the platform, and was going/jumping up, restrict his jump
+                if self.player.pos.y > plat.rect.bottom and self.player.vel.y < 0:
+                    self.player.pos.y = plat.rect.bottom + self.player.rect.height
+                    self.player.vel.y = 0
+                    self.player.jumping = False
+
+        self.profiler.end()
 
         # moving screen towards right
-        if self.player.rect.right >= s.WIDTH * 0.45:
+        self.profiler.begin('update.scrolling')
+        # everything lives in world coordinates, only the camera moves
+        scroll = 0
+        if self.player.rect.right - self.camera.left >= s.WIDTH * 0.45:
             # creating new clouds
-            if self.level == 1:
-                if random.randrange(100) < s.CLOUD_FREQ:
+            if self.definition.clouds:
+                if self.rng.randrange(100) < s.CLOUD_FREQ:
                     Cloud(self)
             if self.player.vel.x > 0:
-                # updating player
-                self.player.pos.x -= max(self.player.vel.x, 3)
-                # updating previous clouds
-                for cloud in self.clouds:
-                    cloud.rect.x -= max(self.player.vel.x / 6, 1)
-                # updating platforms
-                for plat in self.platforms:
-                    plat.rect.x -= max(self.player.vel.x, 3)
-                    if plat.rect.right <= 0:
-                        plat.kill()
-                        self.score += 1
-                        self.platforms_crossed += 1
-                # updating enemies
-                for enemy in self.enemies:
-                    enemy.rect.x -= max(self.player.vel.x, 3)
-                # updating viruses
-                for virus in self.viruses:
-                    virus.rect.x -= max(self.player.vel.x, 3)
+                scroll = max(self.player.vel.x, 3)
                 # background
-                if self.level >= 2:
+                if self.definition.scrolling:
                     self.bg_image.rect.x -= max(self.player.vel.x / 6, 1)
+        self.camera.scroll(scroll)
+
+        # platforms left behind count as crossed
+        crossed = self.course.retire(self.camera.left)
+        self.score += crossed
+        self.platforms_crossed += crossed
 
         # scrolling background
-        if self.level >= 2:
+        if self.definition.scrolling:
             self.bg_image_2.rect.left = self.bg_image.rect.right
             if self.bg_image.rect.right < 0:
                 self.bg_image.rect.left = 0
 
-        # spawn new platforms
-        # calculate the right pos of previous platform
-        max_right = 0
-        for plat in self.platforms:
-            if plat.rect.right > max_right:
-                max_right = plat.rect.right
+        self.profiler.end()
+
+        # place the course coming into view, already generated
+        self.profiler.begin('update.platforms')
+        for x, y, tile, powerup in self.course.ahead(self.camera.right + s.COURSE_AHEAD):
+            self.course.add(Platform(self, x, y, tile, powerup))
 
-        # create new platforms, max of 3 platforms available at a time.
-        while len(self.platforms) < 3:
-            rand_x = max_right + random.randrange(200, 400)
-            rand_y = s.HEIGHT - 150 - s.BASE_HEIGHT - random.randrange(0, 100, 20)
-            Platform(self, rand_x, rand_y)
+        self.profiler.end()
 
         # check if gameover
-        if self.platforms_crossed >= s.PLAT_CROSS:
-            if self.enemies_killed >= s.ENEMY_KILLS and self.vaccines_collected >= s.VAC_COLLECT:
+        if self.platforms_crossed >= self.definition.platforms:
+            if self.enemies_killed >= self.definition.kills and self.vaccines_collected >= self.definition.vaccines:
                 self.playing = False
             else:
                 self.failed = True
+                self.death_cause = 'missions'
                 self.show_failed_screen()
 
     def draw(self):
         """Draw updated objects to the screen.
         """
 
-        self.screen.fill(s.BLACK)
+        self.profiler.begin('draw')
+
+        self.profiler.begin('draw.hud')
+        hud_rects = self.update_hud()
+        self.profiler.end()
+
+        if self.renderer is not None:
+            self.profiler.begin('draw.dirty')
+            self.renderer.draw(hud_rects)
+            self.profiler.end()
+        else:
+            self.screen.fill(s.BLACK)
+            self.draw_scene()
+
+            self.profiler.begin('draw.flip')
+            pygame.display.update()
+            self.profiler.end()
+
+        if self.capture is not None:
+            self.profiler.begin('draw.capture')
+            self.capture.grab(self.screen)
+            self.profiler.end()
+
+        self.profiler.end()
+
+    def toggle_capture(self):
+        """Starts capturing the drawn frames into CAPTURE_DIR, or stops.
+
+        Returns:
+            stats (dict): statistics of the capture stopped, or None.
+        """
+
+        if self.capture is not None:
+            stats, self.capture = self.capture.close(), None
+            return stats
+
+        capture_dir = os.path.join(self.dir, s.CAPTURE_DIR)
+        os.makedirs(capture_dir, exist_ok=True)
+        name = time.strftime('%Y%m%d-%H%M%S')
+        if s.CAPTURE_FORMAT != 'png':
+            name += '.cbv'
+        self.capture = FrameCapture(os.path.join(capture_dir, name), self.screen)
+
+    def draw_scene(self):
+        """Draws sprites, progress bar and game info.
+        """
 
         # draw all sprites
-        self.all_sprites.draw(self.screen)
-        self.enemies.draw(self.screen)
-        self.viruses.draw(self.screen)
+        self.profiler.begin('draw.sprites')
+        self.camera.draw(self.all_sprites, self.screen)
+        self.camera.draw(self.enemies, self.screen)
+        self.camera.draw(self.viruses, self.screen)
+        if self.swarm is not None:
+            self.swarm.draw(self.screen)
+        self.profiler.end()
+
+        self.profiler.begin('draw.overlay')
+        self.draw_overlay()
+        self.profiler.end()
+
+    def draw_overlay(self):
+        """Draws the progress bar and game info over the sprites.
+        """
 
         # draw progress bar
-        self.draw_text('Level Progress', 15, s.BLACK, 5, s.HEIGHT - s.BASE_HEIGHT, pos='top-left')
         pygame.draw.rect(self.screen, s.RED, (0, s.HEIGHT - 10, s.WIDTH, 10))
         pygame.draw.rect(self.screen, s.GREEN, (0, s.HEIGHT - 10, self.platforms_crossed * 10, 10))
 
         # draw game info
-        self.draw_text(f'Level: {self.level}', 22, s.WHITE, s.WIDTH / 2, 20)
+        self.hud.draw(self.screen)
 
-        self.draw_text(f'Player lives remaining: {self.player.lives}', 22, s.RED, 5, 15, pos='top-left')
+        # draw frame time graph, if profiling
+        self.profiler.draw(self.screen)
 
-        self.draw_text(f'Score: {self.score}', 22, s.GREEN, 10, 20, pos='top-right')
-        self.draw_text(f'Bullets: {self.n_bullets}', 22, s.GREEN, 10, 40, pos='top-right')
+    def update_hud(self):
+        """Updates the values of the game info.
+
+        Returns:
+            rects (list): areas of the fields that changed.
+        """
 
         # dynamically update color for texts
-        if self.vaccines_collected < s.VAC_COLLECT:
+        if self.vaccines_collected < self.definition.vaccines:
             vac_color = s.RED
         else:
             vac_color = s.GREEN
 
-        if self.enemies_killed < s.ENEMY_KILLS:
+        if self.enemies_killed < self.definition.kills:
             enem_color = s.RED
         else:
             enem_color = s.GREEN
 
-        self.draw_text(f'Total Vaccines collected: {self.vaccines_collected} / {s.VAC_COLLECT}', 22, vac_color, 5, 45, pos='top-left')
-        self.draw_text(f'Total enemies killed: {self.enemies_killed} / {s.ENEMY_KILLS}', 22, enem_color, 5, 75, pos='top-left')
+        rects = [
+            self.hud.set('lives', self.player.lives),
+            self.hud.set('score', self.score),
+            self.hud.set('bullets', self.n_bullets),
+            self.hud.set('vaccines', self.vaccines_collected, vac_color),
+            self.hud.set('kills', self.enemies_killed, enem_color),
+            self.profiler.dirty_rect(),
+        ]
 
-        pygame.display.update()
+        return [rect for rect in rects if rect is not None]
 
     def show_start_screen(self):
         """Start screen of the game.
@@ -464,17 +1043,21 @@ class CoronaBreakout:
         Main menu of the game.
         """
 
-        pygame.mixer.music.load(os.path.join(self.sound_dir, "start_screen.ogg"))
-        pygame.mixer.music.play(loops=-1)
+        self.audio.play_music('start_screen.ogg')
 
-        ss_image = pygame.image.load(os.path.join(self.img_dir, 'startscreen.jpg')).convert()
-        ss_image = pygame.transform.scale(ss_image, (s.WIDTH, s.HEIGHT))
+        ss_image = self.load_screen('startscreen.jpg')
 
         self.screen.blit(ss_image, (0, 0))
 
         self.draw_text(f'HIGH SCORE: {self.highscore}', 22, s.WHITE,
                        s.WIDTH * 0.5, s.HEIGHT * 0.8)
 
+        if self.leaderboard is not None:
+            for i, entry in enumerate(self.leaderboard.top()):
+                level = '' if entry['level'] is None else f"  LEVEL {entry['level']}"
+                self.draw_text(f"{i + 1}. {entry['profile']}  {entry['score']}{level}", 16, s.WHITE,
+                               s.WIDTH * 0.5, s.HEIGHT * (0.86 + 0.04 * i))
+
         pygame.display.update()
         self.wait_for_key(pygame.K_RETURN)
 
@@ -484,22 +1067,24 @@ class CoronaBreakout:
         Renders user's score and highscore.
         """
 
-        # load music
-        pygame.mixer.music.load(os.path.join(self.sound_dir, "game_over.ogg"))
-        pygame.mixer.music.play(loops=-1)
+        self.audio.play_music('game_over.ogg')
 
-        go_image = pygame.image.load(os.path.join(self.img_dir, 'gameover.jpg')).convert()
-        go_image = pygame.transform.scale(go_image, (s.WIDTH, s.HEIGHT))
+        go_image = self.load_screen('gameover.jpg')
 
         self.screen.blit(go_image, (0, 0))
 
         self.draw_text(f'SCORE: {self.score}', 22, s.RED, s.WIDTH / 2, s.HEIGHT * 0.8)
 
+        # written in the background, simulations keep no scores
+        if self.leaderboard is not None:
+            # the random numbers carry on into the next game, only the first one replays from the seed
+            seed = self.seed if self.games_played == 0 else None
+            self.leaderboard.submit(self.profile, self.score, level=self.level, seed=seed,
+                                    completed=not self.failed)
+        self.games_played += 1
+
         if self.score > self.highscore:
             self.highscore = self.score
-            # save highscore in local file
-            with open(os.path.join(self.dir, s.HS_FILE), 'w') as f:
-                f.write(str(self.score))
 
             self.draw_text('NEW HIGH SCORE!', 22, s.RED, s.WIDTH / 2, s.HEIGHT * 0.9)
 
@@ -507,13 +1092,13 @@ class CoronaBreakout:
         self.wait_for_key(pygame.K_RETURN)
 
         # fadeout music
-        pygame.mixer.music.fadeout(500)
+        self.audio.fadeout_music()
 
     def show_pause_screen(self):
         """Pause screen.
         """
 
-        self.screen.blit(self.pause_image, (0, 0))
+        self.screen.blit(self.load_screen('pausescreen.jpg'), (0, 0))
         self.draw_text(f'Score: {self.score}', 33, s.WHITE, s.WIDTH * 0.5, s.HEIGHT * 0.395)
 
         pygame.display.update()
@@ -521,22 +1106,28 @@ class CoronaBreakout:
         self.wait_for_key(pygame.K_ESCAPE)
         self.paused = False
 
-    def show_mission_screen(self):
+    def show_mission_screen(self, level=1):
         """Mission screen.
 
         Shows the aim and main mission of the game.
+
+        Args:
+            level (int, optional): Level whose missions are shown, the
+                first one played. Defaults to 1
         """
 
-        self.screen.blit(self.mis_image, (0, 0))
+        self.screen.blit(self.load_screen('mis_screen.jpg'), (0, 0))
 
-        self.draw_text(f'Collect at least {s.VAC_COLLECT} vaccines.', 30, s.WHITE, s.WIDTH * 0.5, s.HEIGHT * 0.4)
-        self.draw_text(f'Kill a minimum of {s.ENEMY_KILLS} enemies.', 30, s.WHITE, s.WIDTH * 0.5, s.HEIGHT * 0.5)
+        definition = self.levels[level]
+        self.draw_text(f'Collect at least {definition.vaccines} vaccines.', 30, s.WHITE,
+                       s.WIDTH * 0.5, s.HEIGHT * 0.4)
+        self.draw_text(f'Kill a minimum of {definition.kills} enemies.', 30, s.WHITE, s.WIDTH * 0.5, s.HEIGHT * 0.5)
 
         pygame.display.update()
         self.wait_for_key(pygame.K_RETURN)
 
         # fadeout music
-        pygame.mixer.music.fadeout(500)
+        self.audio.fadeout_music()
 
     def wait_for_key(self, key=None):
         """Wait for a key press.
@@ -546,32 +1137,62 @@ class CoronaBreakout:
                 Defaults to None.
         """
 
+        # nobody to press a key, static screens are skipped
+        if self.headless:
+            return
+
+        # music still being decoded starts as soon as it is
+        if self.audio.music_pending():
+            pygame.time.set_timer(IDLE_WAKE, s.IDLE_WAKE_INTERVAL)
+
         waiting = True
         pressed = False
         while waiting:
-            self.clock.tick(s.FPS)
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit(0)
-
-                if event.type == pygame.KEYDOWN:
-                    pressed = True
-
-                if event.type == pygame.KEYUP and pressed:
-                    if key is None:
-                        waiting = False
-                    elif event.key == key:
-                        waiting = False
-
-                    # to exit the game loop completely
-                    elif event.key == pygame.K_q and pressed:
-                        waiting = False
-                        self.playing = False
-                        self.running = False
-                        pygame.quit()
-                        sys.exit(0)
+            # sleeps until something happens, the screen stays as drawn
+            event = pygame.event.wait()
+
+            if event.type == IDLE_WAKE:
+                self.audio.update()
+                if not self.audio.music_pending():
+                    pygame.time.set_timer(IDLE_WAKE, 0)
+
+            if event.type == pygame.QUIT:
+                self.quit()
+
+            # shown again, or uncovered
+            if event.type in (pygame.ACTIVEEVENT, pygame.VIDEOEXPOSE):
+                if event.type == pygame.ACTIVEEVENT:
+                    self.window_event(event)
+                    # static screens keep waiting when minimized, silently
+                    if self.visible:
+                        self.audio.resume()
+                    else:
+                        self.audio.pause()
+                pygame.display.update()
+
+            if event.type == pygame.KEYDOWN:
+                pressed = True
+
+            if event.type == pygame.KEYUP and pressed:
+                if key is None:
+                    waiting = False
+                elif event.key == key:
+                    waiting = False
+
+                # to exit the game loop completely
+                elif event.key == pygame.K_q and pressed:
+                    waiting = False
+                    self.playing = False
+                    self.running = False
+                    self.quit()
+
+        pygame.time.set_timer(IDLE_WAKE, 0)
+        # the time spent waiting is not caught up
+        self.frame_clock.tick()
+
+        # the screen was drawn over, next frame must be drawn in full
+        if self.renderer is not None:
+            self.renderer.invalidate()
 
     def draw_text(self, text, size, color, x, y, pos='center'):
         """Draws text to screen.
@@ -586,21 +1207,9 @@ class CoronaBreakout:
                 Can be of either 'center', 'top-left', 'top-right'
         """
 
-        font = pygame.font.Font(self.font_name, size)
-        text_surface = font.render(text, True, color)  # antialiasing
+        text_surface = self.text.render(text, size, color)  # antialiasing, cached
         text_rect = text_surface.get_rect()
-
-        if pos == 'center':
-            text_rect.centerx = x
-            text_rect.centery = y
-
-        elif pos == 'top-left':
-            text_rect.left = x
-            text_rect.top = y
-
-        elif pos == 'top-right':
-            text_rect.top = y
-            text_rect.right = s.WIDTH - x
+        align(text_rect, x, y, pos)
 
         self.screen.blit(text_surface, text_rect)
 
@@ -610,12 +1219,7 @@ class CoronaBreakout:
         Lets the user know the basic plot of the game.
         """
 
-        for image in self.comic_strips[:7]:
-
-            self.screen.blit(image, (0, 0))
-
-            pygame.display.update()
-            self.wait_for_key(pygame.K_RETURN)
+        self.show_comics(s.INTRO_COMICS)
 
     def show_completed_screen(self):
         """Renders the last scenes of the game.
@@ -623,14 +1227,9 @@ class CoronaBreakout:
         Only if player finishes all missions.
         """
 
-        for image in self.comic_strips[13:]:
+        self.show_comics(s.ENDING_COMICS)
 
-            self.screen.blit(image, (0, 0))
-
-            pygame.display.update()
-            self.wait_for_key(pygame.K_RETURN)
-
-        self.screen.blit(self.mis_completed_img, (0, 0))
+        self.screen.blit(self.load_screen('mis_success.jpg'), (0, 0))
 
         pygame.display.update()
         self.wait_for_key(pygame.K_RETURN)
@@ -642,7 +1241,7 @@ class CoronaBreakout:
         If player does not complete missions.
         """
 
-        self.screen.blit(self.mis_failed_image, (0, 0))
+        self.screen.blit(self.load_screen('mis_failed.jpg'), (0, 0))
 
         pygame.display.update()
         self.wait_for_key(pygame.K_RETURN)
@@ -657,34 +1256,15 @@ class CoronaBreakout:
 
         self.level = level
 
-        if self.level == 2:
-            for image in self.comic_strips[7:8]:
-
-                self.screen.blit(image, (0, 0))
-
-                pygame.display.update()
-                self.wait_for_key(pygame.K_RETURN)
-
-        if self.level == 3:
-            for image in self.comic_strips[8:10]:
-
-                self.screen.blit(image, (0, 0))
-
-                pygame.display.update()
-                self.wait_for_key(pygame.K_RETURN)
+        # already loading if the previous level was played
+        self.prefetch_level(self.level)
 
-        if self.level == 4:
-            for image in self.comic_strips[10:13]:
-
-                self.screen.blit(image, (0, 0))
-
-                pygame.display.update()
-                self.wait_for_key(pygame.K_RETURN)
+        self.show_comics(self.levels[self.level].comics)
 
-        image = pygame.image.load(os.path.join(self.img_dir, f'level{self.level}.jpg')).convert()
-        image = pygame.transform.scale(image, (s.WIDTH, s.HEIGHT))
+        image = self.prefetcher.get(*self.level_intro_asset(self.level))
 
         self.screen.blit(image, (0, 0))
 
         pygame.display.update()
         self.wait_for_key(pygame.K_RETURN)
+        self.prefetcher.discard(('level_intro', self.level))
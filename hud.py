@@ -0,0 +1,166 @@
+import pygame
+import settings as s
+from collections import OrderedDict
+
+
+def align(rect, x, y, pos='center'):
+    """Positions a text rect.
+
+    Args:
+        rect (pygame.Rect): Rect of the rendered text.
+        x (int): x coordinate of the text.
+        y (int): y coordinate of the text.
+        pos (str): Position of the text, for alignment. Defaults to center.
+            Can be of either 'center', 'top-left', 'top-right'
+    """
+
+    if pos == 'center':
+        rect.centerx = x
+        rect.centery = y
+
+    elif pos == 'top-left':
+        rect.left = x
+        rect.top = y
+
+    elif pos == 'top-right':
+        rect.top = y
+        rect.right = s.WIDTH - x
+
+
+class TextRenderer:
+    """Renders text with cached fonts and cached surfaces.
+
+    Fonts are kept per size for the whole session, rendered surfaces are
+    kept in an LRU cache keyed by (text, size, color).
+    """
+
+    def __init__(self, font_name, cache_size=s.TEXT_CACHE_SIZE):
+        """Initializing the caches.
+
+        Args:
+            font_name (str): Filename of the font.
+            cache_size (int, optional): Maximum number of cached surfaces.
+                Defaults to TEXT_CACHE_SIZE
+        """
+
+        self.font_name = font_name
+        self.cache_size = cache_size
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def get_font(self, size):
+        """Font of a given size, constructed only once.
+
+        Args:
+            size (int): Size of the text.
+
+        Returns:
+            font (pygame.font.Font): the font.
+        """
+
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(self.font_name, size)
+
+        return font
+
+    def render(self, text, size, color):
+        """Renders antialiased text.
+
+        Args:
+            text (str): Text to be rendered.
+            size (int): Size of the text.
+            color (tuple): Color of the text.
+
+        Returns:
+            surface (pygame.Surface): shared surface, must not be modified.
+        """
+
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = self.surfaces[key] = self.get_font(size).render(text, True, color)
+        if len(self.surfaces) > self.cache_size:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+
+class Hud:
+    """Retained HUD layer.
+
+    Each field keeps its rendered surface and is rendered again only when
+    its value or color changes.
+    """
+
+    def __init__(self, text):
+        """Initializing an empty HUD.
+
+        Args:
+            text (TextRenderer): Renderer used for the fields.
+        """
+
+        self.text = text
+        self.fields = OrderedDict()
+
+    def add(self, name, fmt, size, color, x, y, pos='center', value=None):
+        """Adds a field to the HUD.
+
+        Args:
+            name (str): Name of the field.
+            fmt (str): Format string of the text, given the value.
+            size (int): Size of the text.
+            color (tuple): Color of the text.
+            x (int): x coordinate of the text.
+            y (int): y coordinate of the text.
+            pos (str): Position of the text, for alignment. Defaults to center.
+            value (optional): Initial value of the field. Defaults to None
+        """
+
+        self.fields[name] = {
+            'fmt': fmt, 'size': size, 'x': x, 'y': y, 'pos': pos,
+            'value': None, 'color': None, 'surface': None, 'rect': None,
+        }
+        self.set(name, value, color)
+
+    def set(self, name, value, color=None):
+        """Updates the value of a field.
+
+        Args:
+            name (str): Name of the field.
+            value: New value of the field.
+            color (tuple, optional): New color of the field. Defaults to None,
+                keeping the current color.
+
+        Returns:
+            rect (pygame.Rect or None): area to redraw if the field changed.
+        """
+
+        field = self.fields[name]
+        if color is None:
+            color = field['color']
+
+        if field['surface'] is not None and value == field['value'] and color == field['color']:
+            return None
+
+        old_rect = field['rect']
+        field['value'] = value
+        field['color'] = color
+        field['surface'] = self.text.render(field['fmt'].format(value), field['size'], color)
+        field['rect'] = field['surface'].get_rect()
+        align(field['rect'], field['x'], field['y'], field['pos'])
+
+        return field['rect'].union(old_rect) if old_rect is not None else field['rect']
+
+    def draw(self, screen):
+        """Draws every field.
+
+        Args:
+            screen (pygame.Surface): Surface to draw the HUD on.
+        """
+
+        for field in self.fields.values():
+            screen.blit(field['surface'], field['rect'])
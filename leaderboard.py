@@ -0,0 +1,212 @@
+import os
+import time
+import queue
+import sqlite3
+import threading
+import settings as s
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    profile TEXT NOT NULL,
+    level INTEGER,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_profile ON scores (profile, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_level ON scores (level, score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_seed ON scores (seed, level, score DESC);
+"""
+
+COLUMNS = ('profile', 'level', 'seed', 'score', 'completed', 'created')
+
+
+def connect(path):
+    """Opens the score database in write-ahead logging mode.
+
+    Args:
+        path (str): Filename of the database.
+
+    Returns:
+        connection (sqlite3.Connection): the open database.
+    """
+
+    connection = sqlite3.connect(path)
+    # readers never wait for the writer, and a commit survives a crash
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+
+    return connection
+
+
+class Leaderboard:
+    """Scores of every game played, kept in a SQLite database.
+
+    Each score is recorded with the profile that played, the level it
+    ended on and the seed of the game, and indexed so the best scores
+    overall, of a profile, a level or a seed are read without scanning
+    the table. Scores are written by a background thread, each batch in
+    one transaction, so the game never waits on the disk.
+    """
+
+    def __init__(self, path, legacy=None):
+        """Opens the database, creating it if needed, and starts the writer thread.
+
+        Args:
+            path (str): Filename of the database.
+            legacy (str, optional): Filename of the old single high score,
+                imported when the database is created. Defaults to None
+        """
+
+        self.path = path
+        self.connection = connect(path)
+
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version < SCHEMA_VERSION:
+            with self.connection:
+                self.connection.executescript(SCHEMA)
+                if legacy is not None:
+                    self.migrate(legacy)
+                self.connection.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+        self.pending = queue.Queue()  # scores to write, or None to stop
+        self.thread = threading.Thread(target=self.write_scores, name='leaderboard', daemon=True)
+        self.thread.start()
+
+    def migrate(self, filename):
+        """Imports the high score of the old highscore file.
+
+        Its level and seed were never saved. The file is left in place.
+
+        Args:
+            filename (str): Filename of the old high score.
+        """
+
+        try:
+            with open(filename) as f:
+                score = int(f.read())
+        except (OSError, ValueError):  # no file, or nothing saved in it
+            return
+
+        if score > 0:
+            self.connection.execute(
+                'INSERT INTO scores (profile, score, created) VALUES (?, ?, ?)',
+                (s.PROFILE, score, os.path.getmtime(filename)))
+
+    def submit(self, profile, score, level=None, seed=None, completed=False):
+        """Queues a score to be written in the background.
+
+        Args:
+            profile (str): Name of the player.
+            score (int): Score of the game.
+            level (int, optional): Level the game ended on. Defaults to None
+            seed (int, optional): Seed the game replays from, if any. Defaults to None
+            completed (bool, optional): Every level was completed. Defaults to False
+        """
+
+        self.pending.put((profile, level, seed, score, int(completed), time.time()))
+
+    def write_scores(self):
+        """Writes queued scores until stopped, run by the writer thread.
+        """
+
+        connection = connect(self.path)
+        stop = False
+        while not stop:
+            batch = [self.pending.get()]
+            # scores queued in the meantime are written in the same transaction
+            while True:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [record for record in batch if record is not None]
+            if records:
+                # all or nothing, even if the game crashes halfway
+                with connection:
+                    connection.executemany(
+                        f'INSERT INTO scores ({", ".join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)', records)
+
+            stop = len(records) < len(batch)
+            for _ in batch:
+                self.pending.task_done()
+
+        connection.close()
+
+    def where(self, profile=None, level=None, seed=None):
+        """SQL condition selecting the scores of a profile, level or seed.
+
+        Args:
+            profile (str, optional): Name of the player. Defaults to every player
+            level (int, optional): Level the games ended on. Defaults to every level
+            seed (int, optional): Seed of the games. Defaults to every seed
+
+        Returns:
+            (condition, parameters): WHERE clause, empty if nothing is
+                selected, and its parameters.
+        """
+
+        terms = [(name, value) for name, value in (('profile', profile), ('level', level), ('seed', seed))
+                 if value is not None]
+        if not terms:
+            return '', ()
+
+        return 'WHERE ' + ' AND '.join(f'{name} = ?' for name, _ in terms), tuple(value for _, value in terms)
+
+    def top(self, n=s.LEADERBOARD_TOP, profile=None, level=None, seed=None):
+        """Best scores written, of a profile, level or seed if given.
+
+        Args:
+            n (int, optional): Scores at most. Defaults to LEADERBOARD_TOP
+            profile (str, optional): Name of the player. Defaults to every player
+            level (int, optional): Level the games ended on. Defaults to every level
+            seed (int, optional): Seed of the games. Defaults to every seed
+
+        Returns:
+            scores (list): dicts of profile, level, seed, score, completed
+                and created, best first.
+        """
+
+        condition, parameters = self.where(profile, level, seed)
+        rows = self.connection.execute(
+            f'SELECT {", ".join(COLUMNS)} FROM scores {condition} ORDER BY score DESC, id LIMIT ?',
+            parameters + (n,))
+
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def best(self, profile=None, level=None, seed=None):
+        """Best score written, of a profile, level or seed if given.
+
+        Args:
+            profile (str, optional): Name of the player. Defaults to every player
+            level (int, optional): Level the games ended on. Defaults to every level
+            seed (int, optional): Seed of the games. Defaults to every seed
+
+        Returns:
+            score (int): the best score, 0 if none.
+        """
+
+        condition, parameters = self.where(profile, level, seed)
+        row = self.connection.execute(f'SELECT MAX(score) FROM scores {condition}', parameters).fetchone()
+
+        return row[0] or 0
+
+    def flush(self):
+        """Waits for the queued scores to be written.
+        """
+
+        self.pending.join()
+
+    def close(self):
+        """Writes the scores left and stops the writer thread.
+        """
+
+        self.pending.put(None)
+        self.thread.join()
+        self.connection.close()
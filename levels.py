@@ -0,0 +1,198 @@
+import os
+import re
+import json
+import random
+import settings as s
+from sprites import Slime, Bat
+
+# enemies of the level files: sprite class and its flag, bacteria or boss
+ENEMIES = {
+    'slime': (Slime, False),
+    'bacteria': (Slime, True),
+    'bat': (Bat, False),
+    'boss_bat': (Bat, True),
+}
+
+FILENAME = re.compile(r'level(\d+)\.json$')
+
+
+def load_levels(directory):
+    """Loads every level file of a directory.
+
+    Args:
+        directory (str): Directory of the level files, level1.json,
+            level2.json and so on.
+
+    Returns:
+        levels (dict): number of every level mapped to its Level, in order.
+    """
+
+    levels = {}
+    for filename in os.listdir(directory):
+        match = FILENAME.match(filename)
+        if match is None:
+            continue
+
+        path = os.path.join(directory, filename)
+        with open(path) as f:
+            data = json.load(f)
+        try:
+            levels[int(match.group(1))] = Level(data)
+        except KeyError as e:
+            raise ValueError(f'{path} has no {e} field')
+        except ValueError as e:
+            raise ValueError(f'{path}: {e}')
+
+    if sorted(levels) != list(range(1, len(levels) + 1)):
+        raise ValueError(f'levels in {directory} are not numbered from 1 without gaps')
+
+    return {number: levels[number] for number in sorted(levels)}
+
+
+class Spawn:
+    """Enemies spawned one after the other, every interval.
+    """
+
+    def __init__(self, interval, enemies, jitter=(0,), first=None):
+        """Compiling a spawn of a level file into lookup tables.
+
+        Args:
+            interval (int): Milliseconds between two enemies.
+            enemies (dict): Name of every enemy in ENEMIES mapped to its
+                weight in the mix.
+            jitter (list, optional): Milliseconds added to an interval, one
+                picked at random every time. Defaults to (0,)
+            first (int, optional): Milliseconds until the first enemy, after
+                the level starts. Defaults to the interval
+        """
+
+        if interval + min(jitter) <= 0:
+            raise ValueError(f'interval {interval} is not longer than its jitter')
+
+        unknown = set(enemies) - set(ENEMIES)
+        if unknown:
+            raise ValueError(f'unknown enemies {sorted(unknown)}')
+
+        self.interval = interval
+        self.first = interval if first is None else first
+        self.jitter = tuple(jitter)
+        # every enemy repeated by its weight, one choice() picks from the mix
+        self.enemies = tuple(ENEMIES[name] for name, weight in enemies.items() for _ in range(weight))
+
+
+class Level:
+    """A level, as described by its level file.
+
+    Holds its images, whether clouds fly and the background scrolls, the
+    missions to complete, and its spawns, compiled into a SpawnTimeline
+    when the level is set up.
+    """
+
+    def __init__(self, data):
+        """Initializing a level from the contents of its file.
+
+        Args:
+            data (dict): Fields of the level file.
+        """
+
+        self.intro = data['intro']
+        self.comics = tuple(data.get('comics', ()))
+        self.background = data['background']
+        self.scrolling = data.get('scrolling', False)
+        self.clouds = data.get('clouds', False)
+        self.tiles = data['tiles']
+        self.bullet = data['bullet']
+        self.shoot_viruses = data.get('shoot_viruses', False)
+
+        # missions
+        targets = data['targets']
+        self.vaccines = targets['vaccines']
+        self.kills = targets['kills']
+        self.platforms = targets['platforms']
+
+        self.spawns = [Spawn(**spawn) for spawn in data['spawns']]
+        # (class, flag) of every enemy spawned, to cut their frames up front
+        self.enemies = list(dict.fromkeys(enemy for spawn in self.spawns for enemy in spawn.enemies))
+
+    def timeline(self, seed, start):
+        """Compiles the spawns of the level, as played from a time.
+
+        Args:
+            seed (int): Seed of the jitter and enemy mix.
+            start (int): Game time the level starts at, in milliseconds.
+
+        Returns:
+            timeline (SpawnTimeline): when every enemy spawns.
+        """
+
+        return SpawnTimeline(self.spawns, seed, start)
+
+
+class SpawnTimeline:
+    """When every enemy of a level spawns, worked out ahead of time.
+
+    The spawns of the next SPAWN_HORIZON milliseconds are compiled at once
+    into a list sorted by time, so a tick only compares the clock with the
+    next spawn. Only depends on its seed, so replays spawn the same enemies.
+    """
+
+    def __init__(self, spawns, seed, start):
+        """Compiling the first stretch of the timeline.
+
+        Args:
+            spawns (list): Spawn of every stream of enemies.
+            seed (int): Seed of the jitter and enemy mix.
+            start (int): Game time the level starts at, in milliseconds.
+        """
+
+        self.spawns = spawns
+        self.rng = random.Random(seed)
+        # time of the next enemy of every spawn, not compiled yet
+        self.pending = [start + spawn.first + self.rng.choice(spawn.jitter) for spawn in spawns]
+        self.compile(start)
+
+    def compile(self, start):
+        """Compiles the spawns of the SPAWN_HORIZON milliseconds after a time.
+
+        Args:
+            start (int): Game time the stretch starts at, in milliseconds.
+        """
+
+        self.end = start + s.SPAWN_HORIZON
+
+        timeline = []
+        for i, spawn in enumerate(self.spawns):
+            at = self.pending[i]
+            while at < self.end:
+                timeline.append((at, i, self.rng.choice(spawn.enemies)))
+                at += spawn.interval + self.rng.choice(spawn.jitter)
+            self.pending[i] = at
+        timeline.sort(key=lambda entry: entry[:2])
+
+        # the end of the stretch comes last, compiling the next one
+        self.times = [at for at, _, _ in timeline] + [self.end]
+        self.enemies = [enemy for _, _, enemy in timeline]
+        self.cursor = 0
+        self.next = self.times[0]
+
+    def due(self, now):
+        """Enemies due to spawn, up to a time, and moves past them.
+
+        Args:
+            now (int): Game time, in milliseconds.
+
+        Returns:
+            enemies (list): (class, flag) of the enemies, in order.
+        """
+
+        enemies = []
+        while self.next <= now:
+            if self.cursor == len(self.enemies):
+                self.compile(self.end)
+                continue
+
+            enemies.append(self.enemies[self.cursor])
+            self.cursor += 1
+            self.next = self.times[self.cursor]
+
+        return enemies
@@ -1,17 +1,69 @@
-import pygame
+import json
+import random
+import argparse
 import settings as s
 from game import CoronaBreakout
+from replay import Recorder, Replay
+
+
+def parse_args():
+    """Parses command line arguments.
+
+    Returns:
+        args (argparse.Namespace): parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description=s.TITLE)
+    parser.add_argument('--headless', action='store_true',
+                        help='simulate a level without a window, as fast as possible')
+    parser.add_argument('--level', type=int, default=1, help='level to start from')
+    parser.add_argument('--frames', type=int, default=s.FPS * 60, help='ticks to simulate when headless')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the random numbers')
+    parser.add_argument('--record', metavar='FILE', help='record the game into a replay file')
+    parser.add_argument('--replay', metavar='FILE',
+                        help='watch a replay, or play it back as fast as possible with --headless')
+    parser.add_argument('--seek', type=int, default=0, help='tick of the replay to start from')
+    parser.add_argument('--profile', default=s.PROFILE, help='name the scores are recorded under')
+    parser.add_argument('--capture', action='store_true', help='capture the drawn frames from the start, as F5 does')
+
+    return parser.parse_args()
+
 
 if __name__ == '__main__':
+    args = parse_args()
+
+    if args.replay:
+        replay = Replay(args.replay)
+        game = CoronaBreakout(headless=args.headless, seed=replay.seed, input_source=replay)
+        if args.capture:
+            game.toggle_capture()
+        print(json.dumps(replay.play(game, realtime=not args.headless, start=args.seek)))
+        game.quit()
+
+    # a replay starts from a known seed
+    if args.record and args.seed is None:
+        args.seed = random.randrange(2 ** 31)
+
+    if args.headless:
+        game = CoronaBreakout(headless=True, seed=args.seed)
+        if args.record:
+            Recorder(game, args.record)
+        print(json.dumps(game.simulate(args.level, args.frames)))
+        game.quit()
+
     # initializing an instance of the game.
-    game = CoronaBreakout()
+    game = CoronaBreakout(seed=args.seed, profile=args.profile)
+    if args.record:
+        Recorder(game, args.record)
+    if args.capture:
+        game.toggle_capture()
     game.show_start_screen()
     game.show_intro_scene()
-    game.show_mission_screen()
+    game.show_mission_screen(args.level)
 
     while game.running:
 
-        for i in range(1, s.GAME_LEVELS + 1):
+        for i in range(args.level, len(game.levels) + 1):
             game.show_level_intro(level=i)
             game.new()
 
@@ -23,4 +75,4 @@ if __name__ == '__main__':
 
         game.show_gameover_screen()
 
-    pygame.quit()
+    game.quit()
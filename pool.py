@@ -0,0 +1,106 @@
+class Pooled:
+    """Mixin for sprites recycled by a Pool.
+
+    The class has to implement reset(), taking the arguments of its
+    __init__, which puts a killed instance back in play. Killing a pooled
+    sprite hands it back to its pool.
+    """
+
+    pool = None
+
+    def kill(self):
+        """Removes the sprite from all groups, and returns it to its pool.
+        """
+
+        alive = self.alive()
+        super(Pooled, self).kill()
+
+        # killed twice in a tick, e.g. by two collision passes
+        if alive and self.pool is not None:
+            self.pool.release(self)
+
+
+class Pool:
+    """Free list of killed sprites of one class.
+
+    Spawning reuses a killed instance when there is one, and allocates a
+    new one otherwise. At most capacity instances are kept, the rest are
+    left to the garbage collector.
+    """
+
+    def __init__(self, cls, capacity):
+        """Initializing an empty pool.
+
+        Args:
+            cls (type): Pooled sprite class.
+            capacity (int): Maximum number of killed instances kept.
+        """
+
+        self.cls = cls
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self):
+        """Forgets the killed instances and zeroes the statistics.
+        """
+
+        self.free = []
+
+        self.created = 0
+        self.reused = 0
+        self.exhausted = 0  # spawns that allocated after capacity instances were made
+        self.dropped = 0
+
+    def acquire(self, *args, **kwargs):
+        """Spawns a sprite, recycling a killed one if possible.
+
+        Args:
+            *args: Arguments of the sprite's __init__ and reset().
+            **kwargs: Keyword arguments of the sprite's __init__ and reset().
+
+        Returns:
+            sprite (Pooled): the sprite, added to its groups.
+        """
+
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args, **kwargs)
+            self.reused += 1
+            return sprite
+
+        if self.created >= self.capacity:
+            self.exhausted += 1
+
+        sprite = self.cls(*args, **kwargs)
+        sprite.pool = self
+        self.created += 1
+        return sprite
+
+    def release(self, sprite):
+        """Keeps a killed sprite for a later spawn.
+
+        Args:
+            sprite (Pooled): killed sprite.
+        """
+
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        """Statistics of the pool.
+
+        Returns:
+            stats (dict): capacity, free instances, and counts of created,
+                reused, exhausted and dropped instances.
+        """
+
+        return {
+            'capacity': self.capacity,
+            'free': len(self.free),
+            'created': self.created,
+            'reused': self.reused,
+            'exhausted': self.exhausted,
+            'dropped': self.dropped,
+        }
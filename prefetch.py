@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """Loads assets on a worker thread ahead of the time they are needed.
+
+    An asset is described by a key, a load function run on the worker and
+    an optional finish function (e.g. convert) run on the main thread when
+    the asset is handed over. Asking for an asset only waits if it is not
+    loaded yet. Handed over assets are kept in the asset registry.
+    """
+
+    def __init__(self, registry):
+        """Starting the worker thread.
+
+        Args:
+            registry (AssetRegistry): Registry the loaded assets are kept in.
+        """
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+        self.registry = registry
+        self.pending = {}
+
+    def request(self, key, load, finish=None):
+        """Starts loading an asset in the background.
+
+        Args:
+            key (hashable): Name of the asset.
+            load (callable): Loads the asset, run on the worker thread.
+            finish (callable, optional): Finishes the loaded asset, run on
+                the main thread. Defaults to None
+        """
+
+        if key in self.registry or key in self.pending:
+            return
+
+        self.pending[key] = (self.executor.submit(load), finish)
+
+    def ready(self, key):
+        """Whether an asset can be handed over without waiting.
+
+        Args:
+            key (hashable): Name of the asset.
+
+        Returns:
+            ready (bool): the asset is registered or loaded.
+        """
+
+        if key in self.registry:
+            return True
+
+        pending = self.pending.get(key)
+        return pending is not None and pending[0].done()
+
+    def get(self, key, load, finish=None, pinned=False):
+        """Hands an asset over to the main thread.
+
+        Args:
+            key (hashable): Name of the asset.
+            load (callable): Loads the asset, if it was never requested.
+            finish (callable, optional): Finishes the loaded asset.
+                Defaults to None
+            pinned (bool, optional): Never evict the asset from the
+                registry. Defaults to False
+
+        Returns:
+            asset: the finished asset.
+        """
+
+        def fetch():
+            self.request(key, load, finish)
+            future, finish_ = self.pending.pop(key)
+            asset = future.result()  # waits only for what is not loaded yet
+            if finish_ is not None:
+                asset = finish_(asset)
+            return asset
+
+        return self.registry.get(key, fetch, pinned)
+
+    def discard(self, *keys):
+        """Forgets assets that are no longer needed.
+
+        Args:
+            *keys (hashable): Names of the assets.
+        """
+
+        self.registry.discard(*keys)
+        for key in keys:
+            pending = self.pending.pop(key, None)
+            if pending is not None:
+                pending[0].cancel()
+
+    def close(self):
+        """Cancels pending loads and stops the worker thread.
+        """
+
+        for future, _ in self.pending.values():
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,152 @@
+import json
+import time
+import pygame
+import settings as s
+
+
+class FrameProfiler:
+    """Times the phases of each frame into a fixed size ring buffer.
+
+    Phases are nested with begin() and end(). While disabled every call
+    returns right away. Toggling takes effect at the start of the next
+    frame, so a frame is never recorded half way.
+    """
+
+    GRAPH_RECT = pygame.Rect(s.WIDTH - 130, s.HEIGHT - s.BASE_HEIGHT - 70, 120, 60)
+    GRAPH_SCALE = 2  # pixels per millisecond
+
+    def __init__(self, capacity=s.PROFILER_FRAMES):
+        """Initializing an empty, disabled profiler.
+
+        Args:
+            capacity (int, optional): Number of frames kept. Defaults to PROFILER_FRAMES
+        """
+
+        self.capacity = capacity
+        self.frames = [None] * capacity
+        self.index = 0
+        self.count = 0
+        self.enabled = False
+        self.requested = False
+        self.shown = False
+        self.stack = []
+        self.sections = []
+        self.frame_start = 0.0
+
+    def toggle(self):
+        """Enables or disables profiling from the next frame on.
+        """
+
+        self.requested = not self.requested
+
+    def begin_frame(self):
+        """Starts timing a frame.
+        """
+
+        self.enabled = self.requested
+        if not self.enabled:
+            return
+
+        self.stack = []
+        self.sections = []
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Stores the timings of the current frame in the ring buffer.
+        """
+
+        if not self.enabled:
+            return
+
+        self.frames[self.index] = (self.frame_start, time.perf_counter(), self.sections)
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+
+    def begin(self, name):
+        """Starts timing a phase.
+
+        Args:
+            name (str): Name of the phase, e.g. 'update.sprites'.
+        """
+
+        if self.enabled:
+            self.stack.append((name, time.perf_counter()))
+
+    def end(self):
+        """Stops timing the innermost phase.
+        """
+
+        if self.enabled:
+            name, start = self.stack.pop()
+            self.sections.append((name, start, time.perf_counter()))
+
+    def recorded(self):
+        """Recorded frames, oldest first.
+
+        Returns:
+            frames (list): (start, end, sections) tuples.
+        """
+
+        if self.count < self.capacity:
+            return self.frames[:self.index]
+
+        return self.frames[self.index:] + self.frames[:self.index]
+
+    def dump_trace(self, filename):
+        """Writes the recorded frames as Chrome trace events.
+
+        The file can be opened in chrome://tracing or Perfetto.
+
+        Args:
+            filename (str): Filename of the trace.
+        """
+
+        events = []
+        first = self.count - min(self.count, self.capacity)
+        for n, (start, end, sections) in enumerate(self.recorded(), first):
+            events.append({'name': 'frame', 'ph': 'X', 'pid': 0, 'tid': 0,
+                           'ts': start * 1e6, 'dur': (end - start) * 1e6, 'args': {'frame': n}})
+            for name, t0, t1 in sections:
+                events.append({'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                               'ts': t0 * 1e6, 'dur': (t1 - t0) * 1e6, 'args': {'frame': n}})
+
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def dirty_rect(self):
+        """Area of the graph, if it has to be redrawn.
+
+        Returns:
+            rect (pygame.Rect or None): the graph area while shown, and on
+                the frame after it is hidden.
+        """
+
+        shown, self.shown = self.shown, self.enabled
+        if self.enabled or shown:
+            return self.GRAPH_RECT
+
+        return None
+
+    def draw(self, screen):
+        """Draws a live graph of the recent frame times.
+
+        Args:
+            screen (pygame.Surface): Surface to draw the graph on.
+        """
+
+        if not self.enabled:
+            return
+
+        rect = self.GRAPH_RECT
+        screen.fill(s.BLACK, rect)
+
+        frames = self.recorded()[-rect.width:]
+        for x, (start, end, sections) in enumerate(frames, rect.right - len(frames)):
+            ms = (end - start) * 1000
+            height = min(rect.height, int(ms * self.GRAPH_SCALE))
+            color = s.GREEN if ms <= s.FRAME_BUDGET else s.RED
+            pygame.draw.line(screen, color, (x, rect.bottom - 1), (x, rect.bottom - height))
+
+        # frame budget
+        budget_y = rect.bottom - int(s.FRAME_BUDGET * self.GRAPH_SCALE)
+        pygame.draw.line(screen, s.WHITE, (rect.left, budget_y), (rect.right - 1, budget_y))
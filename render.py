@@ -0,0 +1,153 @@
+import pygame
+import settings as s
+
+
+def merge_rects(rects):
+    """Merges overlapping rects.
+
+    Args:
+        rects (list): pygame.Rect areas, may overlap.
+
+    Returns:
+        merged (list): pygame.Rect areas that do not overlap.
+    """
+
+    merged = []
+    for rect in rects:
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect = rect.union(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+
+    return merged
+
+
+class DirtyRenderer:
+    """Redraws only the parts of the screen that changed.
+
+    Remembers the image and rect every sprite was drawn with. Each frame,
+    the old and new areas of the sprites that moved, changed image, spawned
+    or died, the HUD fields that changed and the progress bar are redrawn
+    and passed to display.update(). The whole screen is redrawn when the
+    camera or the background scrolls, or when too much of it changed.
+    """
+
+    def __init__(self, game):
+        """Initializing the renderer.
+
+        Args:
+            game (game_instance): Game instance.
+        """
+
+        self.game = game
+        self.screen_rect = game.screen.get_rect()
+        self.drawn = {}
+        self.bg_pos = None
+        self.camera_x = None
+        self.progress = None
+        self.swarm_shown = False
+        self.full = True
+
+    def invalidate(self):
+        """Forces a full redraw on the next frame.
+
+        Needed when something else drew over the screen.
+        """
+
+        self.full = True
+
+    def draw(self, hud_rects):
+        """Draws a frame.
+
+        Args:
+            hud_rects (list): areas of the HUD fields that changed.
+        """
+
+        game = self.game
+        sprites = game.all_sprites.sprites() + game.enemies.sprites() + game.viruses.sprites()
+
+        # as drawn, in between ticks
+        bg_pos = [game.camera.apply(bg).topleft for bg in game.backgrounds]
+        camera_x = int(game.camera.view_x)
+        # entities of the swarm are not sprites, and are not tracked
+        swarm, swarm_shown = game.swarm is not None and len(game.swarm) > 0, self.swarm_shown
+        self.swarm_shown = swarm
+        if self.full or swarm or swarm_shown or bg_pos != self.bg_pos or camera_x != self.camera_x:
+            self.draw_full(sprites)
+            self.bg_pos = bg_pos
+            self.camera_x = camera_x
+            return
+
+        dirty = list(hud_rects)
+
+        # sprites that moved, changed image or spawned
+        drawn = {}
+        for sprite in sprites:
+            last = self.drawn.get(sprite)
+            rect = self.blit_rect(sprite)
+            if last is None or last[0] is not sprite.image or last[1] != rect.topleft:
+                dirty.append(rect)
+                if last is not None:
+                    dirty.append(last[0].get_rect(topleft=last[1]))
+            drawn[sprite] = (sprite.image, rect.topleft)
+
+        # sprites that died
+        for sprite, last in self.drawn.items():
+            if sprite not in drawn:
+                dirty.append(last[0].get_rect(topleft=last[1]))
+
+        self.drawn = drawn
+
+        if game.platforms_crossed != self.progress:
+            self.progress = game.platforms_crossed
+            dirty.append(pygame.Rect(0, s.HEIGHT - 10, s.WIDTH, 10))
+
+        dirty = merge_rects([rect.clip(self.screen_rect) for rect in dirty if rect.colliderect(self.screen_rect)])
+
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > self.screen_rect.width * self.screen_rect.height * s.DIRTY_FULL_RATIO:
+            self.draw_full(sprites)
+            return
+
+        rects = [self.blit_rect(sprite) for sprite in sprites]
+        for rect in dirty:
+            game.screen.set_clip(rect)
+            game.screen.fill(s.BLACK)
+            for i in rect.collidelistall(rects):
+                game.screen.blit(sprites[i].image, rects[i])
+            game.draw_overlay()
+        game.screen.set_clip(None)
+
+        pygame.display.update(dirty)
+
+    def blit_rect(self, sprite):
+        """Area of the screen a sprite covers when drawn.
+
+        The image of a sprite can be larger than its rect, blits are not
+        clipped to the rect.
+
+        Args:
+            sprite (pygame.sprite.Sprite): sprite to be drawn.
+
+        Returns:
+            rect (pygame.Rect): area of the screen the sprite is drawn on.
+        """
+
+        return sprite.image.get_rect(topleft=self.game.camera.apply(sprite).topleft)
+
+    def draw_full(self, sprites):
+        """Redraws the whole screen.
+
+        Args:
+            sprites (list): every sprite on screen, in drawing order.
+        """
+
+        game = self.game
+        game.screen.fill(s.BLACK)
+        game.draw_scene()
+        pygame.display.update()
+
+        self.drawn = {sprite: (sprite.image, self.blit_rect(sprite).topleft) for sprite in sprites}
+        self.progress = game.platforms_crossed
+        self.full = False
@@ -0,0 +1,524 @@
+import io
+import zlib
+import pickle
+import struct
+import bisect
+import pygame
+import settings as s
+from pool import Pool
+from simulation import KeyState, FixedClock
+from sprites import SpriteSheet, get_mask, _masks
+
+# replay file layout:
+#   header | ticks and keyframes | index of the keyframes | footer
+MAGIC = b'CBRP'
+VERSION = 3
+HEADER = struct.Struct('<4sBBqH')  # magic, version, first level, seed, FPS
+INDEX_ENTRY = struct.Struct('<IQBB')  # tick, file offset of the keyframe, keys held, level
+FOOTER = struct.Struct('<QI4s')  # file offset of the index, ticks, magic
+LENGTH = struct.Struct('<I')
+
+# type of masks: pygame.mask.Mask is only a function creating them before pygame 2
+MASK_TYPE = getattr(pygame.mask, 'MaskType', pygame.mask.Mask)
+
+# keys that change the game, by their bit in a tick's mask. escape, F3 and
+# F4 only pause and profile, so they are not recorded
+KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_SPACE, pygame.K_F1)
+DOWN = 0x80  # key event byte: pressed if set, low bits are the index in KEYS
+
+# first byte of a record:
+#   0x00 - 0x7f: 1 to 128 ticks with no events, keys held as the tick before
+#   0x80 - 0xfe: a tick with 0 to 126 events, then its mask and events
+#   0xff: a keyframe, its length and the compressed state
+RUN_MAX = 0x80
+TICK = 0x80
+MAX_EVENTS = 0x7e
+KEYFRAME = 0xff
+
+# attributes of the game making up the state of a level
+STATE = (
+    'level', 'score', 'n_bullets', 'vaccines_collected', 'enemies_killed', 'platforms_crossed',
+    'failed', 'death_cause', 'playing', 'timeline', 'clock', 'camera', 'all_sprites',
+    'platforms', 'powerups', 'enemies', 'viruses', 'bullets', 'clouds', 'bg_image', 'backgrounds',
+    'bases', 'player', 'swarm', 'course',
+)
+
+
+def surfaces(asset, path=()):
+    """Every surface of an asset, with the path to it.
+
+    Args:
+        asset: a surface, or a list, tuple or dict of them.
+        path (tuple, optional): path to the asset. Defaults to ()
+
+    Yields:
+        (path, surface): path of indices and keys, and the surface.
+    """
+
+    if isinstance(asset, pygame.Surface):
+        yield path, asset
+    elif isinstance(asset, dict):
+        for key, value in asset.items():
+            yield from surfaces(value, path + (key,))
+    elif isinstance(asset, (list, tuple)):
+        for i, value in enumerate(asset):
+            yield from surfaces(value, path + (i,))
+
+
+class StatePickler(pickle.Pickler):
+    """Pickles the state of a game, leaving out what is shared.
+
+    Surfaces are stored as where they are loaded from: a spritesheet frame,
+    a registered asset, or an attribute of the game. Only images made for a
+    single sprite, e.g. scaled clouds, are stored as pixels.
+    """
+
+    def __init__(self, file, game):
+        """Initializing the pickler.
+
+        Args:
+            file (file): Binary file to write to.
+            game (game_instance): Game instance.
+        """
+
+        super(StatePickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+
+        self.game = game
+        self.names = {}
+        for key, image in SpriteSheet._frame_cache.items():
+            self.names[id(image)] = ('frame', key)
+        for key, (asset, _, _) in game.assets.entries.items():
+            for path, image in surfaces(asset):
+                self.names.setdefault(id(image), ('asset', key, path))
+        for name, value in vars(game).items():
+            for path, image in surfaces(value):
+                self.names.setdefault(id(image), ('attr', name, path))
+
+        self.masks = {id(mask): image for image, mask in _masks.items()}
+        self.pools = {id(pool): cls.__name__ for cls, pool in game.pools.items()}
+
+    def persistent_id(self, obj):
+        if obj is self.game:
+            return 'game'
+
+        if isinstance(obj, pygame.Surface):
+            name = self.names.get(id(obj))
+            if name is None:
+                name = ('pixels', obj.get_size(), pygame.image.tostring(obj, 'RGB'), obj.get_colorkey())
+            return name
+
+        if isinstance(obj, MASK_TYPE):
+            return ('mask', self.persistent_id(self.masks[id(obj)]))
+
+        if isinstance(obj, Pool):
+            return ('pool', self.pools[id(obj)])
+
+        return None
+
+
+class StateUnpickler(pickle.Unpickler):
+    """Loads a state pickled by StatePickler into a game.
+    """
+
+    def __init__(self, file, game):
+        """Initializing the unpickler.
+
+        Args:
+            file (file): Binary file to read from.
+            game (game_instance): Game instance, set up at the level of the state.
+        """
+
+        super(StateUnpickler, self).__init__(file)
+
+        self.game = game
+        self.pools = {cls.__name__: pool for cls, pool in game.pools.items()}
+        self.sheets = {value.filename: value for value in vars(game).values() if isinstance(value, SpriteSheet)}
+
+    def persistent_load(self, pid):
+        if pid == 'game':
+            return self.game
+
+        kind = pid[0]
+        if kind == 'frame':
+            filename, (x, y, width, height), scale, colorkey = pid[1]
+            # frames cut on first spawn may not be cut yet
+            return self.sheets[filename].get_image(x, y, width, height, scale, colorkey)
+
+        if kind in ('asset', 'attr'):
+            if kind == 'asset':
+                asset = self.game.assets.entries[pid[1]][0]
+            else:
+                asset = getattr(self.game, pid[1])
+            for step in pid[2]:
+                asset = asset[step]
+            return asset
+
+        if kind == 'pixels':
+            _, size, pixels, colorkey = pid
+            image = pygame.image.fromstring(pixels, size, 'RGB').convert()
+            if colorkey is not None:
+                image.set_colorkey(colorkey)
+            return image
+
+        if kind == 'mask':
+            return get_mask(self.persistent_load(pid[1]))
+
+        if kind == 'pool':
+            return self.pools[pid[1]]
+
+        raise pickle.UnpicklingError(f'unknown persistent id: {kind}')
+
+
+def capture(game):
+    """Saves the state of the level being played.
+
+    Args:
+        game (game_instance): Game instance.
+
+    Returns:
+        blob (bytes): compressed state.
+    """
+
+    state = {name: getattr(game, name) for name in STATE}
+    state['rng'] = game.rng.getstate()
+
+    buffer = io.BytesIO()
+    StatePickler(buffer, game).dump(state)
+    return zlib.compress(buffer.getvalue())
+
+
+def restore(game, level, blob):
+    """Loads a state saved by capture().
+
+    Args:
+        game (game_instance): Game instance.
+        level (int): Level the state was saved at.
+        blob (bytes): compressed state.
+    """
+
+    # loads the images of the level, the state only refers to them
+    game.level = level
+    game.setup()
+
+    game.course.close()  # replaced by the one saved
+    state = StateUnpickler(io.BytesIO(zlib.decompress(blob)), game).load()
+    game.rng.setstate(state.pop('rng'))
+    for name, value in state.items():
+        setattr(game, name, value)
+
+    if game.definition.scrolling:
+        game.bg_image_2 = game.backgrounds[1]
+
+
+class Recorder:
+    """Records the input of a game into a replay file.
+
+    Wraps the input source of the game, recording the key events and the
+    held keys of every tick, and saves the state of the game every
+    `interval` ticks so a replay can seek without playing from the start.
+    The replay is written when the recorder is closed.
+    """
+
+    def __init__(self, game, filename, interval=s.REPLAY_KEYFRAMES):
+        """Starts recording a game.
+
+        Args:
+            game (game_instance): Game instance, created with a seed.
+            filename (str): Filename of the replay.
+            interval (int, optional): Ticks between two keyframes.
+                Defaults to REPLAY_KEYFRAMES
+        """
+
+        if game.seed is None:
+            raise ValueError('only a seeded game can be replayed')
+
+        self.game = game
+        self.filename = filename
+        self.interval = interval
+
+        self.source = game.input
+        self.pressed = None
+        game.input = self
+        game.recorder = self
+
+        self.data = bytearray()
+        self.index = []
+        self.level = None
+        self.ticks = 0
+        self.mask = 0  # keys held at the last tick
+        self.run = 0  # ticks since the last one with events or new keys
+        self.closed = False
+
+    def begin_tick(self):
+        """Saves a keyframe if one is due, called before every tick.
+        """
+
+        if self.level is None:
+            self.level = self.game.level
+
+        if self.ticks % self.interval:
+            return
+
+        self.flush()
+        blob = capture(self.game)
+        self.index.append((self.ticks, HEADER.size + len(self.data), self.mask, self.game.level))
+        self.data.append(KEYFRAME)
+        self.data += LENGTH.pack(len(blob))
+        self.data += blob
+
+    def flush(self):
+        """Writes the pending run of idle ticks.
+        """
+
+        if self.run:
+            self.data.append(self.run - 1)
+            self.run = 0
+
+    def get_events(self):
+        """Events of the wrapped source, recorded as the next tick.
+
+        Returns:
+            events (list): pygame events.
+        """
+
+        events = self.source.get_events()
+        self.pressed = self.source.get_pressed()
+
+        mask = 0
+        for i, key in enumerate(KEYS):
+            if self.pressed[key]:
+                mask |= 1 << i
+
+        codes = [(DOWN if event.type == pygame.KEYDOWN else 0) | KEYS.index(event.key)
+                 for event in events
+                 if event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key in KEYS]
+
+        if codes or mask != self.mask:
+            self.flush()
+            self.data.append(TICK | min(len(codes), MAX_EVENTS))
+            self.data.append(mask)
+            self.data += bytes(codes[:MAX_EVENTS])
+            self.mask = mask
+        else:
+            self.run += 1
+            if self.run == RUN_MAX:
+                self.flush()
+
+        self.ticks += 1
+        return events
+
+    def get_pressed(self):
+        """State of every key, as recorded for this tick.
+
+        Returns:
+            keys (sequence): indexable by key, True if pressed.
+        """
+
+        return self.pressed
+
+    def close(self):
+        """Writes the replay file.
+        """
+
+        if self.closed:
+            return
+        self.closed = True
+
+        self.flush()
+        level = self.game.level if self.level is None else self.level
+
+        with open(self.filename, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, level, self.game.seed, s.FPS))
+            f.write(self.data)
+            for entry in self.index:
+                f.write(INDEX_ENTRY.pack(*entry))
+            f.write(FOOTER.pack(HEADER.size + len(self.data), self.ticks, MAGIC))
+
+
+class Replay:
+    """Plays a replay file back, as the input source of a game.
+
+    Playing from the start re-simulates the level from the recorded seed.
+    Seeking loads the keyframe nearest before the target tick and plays
+    the few ticks left from there.
+    """
+
+    def __init__(self, filename):
+        """Loads a replay file.
+
+        Args:
+            filename (str): Filename of the replay.
+        """
+
+        with open(filename, 'rb') as f:
+            self.data = f.read()
+
+        magic, version, self.level, self.seed, fps = HEADER.unpack_from(self.data)
+        end, self.ticks, footer_magic = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+        if magic != MAGIC or footer_magic != MAGIC:
+            raise ValueError(f'{filename} is not a replay')
+        if version != VERSION or fps != s.FPS:
+            raise ValueError(f'{filename} was recorded by another version of the game')
+
+        self.index = [INDEX_ENTRY.unpack_from(self.data, offset)
+                      for offset in range(end, len(self.data) - FOOTER.size, INDEX_ENTRY.size)]
+        self.keyframe_ticks = [entry[0] for entry in self.index]
+        self.end = end
+
+        self.offset = HEADER.size
+        self.tick = 0
+        self.run = 0
+        self.set_mask(0)
+
+    @property
+    def finished(self):
+        """True once every recorded tick was played.
+        """
+
+        return self.tick >= self.ticks
+
+    def set_mask(self, mask):
+        """Sets the keys held.
+
+        Args:
+            mask (int): bits of the held keys in KEYS.
+        """
+
+        self.mask = mask
+        self.pressed = KeyState({key for i, key in enumerate(KEYS) if mask & (1 << i)})
+
+    def get_events(self):
+        """Events of the next recorded tick.
+
+        Returns:
+            events (list): pygame events.
+        """
+
+        events = []
+        self.tick += 1
+
+        if self.run:
+            self.run -= 1
+            return events
+
+        code = self.data[self.offset]
+        while code == KEYFRAME:  # only read when seeking
+            length, = LENGTH.unpack_from(self.data, self.offset + 1)
+            self.offset += 1 + LENGTH.size + length
+            code = self.data[self.offset]
+        self.offset += 1
+
+        if code < TICK:
+            self.run = code
+            return events
+
+        self.set_mask(self.data[self.offset])
+        for byte in self.data[self.offset + 1:self.offset + 1 + code - TICK]:
+            events.append(pygame.event.Event(pygame.KEYDOWN if byte & DOWN else pygame.KEYUP,
+                                             key=KEYS[byte & ~DOWN]))
+        self.offset += 1 + code - TICK
+
+        return events
+
+    def get_pressed(self):
+        """Keys held at the current tick.
+
+        Returns:
+            keys (KeyState): indexable by key, True if pressed.
+        """
+
+        return self.pressed
+
+    def rewind(self, game):
+        """Sets the game up as it was when recording started.
+
+        Args:
+            game (game_instance): Game instance.
+        """
+
+        game.rng.seed(self.seed)
+        game.clock = FixedClock()
+        game.level = self.level
+        game.setup()
+
+        self.offset = HEADER.size
+        self.tick = 0
+        self.run = 0
+        self.set_mask(0)
+
+    def seek(self, game, tick):
+        """Brings the game to the state it had before a tick.
+
+        Args:
+            game (game_instance): Game instance.
+            tick (int): Number of ticks played.
+        """
+
+        tick = min(tick, self.ticks)
+        i = bisect.bisect_right(self.keyframe_ticks, tick) - 1
+
+        if i <= 0:
+            self.rewind(game)
+        else:
+            self.tick, self.offset, mask, level = self.index[i]
+            length, = LENGTH.unpack_from(self.data, self.offset + 1)
+            start = self.offset + 1 + LENGTH.size
+            restore(game, level, self.data[start:start + length])
+            self.run = 0
+            self.set_mask(mask)
+
+        while self.tick < tick:
+            self.advance(game)
+
+    def advance(self, game):
+        """Plays the next tick.
+
+        A level that ended is followed by the next one, and a failed or
+        completed game starts again from the first level, as in main.py.
+
+        Args:
+            game (game_instance): Game instance.
+        """
+
+        if not game.playing:
+            if game.failed or game.level >= len(game.levels):
+                game.level = self.level
+            else:
+                game.level += 1
+            game.setup()
+
+        game.step()
+
+    def play(self, game, realtime=False, start=0):
+        """Plays the replay to its end.
+
+        Args:
+            game (game_instance): Game instance, reading its input from this replay.
+            realtime (bool, optional): Draw every tick at FPS, instead of as
+                fast as possible without drawing. Defaults to False
+            start (int, optional): Tick to start from. Defaults to 0
+
+        Returns:
+            result (dict): state of the game when the replay stopped.
+        """
+
+        self.seek(game, start)
+
+        if realtime:
+            game.audio.play_music('background.ogg')
+            game.frame_clock.tick()
+
+        while not self.finished:
+            self.advance(game)
+
+            if realtime:
+                game.draw()
+                game.frame_clock.tick(s.FPS)
+
+                # closing the window or escape stops watching
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT or (event.type == pygame.KEYUP and event.key == pygame.K_ESCAPE):
+                        return game.summary(self.tick)
+
+        return game.summary(self.tick)
+
@@ -0,0 +1,151 @@
+"""Round-trip check of replays.
+
+Records headless games driven by random keys, plays every replay back
+from the start and from a tick between two keyframes, and fails if a
+playback ends differently from the recording.
+
+    python replay_check.py --runs 5 --level 1 --frames 3000
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+from types import SimpleNamespace
+import settings as s
+from game import CoronaBreakout
+from replay import Recorder, Replay
+from simulation import ScriptedInput
+from batch import random_keys
+
+
+def fingerprint(game, ticks):
+    """State a recording and its playback must end in.
+
+    The summary alone can miss a tick played too many or too few, so the
+    position of the player and the state of the random numbers are kept.
+
+    Args:
+        game (game_instance): Game instance.
+        ticks (int): Ticks played.
+
+    Returns:
+        state (dict): summary, player position and random state.
+    """
+
+    return {
+        'summary': game.summary(ticks),
+        'player': tuple(game.player.pos),
+        'rng': game.rng.getstate(),
+    }
+
+
+def record(filename, seed, level, frames):
+    """Records a headless game played with random keys.
+
+    Args:
+        filename (str): Filename of the replay.
+        seed (int): Seed of the game and of the keys pressed.
+        level (int): Level to start from.
+        frames (int): Ticks to record at most, fewer if the level ends.
+
+    Returns:
+        state (dict): fingerprint of the game when recording stopped.
+    """
+
+    source = ScriptedInput()
+    game = CoronaBreakout(headless=True, seed=seed, input_source=source)
+    try:
+        # the policy presses keys in the source the recorder reads from
+        player = SimpleNamespace(input=source)
+        Recorder(game, filename)
+        game.level = level
+        game.setup()
+
+        rng = random.Random(seed)
+        tick = 0
+        while game.playing and tick < frames:
+            random_keys(player, tick, rng)
+            game.step()
+            tick += 1
+
+        return fingerprint(game, tick)
+    finally:
+        game.close()  # writes the replay
+
+
+def play_back(filename, start):
+    """Plays a replay headless, as fast as possible.
+
+    Args:
+        filename (str): Filename of the replay.
+        start (int): Tick to seek to first.
+
+    Returns:
+        state (dict): fingerprint of the game at the end of the replay.
+    """
+
+    replay = Replay(filename)
+    game = CoronaBreakout(headless=True, seed=replay.seed, input_source=replay)
+    try:
+        replay.play(game, start=start)
+        return fingerprint(game, replay.tick)
+    finally:
+        game.close()
+
+
+def check(seed, level, frames):
+    """Records a game and plays its replay back from the start and from halfway.
+
+    Args:
+        seed (int): Seed of the game and of the keys pressed.
+        level (int): Level to start from.
+        frames (int): Ticks to record at most.
+
+    Returns:
+        result (dict): summary of the recording, and the ticks the
+            playbacks started from that ended differently.
+    """
+
+    fd, filename = tempfile.mkstemp(suffix='.cbr')
+    os.close(fd)
+
+    try:
+        expected = record(filename, seed, level, frames)
+        ticks = expected['summary']['frames']
+        mismatches = [start for start in (0, ticks // 2 + 1) if play_back(filename, start) != expected]
+    finally:
+        os.remove(filename)
+
+    return dict(expected['summary'], seed=seed, mismatches=mismatches)
+
+
+def parse_args():
+    """Parses command line arguments.
+
+    Returns:
+        args (argparse.Namespace): parsed arguments.
+    """
+
+    parser = argparse.ArgumentParser(description='Round-trip check of replays.')
+    parser.add_argument('--runs', type=int, default=3, help='games recorded, on consecutive seeds')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('--level', type=int, default=1, help='level to start from')
+    parser.add_argument('--frames', type=int, default=None,
+                        help='ticks recorded per game at most. Defaults to 1 minute at FPS')
+
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    frames = s.FPS * 60 if args.frames is None else args.frames
+
+    failed = False
+    for seed in range(args.seed, args.seed + args.runs):
+        result = check(seed, args.level, frames)
+        failed = failed or bool(result['mismatches'])
+        print(json.dumps(result))
+
+    sys.exit(1 if failed else 0)
@@ -4,19 +4,46 @@ import os
 TITLE = 'Corona Breakout'
 WIDTH = 640
 HEIGHT = 480
-FPS = 60
+FPS = 60  # ticks of the simulation per second
+RENDER_FPS = 60  # frames drawn per second at most, 0 for no limit
+MAX_STEPS = 5  # ticks caught up per frame at most, the game slows down past that
+UNFOCUSED_POLICY = 'throttle'  # 'throttle' to keep playing at UNFOCUSED_FPS without the focus, 'suspend' to stop
+UNFOCUSED_FPS = 15  # frames drawn per second at most without the focus, ticks are still caught up
+IDLE_WAKE_INTERVAL = 100  # milliseconds between checks for decoded music on static screens
+FRAME_BUDGET = 1000 / FPS  # milliseconds
 FONT_NAME = 'arial'
-HS_FILE = 'highscore.txt'
+TEXT_CACHE_SIZE = 64
+DIRTY_RENDERING = False  # redraw only changed areas of the screen
+DIRTY_FULL_RATIO = 0.5  # redraw the whole screen if more than this changed
+HS_FILE = 'highscore.txt'  # single high score of older versions, imported into SCORES_FILE
+SCORES_FILE = 'scores.db'
+PROFILE = 'player'  # name the scores are recorded under
+LEADERBOARD_TOP = 3  # best scores shown on the start screen
+ATLAS_CACHE = 'atlas.cache'
+BAKED_CACHE = 'baked'  # directory of pre-scaled images
+ASSET_BUDGET = 16 * 1024 * 1024  # bytes of images kept loaded
+TRACE_FILE = 'trace.json'
+CAPTURE_DIR = 'captures'  # frame captures, toggled with F5
+CAPTURE_FORMAT = 'zlib'  # 'raw' or 'zlib' compressed pixels in one file, 'png' for an image per frame
+CAPTURE_SLOTS = 8  # frames waiting to be written at most
+CAPTURE_ENCODERS = 2  # threads compressing frames
+CAPTURE_POLICY = 'drop'  # 'drop' frames or 'block' the game when the writer falls behind
+PROFILER_FRAMES = 600  # frames kept by the profiler
 
 # game properties
 BASE_HEIGHT = 35
 POWERUP_SPAWN_FREQ = 80
 CLOUD_FREQ = 1
+CLOUD_PARALLAX = 1 / 6  # clouds scroll slower than the world
 BULLET_SHOOT_FREQ = 1000
-VAC_COLLECT = 10
-ENEMY_KILLS = 20
-PLAT_CROSS = WIDTH / 10
-GAME_LEVELS = 4
+
+# levels, a levelN.json file each with its images, missions and enemy spawns
+LEVELS_DIR = 'levels'
+SPAWN_HORIZON = 60000  # milliseconds of enemy spawns compiled at once
+
+# comic strips shown before and after the levels, by index
+INTRO_COMICS = range(0, 7)
+ENDING_COMICS = range(13, 16)
 
 # player properties
 PLAYER_ACC = 0.6
@@ -28,6 +55,42 @@ PLAYER_IDLE_FREQ = 100
 JUMP_THRESHOLD = 3
 BULLET_VEL = 7
 
+# broad-phase collision grid
+COLLISION_CELL = 64  # pixels
+
+# numpy arrays in place of enemy, virus and bullet sprites, if numpy is installed
+SWARM_BACKEND = False
+
+# killed sprites kept for reuse, per class
+POOL_CAPACITY = {
+    'Bullet': 64,
+    'Slime': 16,
+    'Bat': 16,
+    'Virus': 16,
+    'PowerUp': 8,
+}
+
+# sound effects: file and channel pool of each
+SOUND_EFFECTS = {
+    'jump': ('jump.wav', 'player'),
+    'bullet': ('bullet.wav', 'player'),
+    'dead': ('dead.wav', 'hits'),
+    'powerup': ('powerup.wav', 'pickups'),
+}
+SOUND_CHANNELS = {'player': 2, 'hits': 3, 'pickups': 2}  # channels reserved per pool
+SOUND_MIN_INTERVAL = 50  # milliseconds between two plays of the same effect at least
+MUSIC_FADE = 500  # milliseconds of a music crossfade
+MUSIC_BUDGET = 64 * 1024 * 1024  # bytes of decoded music kept loaded
+
+# replays
+REPLAY_KEYFRAMES = FPS * 5  # ticks between two saved states, seeking replays from the nearest one
+
+# course of platforms, generated in chunks ahead of the camera
+COURSE_CHUNK = WIDTH  # world width of a chunk
+COURSE_AHEAD = WIDTH  # chunks are placed once this close to the right of the screen
+COURSE_QUEUE = 4  # chunks generated ahead at most
+COURSE_ATTEMPTS = 10  # placements tried until a platform can be reached, when the jump is tuned down
+
 # starting platforms
 PLATFORM_START_LIST = [
     (WIDTH / 2, HEIGHT / 2),
@@ -50,6 +113,14 @@ HUD_SPRITESHEET = os.path.join('hud', 'hud_spritesheet.png')
 EXPL_SPRITESHEET = os.path.join('explosions', 'explosions_spritesheet.png')
 PLAT_SPRITESHEET = os.path.join('platforms', 'platforms_spritesheet.png')
 
+# atlas metadata of the spritesheets
+ATLASES = {
+    ENEMY_SPRITESHEET: os.path.join('enemy', 'enemies_spritesheet.txt'),
+    HUD_SPRITESHEET: os.path.join('hud', 'hud_spritesheet.xml'),
+    EXPL_SPRITESHEET: os.path.join('explosions', 'explosions.json'),
+    PLAT_SPRITESHEET: os.path.join('platforms', 'spritesheet_jumper.xml'),
+}
+
 # player images
 PLAYER_IDLE = os.path.join('player', 'Idle')
 PLAYER_JUMP = os.path.join('player', 'Jump')
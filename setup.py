@@ -13,10 +13,29 @@ cx_Freeze.setup(name='Corona Breakout',
                         'include_files': [
                             'Comic Strips',
                             'images',
+                            'levels',
                             'sounds',
+                            'assets.py',
+                            'atlas.py',
+                            'audio.py',
+                            'bake.py',
+                            'camera.py',
+                            'collision.py',
+                            'course.py',
                             'game.py',
+                            'hud.py',
+                            'leaderboard.py',
+                            'levels.py',
+                            'pool.py',
+                            'prefetch.py',
+                            'profiler.py',
+                            'render.py',
+                            'replay.py',
                             'settings.py',
-                            'sprites.py'
+                            'simulation.py',
+                            'sprites.py',
+                            'swarm.py',
+                            'video.py'
                         ]
                     }
                 },
@@ -0,0 +1,180 @@
+import pygame
+import settings as s
+
+
+class KeyboardInput:
+    """Input source reading the real keyboard.
+    """
+
+    def get_events(self):
+        """Events since the last call.
+
+        Returns:
+            events (list): pygame events.
+        """
+
+        return pygame.event.get()
+
+    def get_pressed(self):
+        """State of every key.
+
+        Returns:
+            keys (sequence): indexable by key, True if pressed.
+        """
+
+        return pygame.key.get_pressed()
+
+
+class KeyState:
+    """Indexable set of pressed keys, mimicking pygame.key.get_pressed().
+    """
+
+    def __init__(self, keys):
+        """Initializing the state.
+
+        Args:
+            keys (set): keys currently held down.
+        """
+
+        self.keys = keys
+
+    def __getitem__(self, key):
+        return key in self.keys
+
+
+class ScriptedInput:
+    """Input source fed by code instead of a keyboard.
+
+    Used to drive the game headless, by tests, bots and replays.
+    """
+
+    def __init__(self):
+        """Initializing with no key held down.
+        """
+
+        self.queue = []
+        self.keys = set()
+
+    def press(self, key):
+        """Presses a key down.
+
+        Args:
+            key (int): pygame key constant.
+        """
+
+        self.keys.add(key)
+        self.queue.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def release(self, key):
+        """Releases a key.
+
+        Args:
+            key (int): pygame key constant.
+        """
+
+        self.keys.discard(key)
+        self.queue.append(pygame.event.Event(pygame.KEYUP, key=key))
+
+    def tap(self, key):
+        """Presses and releases a key within the same tick.
+
+        Args:
+            key (int): pygame key constant.
+        """
+
+        self.press(key)
+        self.release(key)
+
+    def get_events(self):
+        """Events queued since the last call.
+
+        Returns:
+            events (list): pygame events.
+        """
+
+        events, self.queue = self.queue, []
+        return events
+
+    def get_pressed(self):
+        """State of every key.
+
+        Returns:
+            keys (KeyState): indexable by key, True if pressed.
+        """
+
+        return KeyState(self.keys)
+
+
+class RealClock:
+    """Wall clock, limiting the frame rate.
+    """
+
+    def __init__(self):
+        """Initializing the pygame clock.
+        """
+
+        self.clock = pygame.time.Clock()
+
+    def tick(self, fps=None):
+        """Waits for the next frame.
+
+        Args:
+            fps (int, optional): frame rate to limit to. Defaults to FPS
+
+        Returns:
+            ms (int): milliseconds since the previous tick.
+        """
+
+        return self.clock.tick(s.FPS if fps is None else fps)
+
+    def get_ticks(self):
+        """Milliseconds since pygame.init().
+
+        Returns:
+            ms (int): current time.
+        """
+
+        return pygame.time.get_ticks()
+
+
+class FixedClock:
+    """Simulated clock, advancing a fixed step per tick without waiting.
+
+    Lets the game run as fast as the CPU allows while every timer behaves
+    as if the game ran at exactly the given frame rate.
+    """
+
+    def __init__(self, fps=None):
+        """Initializing the clock at time zero.
+
+        Args:
+            fps (int, optional): simulated frame rate. Defaults to FPS
+        """
+
+        # read when created, settings may be overridden after this module is imported
+        self.step = 1000 / (fps or s.FPS)
+        self.now = 0.0
+        self.frames = 0
+
+    def tick(self, fps=None):
+        """Advances to the next frame.
+
+        Args:
+            fps (int, optional): ignored, the step is fixed.
+
+        Returns:
+            ms (int): milliseconds simulated per tick.
+        """
+
+        self.now += self.step
+        self.frames += 1
+        return int(self.step)
+
+    def get_ticks(self):
+        """Simulated milliseconds since the clock was created.
+
+        Returns:
+            ms (int): current time.
+        """
+
+        return int(self.now)
@@ -1,25 +1,60 @@
 import os
+import weakref
 import pygame
-import random
 import settings as s
+from pool import Pooled
 
 vec = pygame.math.Vector2
 
+# collision masks of every frame seen so far, dropped along with the frame
+_masks = weakref.WeakKeyDictionary()
+
+
+def get_mask(image):
+    """Collision mask of an image, computed once per distinct frame.
+
+    Args:
+        image (pygame.Surface): frame of a sprite.
+
+    Returns:
+        mask (pygame.mask.Mask): mask shared by every sprite showing the frame.
+    """
+
+    mask = _masks.get(image)
+    if mask is None:
+        mask = _masks[image] = pygame.mask.from_surface(image)
+
+    return mask
+
 
 class SpriteSheet:
     """Utility class for loading and parsing spritesheets.
+
+    Frames cut from any spritesheet are memoized in a class level cache,
+    keyed by (sheet, rect, scale, colorkey), so spawning a sprite costs a
+    dict lookup instead of a blit and a scale. Cached surfaces are shared
+    between sprites and must not be modified.
     """
 
-    def __init__(self, filename):
+    _frame_cache = {}
+    hits = 0
+    misses = 0
+
+    def __init__(self, filename, atlas=None):
         """Loads the spritesheet.
 
         Args:
             filename (str): Filename of the spritesheet to be loaded.
+            atlas (dict, optional): frame name mapped to (x, y, width, height).
+                Defaults to None
         """
 
+        self.filename = filename
         self.spritesheet = pygame.image.load(filename).convert()
+        self.atlas = atlas or {}
+        self._sequences = {}
 
-    def get_image(self, x, y, width, height, scale=0.5):
+    def get_image(self, x, y, width, height, scale=0.5, colorkey=None):
         """Grabs a smaller image from the larger spritesheet.
 
         Args:
@@ -29,6 +64,34 @@ class SpriteSheet:
             height (int): height of the image.
             scale (float, optional): scale factor between 0 and 1.
                 Defaults to 0.5
+            colorkey (tuple, optional): colorkey to set on the image.
+                Defaults to None
+
+        Returns:
+            image (pygame.Surface): a scaled image, shared with every other
+                caller asking for the same frame.
+        """
+
+        key = (self.filename, (x, y, width, height), scale, colorkey)
+        image = SpriteSheet._frame_cache.get(key)
+        if image is not None:
+            SpriteSheet.hits += 1
+            return image
+
+        SpriteSheet.misses += 1
+        return self.store(x, y, width, height, scale, colorkey, self.cut(x, y, width, height, scale))
+
+    def cut(self, x, y, width, height, scale=0.5):
+        """Cuts and scales a frame, bypassing the cache.
+
+        Only reads the spritesheet, so it can run on a worker thread.
+
+        Args:
+            x (int): x coordinate of the image.
+            y (int): y coordinate of the image.
+            width (int): width of the image.
+            height (int): height of the image.
+            scale (float, optional): scale factor. Defaults to 0.5
 
         Returns:
             image (pygame.Surface): a scaled image.
@@ -36,14 +99,100 @@ class SpriteSheet:
 
         image = pygame.Surface((width, height))
         image.blit(self.spritesheet, (0, 0), (x, y, width, height))
-        image = pygame.transform.scale(image, (int(width * scale),
-                                               int(height * scale)))
+        return pygame.transform.scale(image, (int(width * scale), int(height * scale)))
+
+    def store(self, x, y, width, height, scale, colorkey, image):
+        """Puts a cut frame in the cache.
 
+        Args:
+            x (int): x coordinate of the image.
+            y (int): y coordinate of the image.
+            width (int): width of the image.
+            height (int): height of the image.
+            scale (float): scale factor the image was cut with.
+            colorkey (tuple): colorkey to set, or None.
+            image (pygame.Surface): the cut image.
+
+        Returns:
+            image (pygame.Surface): the cached image.
+        """
+
+        if colorkey is not None:
+            image.set_colorkey(colorkey)
+
+        SpriteSheet._frame_cache[(self.filename, (x, y, width, height), scale, colorkey)] = image
         return image
 
+    def get_named(self, name, scale=0.5, colorkey=None):
+        """Grabs an image by its name in the atlas.
+
+        Args:
+            name (str): name of the frame in the atlas.
+            scale (float, optional): scale factor. Defaults to 0.5
+            colorkey (tuple, optional): colorkey to set. Defaults to None
+
+        Returns:
+            image (pygame.Surface): a scaled image.
+        """
+
+        return self.get_image(*self.atlas[name], scale=scale, colorkey=colorkey)
+
+    def get_sequence(self, prefix, scale=0.5, colorkey=None):
+        """Grabs every frame of an animation in one pass.
+
+        Args:
+            prefix (str): common prefix of the frame names, e.g. 'flyFly'.
+            scale (float, optional): scale factor. Defaults to 0.5
+            colorkey (tuple, optional): colorkey to set. Defaults to None
+
+        Returns:
+            images (list): scaled images, ordered by frame name.
+        """
+
+        names = self._sequences.get(prefix)
+        if names is None:
+            names = sorted(name for name in self.atlas if name.startswith(prefix))
+            self._sequences[prefix] = names
+
+        return [self.get_named(name, scale=scale, colorkey=colorkey) for name in names]
+
+    def warm_up(self, frames, scale=0.5, colorkey=None):
+        """Cuts a list of frames into the cache ahead of time.
+
+        Args:
+            frames (iterable): atlas names or (x, y, width, height) tuples.
+            scale (float, optional): scale factor. Defaults to 0.5
+            colorkey (tuple, optional): colorkey to set. Defaults to None
+        """
+
+        for frame in frames:
+            region = self.atlas[frame] if isinstance(frame, str) else frame
+            self.get_image(*region, scale=scale, colorkey=colorkey)
+
+    @classmethod
+    def cache_info(cls):
+        """Statistics of the frame cache.
+
+        Returns:
+            info (dict): hits, misses and number of cached frames.
+        """
+
+        return {'hits': cls.hits, 'misses': cls.misses, 'size': len(cls._frame_cache)}
+
+    @classmethod
+    def clear_cache(cls):
+        """Drops every cached frame and resets the counters.
+        """
+
+        cls._frame_cache.clear()
+        cls.hits = 0
+        cls.misses = 0
+
 
 class Cloud(pygame.sprite.Sprite):
 
+    parallax = s.CLOUD_PARALLAX
+
     def __init__(self, game):
         """Initializing a Cloud sprite.
 
@@ -56,33 +205,78 @@ class Cloud(pygame.sprite.Sprite):
         super(Cloud, self).__init__(groups)
 
         self.game = game
-        self.image = random.choice(self.game.cloud_images)
+        self.image = self.game.rng.choice(self.game.cloud_images)
         self.image.set_colorkey(s.BLACK)
         self.rect = self.image.get_rect()
-        scale = random.randrange(50, 101) / 100
+        scale = self.game.rng.randrange(50, 101) / 100
         self.image = pygame.transform.scale(self.image, (int(self.rect.width * scale),
                                                          int(self.rect.height * scale)))
-        self.rect.x = random.randrange(s.WIDTH, s.WIDTH + self.rect.width)
-        self.rect.y = random.randrange(0, s.HEIGHT - 350)
+        self.rect.x = self.game.rng.randrange(s.WIDTH, s.WIDTH + self.rect.width) + self.game.camera.offset(self)
+        self.rect.y = self.game.rng.randrange(0, s.HEIGHT - 350)
 
     def update(self):
         """Updates sprite.
 
         Kills the sprite if out of screen.
         """
-        if self.rect.right < 0:
+        if self.rect.right - self.game.camera.offset(self) < 0:
             self.kill()
 
 
 class Platform(pygame.sprite.Sprite):
 
-    def __init__(self, game, x, y):
+    @classmethod
+    def image_names(cls, tiles):
+        """Atlas names of the platform tiles of a kind.
+
+        Args:
+            tiles (str): Kind of tiles, e.g. 'stone', from the level file.
+
+        Returns:
+            names (list): names of the frames in the platform atlas.
+        """
+
+        return [f'ground_{tiles}{variant}' for variant in ('', '_broken', '_small', '_small_broken')]
+
+    @classmethod
+    def roll(cls, rng, tiles):
+        """Picks a random tile and powerup for a platform.
+
+        Args:
+            rng (random.Random): Random numbers to draw from.
+            tiles (str): Kind of tiles of the level.
+
+        Returns:
+            (tile, powerup): atlas name of the tile, and type of the
+                powerup spawned on the platform or None.
+        """
+
+        tile = rng.choice(cls.image_names(tiles))
+
+        random_type = rng.choice(['vaccine', 'ammo', 'health'])
+        if random_type == 'vaccine':
+            threshold = 90
+        elif random_type == 'ammo':
+            threshold = 60
+        elif random_type == 'health':
+            threshold = 40
+
+        # only if value exceeds threshold
+        if rng.randrange(100) < threshold:
+            return tile, random_type
+
+        return tile, None
+
+    def __init__(self, game, x, y, tile, powerup=None):
         """Initializing a platform sprite.
 
         Args:
             game (game_instance): Game instance.
-            x (int): x coordinate of the center of the platform.
-            y (int): y coordinate of the center of the platform.
+            x (int): x coordinate of the left of the platform.
+            y (int): y coordinate of the top of the platform.
+            tile (str): Atlas name of the image, see roll().
+            powerup (str, optional): Type of the powerup spawned on the
+                platform. Defaults to None
         """
 
         self._layer = s.PLATFORM_LAYER
@@ -91,55 +285,16 @@ class Platform(pygame.sprite.Sprite):
 
         self.game = game
 
-        if self.game.level == 1:  # stone platforms
-            images = [
-                self.game.plat_spritesheet.get_image(0, 96, 380, 94),
-                self.game.plat_spritesheet.get_image(0, 192, 380, 94),
-                self.game.plat_spritesheet.get_image(382, 408, 200, 100),
-                self.game.plat_spritesheet.get_image(232, 1288, 200, 100),
-            ]
-        elif self.game.level == 2:  # rock platforms
-            images = [
-                self.game.plat_spritesheet.get_image(0, 960, 380, 94),
-                self.game.plat_spritesheet.get_image(0, 864, 380, 94),
-                self.game.plat_spritesheet.get_image(218, 1558, 200, 100),
-                self.game.plat_spritesheet.get_image(382, 0, 200, 100),
-            ]
-        elif self.game.level == 3:  # grass platforms
-            images = [
-                self.game.plat_spritesheet.get_image(0, 288, 380, 94),
-                self.game.plat_spritesheet.get_image(0, 384, 380, 94),
-                self.game.plat_spritesheet.get_image(213, 1662, 201, 100),
-                self.game.plat_spritesheet.get_image(382, 204, 200, 100),
-            ]
-        else:  # snow platforms
-            images = [
-                self.game.plat_spritesheet.get_image(0, 768, 380, 94),
-                self.game.plat_spritesheet.get_image(0, 480, 380, 94),
-                self.game.plat_spritesheet.get_image(213, 1764, 201, 100),
-                self.game.plat_spritesheet.get_image(384, 306, 200, 100),
-            ]
-
-        # load a random image
-        self.image = random.choice(images)
+        self.image = self.game.plat_spritesheet.get_named(tile, colorkey=s.BLACK)
+        self.mask = get_mask(self.image)
 
-        self.image.set_colorkey(s.BLACK)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
         # spawn a powerup on the platform
-        random_type = random.choice(['vaccine', 'ammo', 'health'])
-        if random_type == 'vaccine':
-            threshold = 90
-        elif random_type == 'ammo':
-            threshold = 60
-        elif random_type == 'health':
-            threshold = 40
-
-        # only if value exceeds threshold
-        if random.randrange(100) < threshold:
-            PowerUp(self.game, self, type_=random_type)
+        if powerup is not None:
+            self.game.spawn(PowerUp, self, type_=powerup)
 
 
 class Base(pygame.sprite.Sprite):
@@ -200,17 +355,26 @@ class Player(pygame.sprite.Sprite):
         self.acc = vec(0, 0)  # acceleration vector
 
     def load_images(self):
+        """Gets all necessary images for animation, loaded once per game.
+        """
+
+        (self.standing_frames_r, self.standing_frames_l, self.jumping_frames_r,
+         self.jumping_frames_l, self.run_frames_r, self.run_frames_l) = \
+            self.game.assets.get('player', self.load_frames, pinned=True)
+
+    def load_frames(self):
         """Loads all necessary images for animation.
+
+        Returns:
+            frames (tuple): standing, jumping and running frames, each
+                facing right then left.
         """
 
         # standing / idle frames
         self.standing_frames_r = []
         stand_dir = os.path.join(self.game.img_dir, s.PLAYER_IDLE)
         for image in os.listdir(stand_dir):
-            frame = pygame.image.load(os.path.join(stand_dir, image)).convert()
-            rect = frame.get_rect()
-            frame = pygame.transform.scale(frame, (int(rect.width * 0.2),
-                                                   int(rect.height * 0.2)))
+            frame = self.game.baked.load_image(os.path.join(stand_dir, image), scale=0.2).convert()
             frame.set_colorkey(s.BLACK)
             self.standing_frames_r.append(frame)
 
@@ -222,10 +386,7 @@ class Player(pygame.sprite.Sprite):
         self.jumping_frames_r = []
         jump_dir = os.path.join(self.game.img_dir, s.PLAYER_JUMP)
         for image in os.listdir(jump_dir):
-            frame = pygame.image.load(os.path.join(jump_dir, image)).convert()
-            rect = frame.get_rect()
-            frame = pygame.transform.scale(frame, (int(rect.width * 0.2),
-                                                   int(rect.height * 0.2)))
+            frame = self.game.baked.load_image(os.path.join(jump_dir, image), scale=0.2).convert()
             frame.set_colorkey(s.BLACK)
             self.jumping_frames_r.append(frame)
 
@@ -237,10 +398,7 @@ class Player(pygame.sprite.Sprite):
         self.run_frames_r = []
         run_dir = os.path.join(self.game.img_dir, s.PLAYER_RUN)
         for image in os.listdir(run_dir):
-            frame = pygame.image.load(os.path.join(run_dir, image)).convert()
-            rect = frame.get_rect()
-            frame = pygame.transform.scale(frame, (int(rect.width * 0.2),
-                                                   int(rect.height * 0.2)))
+            frame = self.game.baked.load_image(os.path.join(run_dir, image), scale=0.2).convert()
             frame.set_colorkey(s.BLACK)
             self.run_frames_r.append(frame)
 
@@ -248,6 +406,15 @@ class Player(pygame.sprite.Sprite):
         for frame in self.run_frames_r:  # flip x, and not y
             self.run_frames_l.append(pygame.transform.flip(frame, True, False))
 
+        # compute the masks of every frame once, animate() only swaps them
+        for frames in (self.standing_frames_r, self.standing_frames_l, self.jumping_frames_r,
+                       self.jumping_frames_l, self.run_frames_r, self.run_frames_l):
+            for frame in frames:
+                get_mask(frame)
+
+        return (self.standing_frames_r, self.standing_frames_l, self.jumping_frames_r,
+                self.jumping_frames_l, self.run_frames_r, self.run_frames_l)
+
     def jump(self):
         """Jumps the player.
 
@@ -262,7 +429,7 @@ class Player(pygame.sprite.Sprite):
         hits = plat_hits or base_hits
 
         if hits and not self.jumping:
-            self.game.jump_sound.play()
+            self.game.audio.play('jump')
             self.jumping = True
             self.idle = False
             self.vel.y = s.PLAYER_JUMP_VEL * -1
@@ -289,7 +456,7 @@ class Player(pygame.sprite.Sprite):
         # apply gravity to player
         self.acc = vec(0, s.PLAYER_GRAV)
 
-        keys = pygame.key.get_pressed()
+        keys = self.game.input.get_pressed()
 
         # add acceleration if key is pressed
         if keys[pygame.K_LEFT]:
@@ -316,7 +483,7 @@ class Player(pygame.sprite.Sprite):
         """Handles player animation.
         """
 
-        now = pygame.time.get_ticks()
+        now = self.game.clock.get_ticks()
 
         if self.vel.x != 0:
             self.running = True
@@ -365,10 +532,12 @@ class Player(pygame.sprite.Sprite):
 
         # show shooting animation
 
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = get_mask(self.image)
+
 
+class Bullet(Pooled, pygame.sprite.Sprite):
 
-class Bullet(pygame.sprite.Sprite):
+    SCALE = 1.5
 
     def __init__(self, game):
         """Initialize a bullet sprite.
@@ -380,13 +549,23 @@ class Bullet(pygame.sprite.Sprite):
         """
 
         self._layer = s.BULLET_LAYER
-        groups = game.all_sprites, game.bullets
-        super(Bullet, self).__init__(groups)
+        super(Bullet, self).__init__()
+        self.reset(game)
+
+    def reset(self, game):
+        """Fires the bullet from the player's position.
+
+        Args:
+            game (game_instance): Game instance.
+        """
+
+        self.add(game.all_sprites, game.bullets)
 
         self.game = game
         self.vel = s.BULLET_VEL
 
         self.load_images()
+        self.mask = get_mask(self.image)
         self.rect = self.image.get_rect()
 
         # if player moves towards left while shooting
@@ -402,27 +581,27 @@ class Bullet(pygame.sprite.Sprite):
         """Loads all necessary images.
         """
 
-        # starting image
-        if self.game.level == 4:
-            self.image = self.game.expl_spritesheet.get_image(276, 580, 12, 12, scale=1.5)
-        else:
-            self.image = self.game.expl_spritesheet.get_image(304, 580, 12, 12, scale=1.5)
+        # starting image, picked by the level file
+        self.image = self.game.expl_spritesheet.get_named(self.game.definition.bullet, scale=self.SCALE)
 
     def update(self):
 
-        # move bullet across screen
-        self.rect.x += self.vel
+        # move bullet across screen, keeping up with the camera
+        self.rect.x += self.vel + self.game.camera.dx
 
         # if bullet out of screen, kill it
-        if self.rect.left > s.WIDTH:
+        if self.rect.left > self.game.camera.right:
             self.kill()
-        elif self.rect.right < 0:
+        elif self.rect.right < self.game.camera.left:
             self.kill()
 
-        self.mask = pygame.mask.from_surface(self.image)
 
+class Slime(Pooled, pygame.sprite.Sprite):
 
-class Slime(pygame.sprite.Sprite):
+    # walk animations, the bacteria spritesheet has no atlas
+    SLIME_SEQUENCE = 'slimeWalk'
+    BACTERIA_REGIONS = [(x, y, 32, 31) for y in (0, 31, 62, 93) for x in (0, 32, 64)]
+    SCALE = 1.5
 
     def __init__(self, game, bacteria=False):
         """Initialize an enemy sprite.
@@ -433,8 +612,18 @@ class Slime(pygame.sprite.Sprite):
         """
 
         self.layer = s.ENEMY_LAYER
-        groups = game.all_sprites, game.enemies
-        super(Slime, self).__init__(groups)
+        super(Slime, self).__init__()
+        self.reset(game, bacteria)
+
+    def reset(self, game, bacteria=False):
+        """Spawns the enemy at the right edge of the screen.
+
+        Args:
+            game (game_instance): Game instance.
+            bacteria (bool): Whether to render images of bacteria
+        """
+
+        self.add(game.all_sprites, game.enemies)
 
         self.game = game
         self.bacteria = bacteria
@@ -442,39 +631,22 @@ class Slime(pygame.sprite.Sprite):
         self.last_update = 0
         self.load_images()
         self.image = self.walk_images[0]
+        self.mask = get_mask(self.image)
         self.rect = self.image.get_rect()
-        self.rect.left = s.WIDTH
+        self.rect.left = self.game.camera.right
         self.rect.bottom = s.HEIGHT - s.BASE_HEIGHT + 5
-        self.vx = random.randrange(1, 4)  # speed
+        self.vx = self.game.rng.randrange(1, 4)  # speed
 
     def load_images(self):
         """Loads images from spritesheet.
         """
 
         if not self.bacteria:
-            self.walk_images = [
-                self.game.enemy_spritesheet.get_image(52, 125, 50, 28, scale=1.5),
-                self.game.enemy_spritesheet.get_image(0, 125, 51, 26, scale=1.5)
-            ]
-
-        elif self.bacteria:
-            self.walk_images = [
-                self.game.bac_spritesheet.get_image(0, 0, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(32, 0, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(64, 0, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(0, 31, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(32, 31, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(64, 31, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(0, 62, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(32, 62, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(64, 62, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(0, 93, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(32, 93, 32, 31, scale=1.5),
-                self.game.bac_spritesheet.get_image(64, 93, 32, 31, scale=1.5),
-            ]
-
-        for frame in self.walk_images:
-            frame.set_colorkey(s.BLACK)
+            self.walk_images = self.game.enemy_spritesheet.get_sequence(self.SLIME_SEQUENCE, scale=self.SCALE,
+                                                                        colorkey=s.BLACK)
+        else:
+            self.walk_images = [self.game.bac_spritesheet.get_image(*region, scale=self.SCALE, colorkey=s.BLACK)
+                                for region in self.BACTERIA_REGIONS]
 
     def update(self):
         """Update the sprite.
@@ -486,24 +658,28 @@ class Slime(pygame.sprite.Sprite):
 
         self.rect.x -= self.vx
 
-        if self.rect.right < 0:
+        if self.rect.right < self.game.camera.left:
             self.kill()
 
     def animate(self):
         """Handles sprite animation.
         """
 
-        now = pygame.time.get_ticks()
+        now = self.game.clock.get_ticks()
 
         if now - self.last_update > 180:
             self.last_update = now
             self.current_frame = (self.current_frame + 1) % len(self.walk_images)
             self.image = self.walk_images[self.current_frame]
+            self.mask = get_mask(self.image)
 
-        self.mask = pygame.mask.from_surface(self.image)
 
+class Bat(Pooled, pygame.sprite.Sprite):
 
-class Bat(pygame.sprite.Sprite):
+    # fly animation in the enemy atlas
+    SEQUENCE = 'flyFly'
+    SCALE = 1.5
+    BOSS_SCALE = 2
 
     def __init__(self, game, boss=False):
         """Initialize an enemy bat sprite.
@@ -514,8 +690,18 @@ class Bat(pygame.sprite.Sprite):
         """
 
         self.layer = s.ENEMY_LAYER
-        groups = game.all_sprites, game.enemies
-        super(Bat, self).__init__(groups)
+        super(Bat, self).__init__()
+        self.reset(game, boss)
+
+    def reset(self, game, boss=False):
+        """Spawns the bat at the right edge of the screen.
+
+        Args:
+            game (game_instance): Game instance.
+            boss (bool): whether to spawn a boss Bat.
+        """
+
+        self.add(game.all_sprites, game.enemies)
 
         self.game = game
         self.boss = boss
@@ -524,10 +710,11 @@ class Bat(pygame.sprite.Sprite):
         self.spreaded = False
         self.load_images()
         self.image = self.images[0]
+        self.mask = get_mask(self.image)
         self.rect = self.image.get_rect()
-        self.rect.left = s.WIDTH
+        self.rect.left = self.game.camera.right
         self.rect.top = s.HEIGHT * 0.5
-        self.vx = random.randrange(3, 5)
+        self.vx = self.game.rng.randrange(3, 5)
         self.vy = 0
         self.dy = 0.5
 
@@ -535,20 +722,8 @@ class Bat(pygame.sprite.Sprite):
         """Loads images from spritesheet.
         """
 
-        if not self.boss:
-            self.images = [
-                self.game.enemy_spritesheet.get_image(0, 32, 72, 36, scale=1.5),
-                self.game.enemy_spritesheet.get_image(0, 0, 75, 31, scale=1.5),
-            ]
-
-        elif self.boss:
-            self.images = [
-                self.game.enemy_spritesheet.get_image(0, 32, 72, 36, scale=2),
-                self.game.enemy_spritesheet.get_image(0, 0, 75, 31, scale=2),
-            ]
-
-        for image in self.images:
-            image.set_colorkey(s.BLACK)
+        scale = self.BOSS_SCALE if self.boss else self.SCALE
+        self.images = self.game.enemy_spritesheet.get_sequence(self.SEQUENCE, scale=scale, colorkey=s.BLACK)
 
     def update(self):
         """Update the sprite.
@@ -571,28 +746,27 @@ class Bat(pygame.sprite.Sprite):
         # move up or down
         self.rect.y += self.vy
 
-        if self.rect.right < 0:
+        if self.rect.right < self.game.camera.left:
             self.kill()
 
-        if not self.spreaded and self.rect.centerx < s.WIDTH * 0.9:
-            Virus(self.game, self, self.boss)
+        if not self.spreaded and self.rect.centerx < self.game.camera.left + s.WIDTH * 0.9:
+            self.game.spawn(Virus, self, self.boss)
             self.spreaded = True
 
     def animate(self):
         """Handles sprite animation.
         """
 
-        now = pygame.time.get_ticks()
+        now = self.game.clock.get_ticks()
 
         if now - self.last_update > 180:
             self.last_update = now
             self.current_frame = (self.current_frame + 1) % len(self.images)
             self.image = self.images[self.current_frame]
-
-        self.mask = pygame.mask.from_surface(self.image)
+            self.mask = get_mask(self.image)
 
 
-class Virus(pygame.sprite.Sprite):
+class Virus(Pooled, pygame.sprite.Sprite):
     """Virus that infects player.
 
     Player loses one life, plus becomes hurt??
@@ -610,17 +784,28 @@ class Virus(pygame.sprite.Sprite):
         """
 
         self.layer = s.ENEMY_LAYER
-        groups = game.all_sprites, game.viruses
-        super(Virus, self).__init__(groups)
+        super(Virus, self).__init__()
+        self.reset(game, bat, boss)
+
+    def reset(self, game, bat, boss=False):
+        """Drops the virus from a bat.
+
+        Args:
+            game (game_instance): Game Instance.
+            bat (Bat): Bat enemy instance.
+            boss (bool): Whether to spawn boss virus.
+        """
+
+        self.add(game.all_sprites, game.viruses)
 
         self.bat = bat
         self.game = game
-        self.image = self.game.virus_image
-        self.rect = self.image.get_rect()
         if boss:
-            self.image = pygame.transform.scale(self.image, (self.rect.width * 2, self.rect.height * 2))
-        self.rect = self.image.get_rect()  # update rect if boss
-        self.mask = pygame.mask.from_surface(self.image)
+            self.image = self.game.boss_virus_image
+        else:
+            self.image = self.game.virus_image
+        self.rect = self.image.get_rect()
+        self.mask = get_mask(self.image)
         self.rect.top = self.bat.rect.bottom
         self.rect.centerx = self.bat.rect.centerx
         self.vy = 1
@@ -650,11 +835,11 @@ class Virus(pygame.sprite.Sprite):
             self.vy = 0
 
         # kill virus if untouched
-        if self.rect.right < 0:
+        if self.rect.right < self.game.camera.left:
             self.kill()
 
 
-class PowerUp(pygame.sprite.Sprite):
+class PowerUp(Pooled, pygame.sprite.Sprite):
     """A PowerUp sprite that boosts score.
     """
 
@@ -670,8 +855,19 @@ class PowerUp(pygame.sprite.Sprite):
         """
 
         self._layer = s.POW_LAYER
-        groups = game.all_sprites, game.powerups
-        super(PowerUp, self).__init__(groups)
+        super(PowerUp, self).__init__()
+        self.reset(game, plat, type_)
+
+    def reset(self, game, plat, type_='vaccine'):
+        """Places the powerup on a platform.
+
+        Args:
+            game (game_instance): Game instance.
+            plat (Platform): Platform on which the powerup will spawn.
+            type_ (str): Type of powerup to be spawned.
+        """
+
+        self.add(game.all_sprites, game.powerups)
 
         self.game = game
         self.plat = plat
@@ -688,16 +884,33 @@ class PowerUp(pygame.sprite.Sprite):
         """
 
         if self.type == 'vaccine':
-            self.image = pygame.image.load(os.path.join(self.game.img_dir, 'syringe.png')).convert()
-            rect = self.image.get_rect()
-            self.image = pygame.transform.scale(self.image, (int(rect.width * 2), int(rect.height * 2)))
-            self.image = pygame.transform.rotate(self.image, 90)
+            self.image = PowerUp.syringe(self.game)
         elif self.type == 'health':
-            self.image = self.game.hud_spritesheet.get_image(0, 94, 53, 45, scale=0.5).convert()
+            self.image = self.game.hud_spritesheet.get_named('hud_heartFull', colorkey=s.BLACK)
         elif self.type == 'ammo':
-            self.image = self.game.plat_spritesheet.get_image(852, 1089, 65, 77, scale=0.5).convert()
+            self.image = self.game.plat_spritesheet.get_named('jetpack_item', colorkey=s.BLACK)
 
-        self.image.set_colorkey(s.BLACK)
+    @staticmethod
+    def syringe(game):
+        """Vaccine image, loaded from disk once and shared by every vaccine.
+
+        Args:
+            game (game_instance): Game instance.
+
+        Returns:
+            image (pygame.Surface): scaled and rotated syringe.
+        """
+
+        def load():
+            image = pygame.image.load(os.path.join(game.img_dir, 'syringe.png')).convert()
+            rect = image.get_rect()
+            image = pygame.transform.scale(image, (int(rect.width * 2), int(rect.height * 2)))
+            image = pygame.transform.rotate(image, 90)
+            image.set_colorkey(s.BLACK)
+
+            return image
+
+        return game.assets.get('syringe', load, pinned=True)
 
     def update(self):
         """Update sprite.
@@ -718,6 +931,8 @@ class BackGround(pygame.sprite.Sprite):
     Used only for layering functionality.
     """
 
+    parallax = 0  # scrolled by the game itself
+
     def __init__(self, game):
         """Initializing a new background.
 
@@ -731,13 +946,6 @@ class BackGround(pygame.sprite.Sprite):
 
         self.game = game
 
-        bg_dir = os.path.join(self.game.img_dir, 'background')
-
-        if self.game.level >= 2:
-            image = pygame.image.load(os.path.join(bg_dir, 'forest.jpg')).convert()
-        else:
-            image = pygame.image.load(os.path.join(bg_dir, 'night_city.png')).convert_alpha()
-            image.set_colorkey(s.BLACK)
-
-        self.image = pygame.transform.scale(image, (s.WIDTH, s.HEIGHT))
+        # loaded once per kind of background, usually ahead of time
+        self.image = self.game.background_image()
         self.rect = self.image.get_rect()
@@ -0,0 +1,429 @@
+import pygame
+import settings as s
+from sprites import get_mask, Slime, Bat, Virus, Bullet
+
+try:  # optional, the sprite backend is used without it
+    import numpy as np
+except ImportError:
+    np = None
+
+# kinds of entities, indexing the image tables
+SLIME, BACTERIA, BAT, BOSS_BAT, VIRUS, BOSS_VIRUS, BULLET = range(7)
+
+# rect attributes are ints, assigning a float truncates in pygame 1.9 and rounds in pygame 2
+_rect = pygame.Rect(0, 0, 0, 0)
+_rect.x = 0.6
+ROUNDS = _rect.x == 1
+
+
+def snap(values):
+    """Converts coordinates the way assigning them to a rect would.
+
+    Args:
+        values (numpy.ndarray): float coordinates.
+
+    Returns:
+        values (numpy.ndarray): whole coordinates, as floats.
+    """
+
+    if ROUNDS:
+        return np.copysign(np.floor(np.abs(values) + 0.5), values)
+
+    return np.trunc(values)
+
+
+class EntityArrays:
+    """Structure of arrays holding one family of entities.
+
+    Each field is a NumPy array, the first n entries of which are alive.
+    Removing entities compacts the arrays, keeping their order.
+    """
+
+    FIELDS = {
+        'x': 'f8', 'y': 'f8',  # top left corner in the world
+        'px': 'f8', 'py': 'f8',  # top left corner at the previous tick
+        'vx': 'f8', 'vy': 'f8',
+        'dx': 'f8', 'dy': 'f8',  # oscillation steps
+        'kind': 'i4', 'frame': 'i4', 'last_update': 'f8',
+        'spreaded': '?',
+    }
+
+    def __init__(self, capacity=64):
+        """Initializing empty arrays.
+
+        Args:
+            capacity (int, optional): Entities allocated for. Defaults to 64
+        """
+
+        self.n = 0
+        self.data = {name: np.zeros(capacity, dtype) for name, dtype in self.FIELDS.items()}
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, name):
+        return self.data[name][:self.n]
+
+    def add(self, **values):
+        """Adds an entity, growing the arrays if full.
+
+        Args:
+            **values: initial value of each field, 0 if not given.
+
+        Returns:
+            index (int): index of the entity.
+        """
+
+        capacity = len(self.data['x'])
+        if self.n == capacity:
+            for name, array in self.data.items():
+                grown = np.zeros(capacity * 2, array.dtype)
+                grown[:capacity] = array
+                self.data[name] = grown
+
+        i = self.n
+        for name, array in self.data.items():
+            array[i] = values.get(name, 0)
+        self.data['px'][i] = self.data['x'][i]
+        self.data['py'][i] = self.data['y'][i]
+
+        self.n += 1
+        return i
+
+    def remove(self, dead):
+        """Removes entities.
+
+        Args:
+            dead (numpy.ndarray): True for every entity to be removed.
+        """
+
+        if not dead.any():
+            return
+
+        keep = ~dead
+        count = int(keep.sum())
+        for name, array in self.data.items():
+            array[:count] = array[:self.n][keep]
+        self.n = count
+
+
+class Swarm:
+    """Vectorized backend of the slimes, bats, viruses and bullets.
+
+    Positions, velocities, oscillation and animation state live in NumPy
+    arrays and are updated in one step per tick, with the same rules as
+    the sprite classes. Collisions are tested as batched AABB overlaps,
+    then masks for the few candidates touching the player. Nothing is a
+    sprite: images are only looked up for the entities on screen, when
+    drawing.
+    """
+
+    def __init__(self, game):
+        """Initializing empty arrays, and the images of the current level.
+
+        Args:
+            game (game_instance): Game instance.
+        """
+
+        self.game = game
+        self.enemies = EntityArrays()
+        self.viruses = EntityArrays()
+        self.bullets = EntityArrays()
+
+        enemy_sheet = game.enemy_spritesheet
+        self.images = [
+            enemy_sheet.get_sequence(Slime.SLIME_SEQUENCE, scale=Slime.SCALE, colorkey=s.BLACK),
+            [game.bac_spritesheet.get_image(*region, scale=Slime.SCALE, colorkey=s.BLACK)
+             for region in Slime.BACTERIA_REGIONS],
+            enemy_sheet.get_sequence(Bat.SEQUENCE, scale=Bat.SCALE, colorkey=s.BLACK),
+            enemy_sheet.get_sequence(Bat.SEQUENCE, scale=Bat.BOSS_SCALE, colorkey=s.BLACK),
+            [game.virus_image],
+            [game.boss_virus_image],
+            [game.expl_spritesheet.get_named(game.definition.bullet, scale=Bullet.SCALE)],
+        ]
+
+        # rects keep the size of the first frame, as the sprites do
+        self.frames = np.array([len(images) for images in self.images])
+        self.widths = np.array([images[0].get_width() for images in self.images], 'f8')
+        self.heights = np.array([images[0].get_height() for images in self.images], 'f8')
+
+        # spawning functions, in place of the sprite classes
+        self.spawners = {Slime: self.spawn_slime, Bat: self.spawn_bat, Virus: self.spawn_virus,
+                         Bullet: self.spawn_bullet}
+
+    def __len__(self):
+        return len(self.enemies) + len(self.viruses) + len(self.bullets)
+
+    def spawn_slime(self, bacteria=False):
+        """Spawns a slime, or a bacteria, at the right edge of the screen.
+
+        Args:
+            bacteria (bool, optional): Whether it is a bacteria. Defaults to False
+
+        Returns:
+            index (int): index of the entity in the enemy arrays.
+        """
+
+        kind = BACTERIA if bacteria else SLIME
+        return self.enemies.add(kind=kind, x=self.game.camera.right,
+                                y=s.HEIGHT - s.BASE_HEIGHT + 5 - self.heights[kind],
+                                vx=self.game.rng.randrange(1, 4))
+
+    def spawn_bat(self, boss=False):
+        """Spawns a bat at the right edge of the screen.
+
+        Args:
+            boss (bool, optional): Whether to spawn a boss bat. Defaults to False
+
+        Returns:
+            index (int): index of the entity in the enemy arrays.
+        """
+
+        return self.enemies.add(kind=BOSS_BAT if boss else BAT, x=self.game.camera.right,
+                                y=int(s.HEIGHT * 0.5), vx=self.game.rng.randrange(3, 5), dy=0.5)
+
+    def spawn_virus(self, bat, boss=False):
+        """Drops a virus from a bat.
+
+        Args:
+            bat (int): index of the bat in the enemy arrays.
+            boss (bool, optional): Whether to spawn a boss virus. Defaults to False
+
+        Returns:
+            index (int): index of the entity in the virus arrays.
+        """
+
+        e = self.enemies
+        kind = BOSS_VIRUS if boss else VIRUS
+        bat_kind = e['kind'][bat]
+        centerx = e['x'][bat] + self.widths[bat_kind] // 2
+
+        return self.viruses.add(kind=kind, x=centerx - self.widths[kind] // 2,
+                                y=e['y'][bat] + self.heights[bat_kind], vy=1, dx=0.1)
+
+    def spawn_bullet(self):
+        """Fires a bullet from the player's position.
+
+        Returns:
+            index (int): index of the entity in the bullet arrays.
+        """
+
+        player = self.game.player
+        width, height = self.widths[BULLET], self.heights[BULLET]
+
+        # if player moves towards left while shooting
+        if player.vel.x < 0:
+            vx = -s.BULLET_VEL
+            x = player.rect.left - width
+        else:
+            vx = s.BULLET_VEL
+            x = player.rect.right
+
+        return self.bullets.add(kind=BULLET, x=x, y=player.rect.centery + 30 - height, vx=vx)
+
+    def snapshot(self):
+        """Remembers where every entity is, before a tick.
+        """
+
+        for arrays in (self.enemies, self.viruses, self.bullets):
+            arrays['px'][:] = arrays['x']
+            arrays['py'][:] = arrays['y']
+
+    def update(self):
+        """Moves, animates, and removes entities left behind, for one tick.
+
+        Bats about to leave the screen drop their virus.
+        """
+
+        camera = self.game.camera
+        now = self.game.clock.get_ticks()
+
+        # viruses fall, drifting left and right
+        v = self.viruses
+        if v.n:
+            v['y'][:] += v['vy']
+            v['vx'][:] += v['dx']
+            flip = (v['vx'] > 3) | (v['vx'] < -3)
+            v['dx'][flip] *= -1
+            v['x'][:] = snap(v['x'] + v['vx'])
+            v['vy'][v['y'] + self.heights[v['kind']] > s.HEIGHT - s.BASE_HEIGHT] = 0
+            v.remove(v['x'] + self.widths[v['kind']] < camera.left)
+
+        # bullets keep up with the camera
+        b = self.bullets
+        if b.n:
+            b['x'][:] = snap(b['x'] + b['vx'] + camera.dx)
+            b.remove((b['x'] > camera.right) | (b['x'] + self.widths[BULLET] < camera.left))
+
+        e = self.enemies
+        if e.n:
+            kind = e['kind']
+
+            # animation
+            due = now - e['last_update'] > 180
+            e['last_update'][due] = now
+            e['frame'][due] = (e['frame'][due] + 1) % self.frames[kind[due]]
+
+            e['x'][:] -= e['vx']
+
+            # bats move up and down
+            bats = kind >= BAT
+            if bats.any():
+                e['vy'][bats] += e['dy'][bats]
+                flip = bats & ((e['vy'] > 3) | (e['vy'] < -3))
+                e['dy'][flip] *= -1
+                e['y'][bats] = snap(e['y'][bats] + e['vy'][bats])
+
+            width = self.widths[kind]
+            e.remove(e['x'] + width < camera.left)
+
+            # bats drop a virus when they are almost across the screen
+            kind, width = e['kind'], self.widths[e['kind']]
+            spread = (kind >= BAT) & ~e['spreaded'] & (e['x'] + width // 2 < camera.left + s.WIDTH * 0.9)
+            for i in spread.nonzero()[0]:
+                e['spreaded'][i] = True
+                self.spawn_virus(i, kind[i] == BOSS_BAT)
+
+    def overlaps(self, arrays, rect):
+        """Entities whose rect overlaps a rect.
+
+        Args:
+            arrays (EntityArrays): entities to test.
+            rect (pygame.Rect): rect in the world.
+
+        Returns:
+            hits (numpy.ndarray): True for every overlapping entity.
+        """
+
+        x, y, kind = arrays['x'], arrays['y'], arrays['kind']
+        return ((x < rect.right) & (x + self.widths[kind] > rect.left) &
+                (y < rect.bottom) & (y + self.heights[kind] > rect.top))
+
+    def collide_player(self, arrays):
+        """Removes the entities touching the player, tested with masks.
+
+        Args:
+            arrays (EntityArrays): enemies or viruses.
+
+        Returns:
+            hits (int): number of entities that touched the player.
+        """
+
+        player = self.game.player
+        candidates = self.overlaps(arrays, player.rect)
+        if not candidates.any():
+            return 0
+
+        dead = np.zeros(arrays.n, bool)
+        for i in candidates.nonzero()[0]:
+            image = self.images[arrays['kind'][i]][arrays['frame'][i]]
+            offset = (int(arrays['x'][i]) - player.rect.x, int(arrays['y'][i]) - player.rect.y)
+            if player.mask.overlap(get_mask(image), offset):
+                dead[i] = True
+
+        arrays.remove(dead)
+        return int(dead.sum())
+
+    def pairs(self, arrays):
+        """Overlapping pairs of entities and bullets.
+
+        Args:
+            arrays (EntityArrays): entities to test against the bullets.
+
+        Returns:
+            pairs (tuple): arrays of entity indices and bullet indices, by entity.
+        """
+
+        a, b = arrays, self.bullets
+        ax, ay, ak = a['x'][:, None], a['y'][:, None], a['kind'][:, None]
+        bx, by = b['x'][None, :], b['y'][None, :]
+        overlap = ((ax < bx + self.widths[BULLET]) & (ax + self.widths[ak] > bx) &
+                   (ay < by + self.heights[BULLET]) & (ay + self.heights[ak] > by))
+
+        return overlap.nonzero()
+
+    def collide_bullets(self, arrays, bullets_first=False):
+        """Removes the entities hit by bullets, and the bullets that hit.
+
+        Same as groupcollide(entities, bullets, True, True), or as
+        groupcollide(bullets, entities, True, True) if bullets go first:
+        whatever was removed by an earlier pair no longer hits.
+
+        Args:
+            arrays (EntityArrays): enemies or viruses.
+            bullets_first (bool, optional): Resolve the pairs bullet by
+                bullet. Defaults to False
+
+        Returns:
+            hits (int): number of entities hit.
+        """
+
+        if not arrays.n or not self.bullets.n:
+            return 0
+
+        dead = np.zeros(arrays.n, bool)
+        spent = np.zeros(self.bullets.n, bool)
+        entities, bullets = self.pairs(arrays)
+        if bullets_first:
+            order = np.argsort(bullets, kind='stable')
+            for j, i in zip(bullets[order], entities[order]):
+                if not dead[i]:
+                    dead[i] = True
+                    spent[j] = True
+        else:
+            for i, j in zip(entities, bullets):
+                if not spent[j]:
+                    spent[j] = True
+                    dead[i] = True
+
+        arrays.remove(dead)
+        self.bullets.remove(spent)
+        return int(dead.sum())
+
+    def collide_platforms(self, platforms):
+        """Removes the bullets hitting platforms.
+
+        Args:
+            platforms (iterable): platform sprites.
+        """
+
+        b = self.bullets
+        if not b.n:
+            return
+
+        spent = np.zeros(b.n, bool)
+        for plat in platforms:
+            spent |= self.overlaps(b, plat.rect)
+
+        b.remove(spent)
+
+    def draw(self, surface):
+        """Draws the entities on screen, between the last two ticks.
+
+        Args:
+            surface (pygame.Surface): Surface to draw on.
+        """
+
+        camera = self.game.camera
+        alpha = camera.alpha
+        view_x = int(camera.view_x)
+
+        blits = []
+        for arrays in (self.bullets, self.enemies, self.viruses):
+            if not arrays.n:
+                continue
+
+            x, y = arrays['x'], arrays['y']
+            if alpha < 1:
+                x = arrays['px'] + (x - arrays['px']) * alpha
+                y = arrays['py'] + (y - arrays['py']) * alpha
+
+            left = x.astype(int) - view_x
+            visible = (left < s.WIDTH) & (left + self.widths[arrays['kind']] > 0)
+
+            images = self.images
+            for k, f, sx, sy in zip(arrays['kind'][visible].tolist(), arrays['frame'][visible].tolist(),
+                                    left[visible].tolist(), y[visible].astype(int).tolist()):
+                blits.append((images[k][f], (sx, sy)))
+
+        surface.blits(blits, doreturn=False)
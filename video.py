@@ -0,0 +1,252 @@
+import os
+import zlib
+import time
+import queue
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+import settings as s
+
+# capture file: header, the palette of an 8 bit screen, then every frame
+# as its length and its pixels, compressed with zlib or not
+MAGIC = b'CBVF'
+HEADER = struct.Struct('<4s?HHHHI4I')  # magic, compressed, width, height, fps, bits per pixel, pitch, masks
+LENGTH = struct.Struct('<I')
+PALETTE_SIZE = 256 * 3  # red, green and blue of every color
+
+
+def get_palette(surface):
+    """Palette of a surface, as stored in a capture file.
+
+    Args:
+        surface (pygame.Surface): Surface, e.g. the screen.
+
+    Returns:
+        palette (list): (r, g, b) of every color, None if the surface has no palette.
+    """
+
+    if surface.get_bitsize() != 8:
+        return None
+    return [tuple(color)[:3] for color in surface.get_palette()]
+
+
+def make_frame(size, bitsize, masks, palette, pixels):
+    """Surface of a captured frame.
+
+    Args:
+        size (tuple): Width and height.
+        bitsize (int): Bits per pixel.
+        masks (tuple): Color masks.
+        palette (list): Colors of an 8 bit frame, None otherwise.
+        pixels (bytes): Pixels, in the layout of the screen.
+
+    Returns:
+        frame (pygame.Surface): the frame.
+    """
+
+    image = pygame.Surface(size, 0, bitsize, masks)
+    if palette is not None:
+        image.set_palette(palette)
+    image.get_buffer().write(pixels)
+    return image
+
+
+class FrameCapture:
+    """Records the frames drawn to the screen, without stalling the game.
+
+    Grabbing a frame only copies the screen's pixels into a free slot, a
+    preallocated buffer, and queues it. Encoder threads compress the
+    queued frames in parallel, and a writer thread writes them in order
+    and hands their slots back. When every slot is in use, the frame is
+    dropped or the game waits for a free slot, following the policy.
+
+    Frames are written as one file of raw or zlib compressed pixels, read
+    back with read_frames(), or as a directory of PNG images.
+    """
+
+    def __init__(self, path, surface, fmt=s.CAPTURE_FORMAT, slots=s.CAPTURE_SLOTS,
+                 policy=s.CAPTURE_POLICY, encoders=s.CAPTURE_ENCODERS, fps=s.RENDER_FPS):
+        """Starts the writer thread.
+
+        Args:
+            path (str): File of the capture, or directory of a PNG one.
+            surface (pygame.Surface): Screen to capture.
+            fmt (str, optional): 'raw', 'zlib' or 'png'. Defaults to CAPTURE_FORMAT
+            slots (int, optional): Frames waiting to be written at most.
+                Defaults to CAPTURE_SLOTS
+            policy (str, optional): 'drop' or 'block' frames when no slot is free.
+                Defaults to CAPTURE_POLICY
+            encoders (int, optional): Threads compressing frames. Defaults to CAPTURE_ENCODERS
+            fps (int, optional): Frame rate stored in the capture file. Defaults to RENDER_FPS
+        """
+
+        self.path = path
+        self.fmt = fmt
+        self.policy = policy
+        self.size = surface.get_size()
+        self.bitsize = surface.get_bitsize()
+        self.masks = surface.get_masks()
+        self.pitch = surface.get_pitch()
+        # pixels of an 8 bit screen, e.g. with the dummy video driver, are
+        # indices in its palette. The game never changes it while capturing
+        self.palette = get_palette(surface)
+
+        self.free = queue.Queue()
+        for _ in range(slots):
+            self.free.put(bytearray(self.pitch * self.size[1]))
+        self.frames = queue.Queue()  # (slot, encoded frame), or None to stop
+
+        self.grabbed = 0
+        self.dropped = 0
+        self.written = 0
+        self.blocked = 0.0  # seconds the game waited for a free slot
+
+        if self.fmt == 'png':
+            os.makedirs(path, exist_ok=True)
+            self.file = None
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(HEADER.pack(MAGIC, self.fmt == 'zlib', *self.size, fps or s.FPS, self.bitsize,
+                                        self.pitch, *self.masks))
+            if self.palette is not None:
+                self.file.write(bytes(value for color in self.palette for value in color))
+
+        # raw frames are only written, no encoding needed
+        self.encoders = None
+        if self.fmt != 'raw':
+            self.encoders = ThreadPoolExecutor(encoders, thread_name_prefix='frame-encoder')
+
+        self.thread = threading.Thread(target=self.write_frames, name='frame-capture', daemon=True)
+        self.thread.start()
+
+    def grab(self, surface):
+        """Queues the current frame.
+
+        Args:
+            surface (pygame.Surface): Screen to capture, drawn.
+
+        Returns:
+            grabbed (bool): False if the frame was dropped.
+        """
+
+        if self.policy == 'block':
+            start = time.perf_counter()
+            slot = self.free.get()
+            self.blocked += time.perf_counter() - start
+        else:
+            try:
+                slot = self.free.get_nowait()
+            except queue.Empty:
+                self.dropped += 1
+                return False
+
+        # the screen stays locked while its pixels are viewed
+        pixels = memoryview(surface.get_buffer())
+        slot[:] = pixels
+        pixels.release()
+
+        encoded = None
+        if self.encoders is not None:
+            encoded = self.encoders.submit(self.encode, self.grabbed, slot)
+        self.frames.put((slot, encoded))
+        self.grabbed += 1
+        return True
+
+    def encode(self, index, slot):
+        """Compresses a frame, or saves it as PNG, run by an encoder thread.
+
+        Args:
+            index (int): Index of the frame.
+            slot (bytearray): Pixels of the frame.
+
+        Returns:
+            data (bytes): compressed pixels, None for PNG.
+        """
+
+        if self.fmt == 'zlib':
+            # zlib lets go of the GIL while compressing, encoders run in parallel
+            return zlib.compress(slot, 1)
+
+        image = make_frame(self.size, self.bitsize, self.masks, self.palette, bytes(slot))
+        pygame.image.save(image, os.path.join(self.path, f'frame_{index:06d}.png'))
+
+    def write_frames(self):
+        """Writes queued frames in order until stopped, run by the writer thread.
+        """
+
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+
+            slot, encoded = item
+            data = slot if encoded is None else encoded.result()
+            if self.file is not None:
+                self.file.write(LENGTH.pack(len(data)))
+                self.file.write(data)
+
+            self.free.put(slot)
+            self.written += 1
+
+    def close(self):
+        """Writes the frames left and stops the writer thread.
+
+        Returns:
+            stats (dict): frames grabbed, dropped and written, and seconds
+                the game waited for the writer.
+        """
+
+        self.frames.put(None)
+        self.thread.join()
+        if self.encoders is not None:
+            self.encoders.shutdown()
+        if self.file is not None:
+            self.file.close()
+
+        return self.stats()
+
+    def stats(self):
+        """Statistics of the capture.
+
+        Returns:
+            stats (dict): frames grabbed, dropped, written and pending, and
+                seconds the game waited for the writer.
+        """
+
+        return {
+            'grabbed': self.grabbed,
+            'dropped': self.dropped,
+            'written': self.written,
+            'pending': self.grabbed - self.written,
+            'blocked': self.blocked,
+        }
+
+
+def read_frames(filename):
+    """Frames of a capture file.
+
+    Args:
+        filename (str): Filename of the capture.
+
+    Yields:
+        frame (pygame.Surface): every frame, in order.
+    """
+
+    with open(filename, 'rb') as f:
+        magic, compressed, width, height, fps, bitsize, pitch, *masks = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f'{filename} is not a frame capture')
+
+        palette = None
+        if bitsize == 8:
+            data = f.read(PALETTE_SIZE)
+            palette = [tuple(data[i:i + 3]) for i in range(0, PALETTE_SIZE, 3)]
+
+        while True:
+            length = f.read(LENGTH.size)
+            if not length:
+                return
+
+            data = f.read(LENGTH.unpack(length)[0])
+            yield make_frame((width, height), bitsize, masks, palette, zlib.decompress(data) if compressed else data)